@@ -8,10 +8,15 @@ giving agents complete control over the timeline and preventing them from gettin
 """
 
 import os
+import sys
 import datetime
 import json
 from pathlib import Path
 
+# Shared directory walker
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'ops'))
+from fast_file_walker import walk_files
+
 class AgentFolderIndexGenerator:
     def __init__(self):
         self.project_root = Path(".")
@@ -38,55 +43,51 @@ class AgentFolderIndexGenerator:
             "system_files": []
         }
         
-        # Simple file scan
-        for root, dirs, files in os.walk(self.project_root):
-            root_path = Path(root)
+        # Single pruned walk counting directories and files together
+        for entry in walk_files(self.project_root, excluded_dirs={'.git', '__pycache__', '.vscode'},
+                                yield_dirs=True):
+            file = entry.name
             
-            # Skip git and cache directories
-            dirs[:] = [d for d in dirs if d not in ['.git', '__pycache__', '.vscode']]
+            if entry.is_dir():
+                project_index["total_directories"] += 1
+                continue
             
-            for file in files:
-                file_path = root_path / file
-                
-                # Skip certain file types
-                if file.endswith(('.pyc', '.log', '.tmp')):
-                    continue
+            # Skip certain file types
+            if file.endswith(('.pyc', '.log', '.tmp')):
+                continue
+            
+            file_path = Path(entry.path)
+            
+            try:
+                stat = entry.stat()
+                project_index["total_files"] += 1
+                project_index["total_size_bytes"] += stat.st_size
                 
-                try:
-                    stat = file_path.stat()
-                    project_index["total_files"] += 1
-                    project_index["total_size_bytes"] += stat.st_size
+                # Categorize important files
+                if file in ["AGENT_READ_FIRST.md", "AGENT_LOCAL_INDEX_SYSTEM.md"]:
+                    project_index["core_files"].append({
+                        "name": file,
+                        "path": str(file_path.relative_to(self.project_root)),
+                        "size": stat.st_size,
+                        "modified": datetime.datetime.fromtimestamp(stat.st_mtime).isoformat()
+                    })
+                elif "V5.0" in file and file.endswith('.md'):
+                    project_index["white_papers"].append({
+                        "name": file,
+                        "path": str(file_path.relative_to(self.project_root)),
+                        "size": stat.st_size,
+                        "modified": datetime.datetime.fromtimestamp(stat.st_mtime).isoformat()
+                    })
+                elif file_path.parent.name == "ops" and file.endswith('.py'):
+                    project_index["system_files"].append({
+                        "name": file,
+                        "path": str(file_path.relative_to(self.project_root)),
+                        "size": stat.st_size,
+                        "modified": datetime.datetime.fromtimestamp(stat.st_mtime).isoformat()
+                    })
                     
-                    # Categorize important files
-                    if file in ["AGENT_READ_FIRST.md", "AGENT_LOCAL_INDEX_SYSTEM.md"]:
-                        project_index["core_files"].append({
-                            "name": file,
-                            "path": str(file_path.relative_to(self.project_root)),
-                            "size": stat.st_size,
-                            "modified": datetime.datetime.fromtimestamp(stat.st_mtime).isoformat()
-                        })
-                    elif "V5.0" in file and file.endswith('.md'):
-                        project_index["white_papers"].append({
-                            "name": file,
-                            "path": str(file_path.relative_to(self.project_root)),
-                            "size": stat.st_size,
-                            "modified": datetime.datetime.fromtimestamp(stat.st_mtime).isoformat()
-                        })
-                    elif root_path.name == "ops" and file.endswith('.py'):
-                        project_index["system_files"].append({
-                            "name": file,
-                            "path": str(file_path.relative_to(self.project_root)),
-                            "size": stat.st_size,
-                            "modified": datetime.datetime.fromtimestamp(stat.st_mtime).isoformat()
-                        })
-                        
-                except Exception as e:
-                    print(f"Error processing {file}: {e}")
-        
-        # Count directories
-        for root, dirs, files in os.walk(self.project_root):
-            dirs[:] = [d for d in dirs if d not in ['.git', '__pycache__', '.vscode']]
-            project_index["total_directories"] += len(dirs)
+            except Exception as e:
+                print(f"Error processing {file}: {e}")
         
         print(f"✅ Project scan complete: {project_index['total_files']} files, {project_index['total_directories']} directories")
         return project_index
@@ -6,10 +6,16 @@ Multi-layer safety framework for request validation
 
 import asyncio
 import re
-from typing import Dict, List, Optional, Any
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Any, Tuple
 from enum import Enum
 from abc import ABC, abstractmethod
 
+from pattern_matcher import literal_anchor
+from verdict_cache import VerdictCache, content_digest
+
 class RiskLevel(Enum):
     NONE = "none"
     LOW = "low"
@@ -17,12 +23,103 @@ class RiskLevel(Enum):
     HIGH = "high"
     BANNED = "banned"
 
+# Risk ordering (enum values are strings and do not sort by risk)
+RISK_SEVERITY = {
+    RiskLevel.NONE: 0,
+    RiskLevel.LOW: 1,
+    RiskLevel.MODERATE: 2,
+    RiskLevel.HIGH: 3,
+    RiskLevel.BANNED: 4
+}
+
 class PolicyLayer(Enum):
     CONTENT = "content"
     INTENT = "intent"
     CONTEXT = "context"
     RECURSIVE = "recursive"
 
+@dataclass
+class PolicyRule:
+    """
+    One content rule of a policy: a literal substring or a regex, and the
+    verdict it produces. Within a policy the first matching rule wins.
+    """
+    pattern: str
+    risk: RiskLevel
+    reason: str
+    confidence: float
+    is_regex: bool = True
+    owner: int = 0
+    order: int = 0
+    
+    def verdict(self) -> Dict:
+        return {"risk": self.risk, "reason": self.reason, "confidence": self.confidence}
+    
+    def literal_anchor(self) -> str:
+        """Literal text every match must start with ('' if there is none)"""
+        return literal_anchor(self.pattern) if self.is_regex else self.pattern
+
+class CompiledRuleMatcher:
+    """
+    Single-pass matcher over the content rules of any number of policies
+    
+    All literal rules and the literal prefixes ("anchors", from the shared
+    literal_anchor) of regex rules are merged into one lookahead alternation,
+    longest first, so one C-level finditer over the content reports every
+    anchor occurrence, including overlapping ones: two anchors matching at
+    the same position are always prefixes of one another, so the longest
+    reported also implies its shorter prefixes. Regex rules are then
+    confirmed only at their anchor positions; rules without a literal anchor
+    fall back to a plain search.
+    
+    The paradox resolvers use the pure-Python PatternMatcher; guard rails
+    scan every request, where the regex engine is noticeably faster.
+    """
+    
+    def __init__(self, rules: List[PolicyRule]):
+        self.rules = rules
+        self.anchored: Dict[str, List[Tuple[PolicyRule, Optional[re.Pattern]]]] = {}
+        self.unanchored: List[Tuple[PolicyRule, re.Pattern]] = []
+        
+        for rule in rules:
+            anchor = rule.literal_anchor()
+            compiled = re.compile(rule.pattern) if rule.is_regex else None
+            if anchor:
+                # A regex that is exactly its anchor needs no confirmation
+                needs_check = compiled is not None and anchor != rule.pattern
+                self.anchored.setdefault(anchor, []).append((rule, compiled if needs_check else None))
+            else:
+                self.unanchored.append((rule, compiled))
+        
+        anchors = sorted(self.anchored, key=len, reverse=True)
+        self.anchor_regex = (
+            re.compile("(?=(" + "|".join(re.escape(anchor) for anchor in anchors) + "))")
+            if anchors else None
+        )
+        self.implied = {anchor: [a for a in anchors if anchor.startswith(a)] for anchor in anchors}
+    
+    def first_matches(self, content: str) -> Dict[int, PolicyRule]:
+        """Lowest-order matching rule per owner, from one scan of the content"""
+        best: Dict[int, PolicyRule] = {}
+        
+        if self.anchor_regex is not None:
+            for match in self.anchor_regex.finditer(content):
+                position = match.start()
+                for anchor in self.implied[match.group(1)]:
+                    for rule, compiled in self.anchored[anchor]:
+                        current = best.get(rule.owner)
+                        if current is not None and current.order <= rule.order:
+                            continue
+                        if compiled is None or compiled.match(content, position):
+                            best[rule.owner] = rule
+        
+        for rule, compiled in self.unanchored:
+            current = best.get(rule.owner)
+            if (current is None or rule.order < current.order) and compiled.search(content):
+                best[rule.owner] = rule
+        
+        return best
+
 class GuardRailPolicy(ABC):
     """
     Abstract base class for guard-rail policies
@@ -32,12 +129,40 @@ class GuardRailPolicy(ABC):
         self.layer = layer
         self.enabled = True
         self.priority = 1
+        # CPU-bound policies are evaluated on the system's thread pool in concurrent mode
+        self.cpu_bound = False
+        self._matcher: Optional[CompiledRuleMatcher] = None
+        self._matcher_key: Optional[Tuple] = None
     
     @abstractmethod
     async def evaluate(self, request_data: Dict) -> Dict:
         """Evaluate request and return risk assessment"""
         pass
     
+    def get_content_rules(self) -> List[PolicyRule]:
+        """Ordered content rules (lower-case content is matched); first match wins"""
+        return []
+    
+    def assess(self, request_data: Dict, matched_rule: Optional[PolicyRule]) -> Optional[Dict]:
+        """
+        Verdict given the first content rule that matched (or None)
+        
+        Policies that return None here are evaluated through evaluate() by
+        the compiled engine.
+        """
+        return None
+    
+    def first_matching_rule(self, content: str) -> Optional[PolicyRule]:
+        """Match this policy's own rules against lower-cased content"""
+        rules = self.get_content_rules()
+        key = tuple((rule.pattern, rule.is_regex) for rule in rules)
+        if self._matcher is None or key != self._matcher_key:
+            for order, rule in enumerate(rules):
+                rule.order = order
+            self._matcher = CompiledRuleMatcher(rules)
+            self._matcher_key = key
+        return self._matcher.first_matches(content).get(0)
+    
     @abstractmethod
     def get_mitigation_strategy(self, risk_level: RiskLevel) -> str:
         """Get mitigation strategy for risk level"""
@@ -70,27 +195,20 @@ class ContentFilterPolicy(GuardRailPolicy):
             r"security\s+research"
         ]
     
-    async def evaluate(self, request_data: Dict) -> Dict:
-        """Evaluate content for safety risks"""
-        content = request_data.get("content", "").lower()
-        
-        # Check for blocked patterns
-        for pattern in self.blocked_patterns:
-            if re.search(pattern, content):
-                return {
-                    "risk": RiskLevel.BANNED,
-                    "reason": f"Blocked pattern detected: {pattern}",
-                    "confidence": 0.95
-                }
-        
-        # Check for warning patterns
-        for pattern in self.warning_patterns:
-            if re.search(pattern, content):
-                return {
-                    "risk": RiskLevel.MODERATE,
-                    "reason": f"Warning pattern detected: {pattern}",
-                    "confidence": 0.75
-                }
+    def get_content_rules(self) -> List[PolicyRule]:
+        """Blocked patterns first, then warning patterns"""
+        return [
+            PolicyRule(pattern, RiskLevel.BANNED, f"Blocked pattern detected: {pattern}", 0.95)
+            for pattern in self.blocked_patterns
+        ] + [
+            PolicyRule(pattern, RiskLevel.MODERATE, f"Warning pattern detected: {pattern}", 0.75)
+            for pattern in self.warning_patterns
+        ]
+    
+    def assess(self, request_data: Dict, matched_rule: Optional[PolicyRule]) -> Dict:
+        """Verdict from the first matching blocked/warning pattern"""
+        if matched_rule is not None:
+            return matched_rule.verdict()
         
         return {
             "risk": RiskLevel.NONE,
@@ -98,6 +216,11 @@ class ContentFilterPolicy(GuardRailPolicy):
             "confidence": 0.90
         }
     
+    async def evaluate(self, request_data: Dict) -> Dict:
+        """Evaluate content for safety risks"""
+        content = request_data.get("content", "").lower()
+        return self.assess(request_data, self.first_matching_rule(content))
+    
     def get_mitigation_strategy(self, risk_level: RiskLevel) -> str:
         """Get mitigation strategy"""
         strategies = {
@@ -125,28 +248,20 @@ class IntentAnalysisPolicy(GuardRailPolicy):
             "explore", "analyze", "examine"
         ]
     
-    async def evaluate(self, request_data: Dict) -> Dict:
-        """Analyze request intent"""
-        content = request_data.get("content", "").lower()
-        context = request_data.get("context", {})
-        
-        # Check for harmful intent
-        for intent in self.harmful_intents:
-            if intent in content:
-                return {
-                    "risk": RiskLevel.HIGH,
-                    "reason": f"Harmful intent detected: {intent}",
-                    "confidence": 0.85
-                }
-        
-        # Check for suspicious intent
-        for intent in self.suspicious_intents:
-            if intent in content:
-                return {
-                    "risk": RiskLevel.LOW,
-                    "reason": f"Suspicious intent detected: {intent}",
-                    "confidence": 0.70
-                }
+    def get_content_rules(self) -> List[PolicyRule]:
+        """Harmful intents first, then suspicious intents (substring matches)"""
+        return [
+            PolicyRule(intent, RiskLevel.HIGH, f"Harmful intent detected: {intent}", 0.85, is_regex=False)
+            for intent in self.harmful_intents
+        ] + [
+            PolicyRule(intent, RiskLevel.LOW, f"Suspicious intent detected: {intent}", 0.70, is_regex=False)
+            for intent in self.suspicious_intents
+        ]
+    
+    def assess(self, request_data: Dict, matched_rule: Optional[PolicyRule]) -> Dict:
+        """Verdict from the first matching intent keyword"""
+        if matched_rule is not None:
+            return matched_rule.verdict()
         
         return {
             "risk": RiskLevel.NONE,
@@ -154,6 +269,11 @@ class IntentAnalysisPolicy(GuardRailPolicy):
             "confidence": 0.80
         }
     
+    async def evaluate(self, request_data: Dict) -> Dict:
+        """Analyze request intent"""
+        content = request_data.get("content", "").lower()
+        return self.assess(request_data, self.first_matching_rule(content))
+    
     def get_mitigation_strategy(self, risk_level: RiskLevel) -> str:
         """Get mitigation strategy"""
         strategies = {
@@ -179,6 +299,10 @@ class ContextValidationPolicy(GuardRailPolicy):
     
     async def evaluate(self, request_data: Dict) -> Dict:
         """Validate request context"""
+        return self.assess(request_data, None)
+    
+    def assess(self, request_data: Dict, matched_rule: Optional[PolicyRule]) -> Dict:
+        """Validate user and session context (no content rules)"""
         context = request_data.get("context", {})
         user_id = request_data.get("user_id", "")
         
@@ -231,9 +355,15 @@ class RecursiveSafetyPolicy(GuardRailPolicy):
             r"circular.*dependency"
         ]
     
-    async def evaluate(self, request_data: Dict) -> Dict:
-        """Check for recursive safety issues"""
-        content = request_data.get("content", "").lower()
+    def get_content_rules(self) -> List[PolicyRule]:
+        """Recursive patterns, checked after the depth limit"""
+        return [
+            PolicyRule(pattern, RiskLevel.MODERATE, f"Recursive pattern detected: {pattern}", 0.80)
+            for pattern in self.recursive_patterns
+        ]
+    
+    def assess(self, request_data: Dict, matched_rule: Optional[PolicyRule]) -> Dict:
+        """Check recursion depth, then the first matching recursive pattern"""
         context = request_data.get("context", {})
         depth = context.get("depth", 0)
         
@@ -245,14 +375,8 @@ class RecursiveSafetyPolicy(GuardRailPolicy):
                 "confidence": 0.90
             }
         
-        # Check for recursive patterns
-        for pattern in self.recursive_patterns:
-            if re.search(pattern, content):
-                return {
-                    "risk": RiskLevel.MODERATE,
-                    "reason": f"Recursive pattern detected: {pattern}",
-                    "confidence": 0.80
-                }
+        if matched_rule is not None:
+            return matched_rule.verdict()
         
         return {
             "risk": RiskLevel.NONE,
@@ -260,6 +384,11 @@ class RecursiveSafetyPolicy(GuardRailPolicy):
             "confidence": 0.85
         }
     
+    async def evaluate(self, request_data: Dict) -> Dict:
+        """Check for recursive safety issues"""
+        content = request_data.get("content", "").lower()
+        return self.assess(request_data, self.first_matching_rule(content))
+    
     def get_mitigation_strategy(self, risk_level: RiskLevel) -> str:
         """Get mitigation strategy"""
         strategies = {
@@ -271,22 +400,83 @@ class RecursiveSafetyPolicy(GuardRailPolicy):
         }
         return strategies.get(risk_level, "Unknown risk level")
 
+def _evaluate_in_thread(policy: GuardRailPolicy, request_data: Dict) -> Dict:
+    """Run a CPU-bound policy's evaluate() to completion on a worker thread"""
+    return asyncio.run(policy.evaluate(request_data))
+
 class GuardRailSystem:
     """
     Multi-layer guard-rail safety system
+    
+    Evaluation modes:
+        sequential: policies run one after another in priority order
+        concurrent: async policies run together on the event loop and
+                    CPU-bound ones on a thread pool
+    Either mode can stop at the first BANNED verdict (short_circuit) and
+    bound the total time spent in policies (policy_budget_ms). A layer that
+    fails or runs out of budget is judged failure_risk (fail closed at HIGH
+    by default; RiskLevel.NONE fails open).
+    
+    Verdicts are cached by normalized content hash and policy-set version
+    (verdict_cache_size=0 disables the cache); policies must judge content
+    case-insensitively, as the built-in ones do.
     """
     
-    def __init__(self):
+    EVALUATION_MODES = ("sequential", "concurrent")
+    
+    def __init__(self, use_compiled_matcher: bool = True,
+                 evaluation_mode: str = "sequential",
+                 short_circuit: bool = False,
+                 policy_budget_ms: Optional[float] = None,
+                 include_layer_details: bool = True,
+                 max_workers: int = 4,
+                 verdict_cache_size: int = 10000,
+                 verdict_cache_ttl: Optional[float] = 300.0,
+                 failure_risk: RiskLevel = RiskLevel.HIGH):
+        if evaluation_mode not in self.EVALUATION_MODES:
+            raise ValueError(f"Unknown evaluation mode: {evaluation_mode}")
+        
         self.policies: List[GuardRailPolicy] = []
         self.risk_levels = list(RiskLevel)
         self.policy_layers = list(PolicyLayer)
         self.enabled = True
+        
+        # One matcher over every policy's content rules, rebuilt when policies change
+        self.use_compiled_matcher = use_compiled_matcher
+        self.policy_version = 0
+        self._matcher: Optional[CompiledRuleMatcher] = None
+        
+        self.evaluation_mode = evaluation_mode
+        self.short_circuit = short_circuit
+        self.policy_budget_ms = policy_budget_ms
+        self.failure_risk = failure_risk
+        self.include_layer_details = include_layer_details
+        self.max_workers = max_workers
+        self._executor: Optional[ThreadPoolExecutor] = None
+        
+        self.verdict_cache: Optional[VerdictCache] = None
+        if verdict_cache_size > 0:
+            self.verdict_cache = VerdictCache(verdict_cache_size, verdict_cache_ttl)
     
     def add_policy(self, policy: GuardRailPolicy):
         """Add a guard-rail policy"""
         self.policies.append(policy)
         # Sort by priority (higher priority first)
         self.policies.sort(key=lambda p: p.priority, reverse=True)
+        self.recompile()
+    
+    def recompile(self):
+        """Rebuild the single-pass matcher (call after editing a policy's patterns)"""
+        rules = []
+        for owner, policy in enumerate(self.policies):
+            for order, rule in enumerate(policy.get_content_rules()):
+                rule.owner = owner
+                rule.order = order
+                rules.append(rule)
+        self._matcher = CompiledRuleMatcher(rules)
+        self.policy_version += 1
+        if self.verdict_cache is not None:
+            self.verdict_cache.invalidate()
     
     async def check_request(self, request_data: Dict) -> Dict:
         """
@@ -307,6 +497,9 @@ class GuardRailSystem:
                 - mitigation: Recommended mitigation strategy
                 - confidence: Confidence in assessment (0.0-1.0)
                 - layers_checked: List of policy layers evaluated
+                - short_circuited: Evaluation stopped at a BANNED verdict
+                - budget_exceeded: Some layers ran out of the policy time budget
+                - layer_details: Per-layer results (when include_layer_details is set)
         """
         if not self.enabled:
             return {
@@ -317,36 +510,57 @@ class GuardRailSystem:
                 "layers_checked": []
             }
         
+        cache_version = digest = None
+        if self.verdict_cache is not None:
+            cache_version = self._cache_version()
+            digest = self._request_digest(request_data)
+            cached = self.verdict_cache.get(cache_version, digest)
+            if cached is not None:
+                return self._copy_response(cached)
+        
+        # Scan the content once for every policy's rules
+        content_matches = None
+        if self.use_compiled_matcher:
+            if self._matcher is None:
+                self.recompile()
+            try:
+                content_matches = self._matcher.first_matches(request_data.get("content", "").lower())
+            except Exception:
+                # Let each policy surface the problem through evaluate()
+                content_matches = None
+        
+        active = [(index, policy) for index, policy in enumerate(self.policies) if policy.enabled]
+        if self.evaluation_mode == "concurrent":
+            outcomes, short_circuited, budget_exceeded = await self._evaluate_concurrently(
+                active, request_data, content_matches)
+        else:
+            outcomes, short_circuited, budget_exceeded = await self._evaluate_sequentially(
+                active, request_data, content_matches)
+        
         layer_results = []
         highest_risk = RiskLevel.NONE
         reasons = []
         
-        # Evaluate each policy layer
-        for policy in self.policies:
-            if policy.enabled:
-                try:
-                    result = await policy.evaluate(request_data)
-                    layer_results.append({
-                        "layer": policy.layer.value,
-                        "risk": result["risk"],
-                        "reason": result["reason"],
-                        "confidence": result.get("confidence", 0.5)
-                    })
-                    
-                    # Track highest risk level
-                    if result["risk"].value > highest_risk.value:
-                        highest_risk = result["risk"]
-                        reasons = [result["reason"]]
-                    elif result["risk"].value == highest_risk.value:
-                        reasons.append(result["reason"])
-                        
-                except Exception as e:
-                    layer_results.append({
-                        "layer": policy.layer.value,
-                        "risk": RiskLevel.HIGH,
-                        "reason": f"Policy evaluation failed: {str(e)}",
-                        "confidence": 0.0
-                    })
+        # Budget overruns and policy failures are not verdicts worth remembering
+        cacheable = not budget_exceeded
+        
+        # Aggregate in priority order, whatever order the layers finished in
+        for index, policy, result in sorted(outcomes, key=lambda outcome: outcome[0]):
+            if result.get("transient"):
+                cacheable = False
+            layer_results.append({
+                "layer": policy.layer.value,
+                "risk": result["risk"].value,
+                "reason": result["reason"],
+                "confidence": result.get("confidence", 0.5)
+            })
+            
+            # Track highest risk level
+            if result["risk"].value > highest_risk.value:
+                highest_risk = result["risk"]
+                reasons = [result["reason"]]
+            elif result["risk"].value == highest_risk.value:
+                reasons.append(result["reason"])
         
         # Aggregate results
         final_risk = highest_risk
@@ -354,15 +568,183 @@ class GuardRailSystem:
         final_confidence = self.calculate_aggregate_confidence(layer_results)
         final_mitigation = self.get_final_mitigation_strategy(final_risk)
         
-        return {
+        response = {
             "risk": final_risk.value,
             "reason": final_reason,
             "mitigation": final_mitigation,
             "confidence": final_confidence,
             "layers_checked": [r["layer"] for r in layer_results],
-            "layer_details": layer_results
+            "short_circuited": short_circuited,
+            "budget_exceeded": budget_exceeded
+        }
+        if self.include_layer_details:
+            response["layer_details"] = layer_results
+        
+        if cacheable and digest is not None:
+            self.verdict_cache.put(cache_version, digest, self._copy_response(response))
+        return response
+    
+    def _cache_version(self) -> Tuple:
+        """Everything besides the request that shapes a verdict"""
+        return (self.policy_version,
+                tuple(policy.enabled for policy in self.policies),
+                self.evaluation_mode,
+                self.short_circuit,
+                self.include_layer_details)
+    
+    @staticmethod
+    def _request_digest(request_data: Dict) -> bytes:
+        """Hash of the normalized content and the other request fields policies read"""
+        extra = {key: value for key, value in request_data.items()
+                 if key not in ("content", "timestamp")}
+        return content_digest(request_data.get("content", ""), extra)
+    
+    @staticmethod
+    def _copy_response(response: Dict) -> Dict:
+        """Copy so callers never mutate a cached verdict"""
+        copied = dict(response)
+        if "layer_details" in copied:
+            copied["layer_details"] = [dict(layer) for layer in copied["layer_details"]]
+        copied["layers_checked"] = list(copied["layers_checked"])
+        return copied
+    
+    def get_cache_stats(self) -> Dict[str, Any]:
+        """Verdict cache hit-rate metrics"""
+        if self.verdict_cache is None:
+            return {"enabled": False}
+        return {"enabled": True, **self.verdict_cache.get_stats()}
+    
+    def _assess_inline(self, index: int, policy: GuardRailPolicy, request_data: Dict,
+                       content_matches: Optional[Dict[int, PolicyRule]]) -> Optional[Dict]:
+        """Verdict from the shared content scan, if the policy supports it"""
+        if content_matches is None:
+            return None
+        return policy.assess(request_data, content_matches.get(index))
+    
+    async def _run_policy(self, policy: GuardRailPolicy, request_data: Dict) -> Dict:
+        """Evaluate one policy, on the thread pool if it is CPU-bound"""
+        if policy.cpu_bound:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.max_workers,
+                                                    thread_name_prefix="guard-rail")
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._executor, _evaluate_in_thread, policy, request_data)
+        return await policy.evaluate(request_data)
+    
+    def _failure_result(self, error: Exception) -> Dict:
+        return {
+            "risk": self.failure_risk,
+            "reason": f"Policy evaluation failed: {str(error)}",
+            "confidence": 0.0,
+            "transient": True
         }
     
+    def _budget_result(self) -> Dict:
+        return {
+            "risk": self.failure_risk,
+            "reason": f"Policy evaluation exceeded {self.policy_budget_ms}ms budget",
+            "confidence": 0.0,
+            "transient": True
+        }
+    
+    def _deadline(self) -> Optional[float]:
+        if self.policy_budget_ms is None:
+            return None
+        return asyncio.get_running_loop().time() + self.policy_budget_ms / 1000.0
+    
+    async def _evaluate_sequentially(self, active: List[Tuple[int, GuardRailPolicy]], request_data: Dict,
+                                     content_matches: Optional[Dict[int, PolicyRule]]):
+        """Evaluate policies in priority order; returns (outcomes, short_circuited, budget_exceeded)"""
+        loop = asyncio.get_running_loop()
+        deadline = self._deadline()
+        outcomes = []
+        budget_exceeded = False
+        
+        for index, policy in active:
+            try:
+                result = self._assess_inline(index, policy, request_data, content_matches)
+                if result is None:
+                    if deadline is None:
+                        result = await self._run_policy(policy, request_data)
+                    else:
+                        result = await asyncio.wait_for(self._run_policy(policy, request_data),
+                                                        max(0.0, deadline - loop.time()))
+            except asyncio.TimeoutError:
+                result = self._budget_result()
+                budget_exceeded = True
+            except Exception as e:
+                result = self._failure_result(e)
+            
+            outcomes.append((index, policy, result))
+            if self.short_circuit and result["risk"] == RiskLevel.BANNED:
+                return outcomes, True, budget_exceeded
+        
+        return outcomes, False, budget_exceeded
+    
+    async def _evaluate_concurrently(self, active: List[Tuple[int, GuardRailPolicy]], request_data: Dict,
+                                     content_matches: Optional[Dict[int, PolicyRule]]):
+        """Evaluate policies together; returns (outcomes, short_circuited, budget_exceeded)"""
+        loop = asyncio.get_running_loop()
+        deadline = self._deadline()
+        outcomes = []
+        remaining = []
+        
+        # Layers answered by the shared content scan need no scheduling
+        for index, policy in active:
+            try:
+                result = self._assess_inline(index, policy, request_data, content_matches)
+            except Exception as e:
+                result = self._failure_result(e)
+            if result is None:
+                remaining.append((index, policy))
+                continue
+            outcomes.append((index, policy, result))
+            if self.short_circuit and result["risk"] == RiskLevel.BANNED:
+                return outcomes, True, False
+        
+        if not remaining:
+            return outcomes, False, False
+        
+        tasks = {
+            asyncio.ensure_future(self._run_policy(policy, request_data)): (index, policy)
+            for index, policy in remaining
+        }
+        pending = set(tasks)
+        short_circuited = budget_exceeded = False
+        
+        while pending:
+            timeout = None if deadline is None else max(0.0, deadline - loop.time())
+            done, pending = await asyncio.wait(pending, timeout=timeout,
+                                               return_when=asyncio.FIRST_COMPLETED)
+            if not done:
+                budget_exceeded = True
+                for task in pending:
+                    task.cancel()
+                    outcomes.append((*tasks[task], self._budget_result()))
+                break
+            
+            for task in done:
+                try:
+                    result = task.result()
+                except Exception as e:
+                    result = self._failure_result(e)
+                outcomes.append((*tasks[task], result))
+                if self.short_circuit and result["risk"] == RiskLevel.BANNED:
+                    short_circuited = True
+            
+            if short_circuited:
+                for task in pending:
+                    task.cancel()
+                break
+        
+        return outcomes, short_circuited, budget_exceeded
+    
+    def close(self):
+        """Shut down the thread pool used for CPU-bound policies"""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+    
     def calculate_aggregate_confidence(self, layer_results: List[Dict]) -> float:
         """Calculate aggregate confidence from layer results"""
         if not layer_results:
@@ -500,5 +882,44 @@ async def test_guard_rail_system():
         print(f"Mitigation: {result['mitigation']}")
         print("---")
 
+def create_default_guard_rail_system(use_compiled_matcher: bool = True,
+                                     verdict_cache_size: int = 10000) -> GuardRailSystem:
+    """Guard-rail system with the four built-in policy layers"""
+    guard_rail = GuardRailSystem(use_compiled_matcher=use_compiled_matcher,
+                                 verdict_cache_size=verdict_cache_size)
+    guard_rail.add_policy(ContentFilterPolicy())
+    guard_rail.add_policy(IntentAnalysisPolicy())
+    guard_rail.add_policy(ContextValidationPolicy())
+    guard_rail.add_policy(RecursiveSafetyPolicy())
+    return guard_rail
+
+async def benchmark_guard_rail_system(num_requests: int = 20000) -> Dict[str, float]:
+    """Requests/sec of check_request with per-policy scans, the compiled matcher and the verdict cache"""
+    contents = [
+        "What is the weather today?",
+        "How to hack into a system?",
+        "This is a security test of the recursive call handling",
+        "Please summarise the quarterly report for the finance team " * 4,
+        "Is it ethical hacking to steal password hashes during a penetration test?"
+    ]
+    requests = [
+        {"content": contents[i % len(contents)], "user_id": "user123", "context": {"session_id": "123"}}
+        for i in range(num_requests)
+    ]
+    
+    results = {}
+    for mode, compiled, cache_size in (("per_policy", False, 0), ("compiled", True, 0), ("cached", True, 10000)):
+        guard_rail = create_default_guard_rail_system(use_compiled_matcher=compiled,
+                                                      verdict_cache_size=cache_size)
+        start = time.perf_counter()
+        for request in requests:
+            await guard_rail.check_request(request)
+        elapsed = time.perf_counter() - start
+        results[mode] = num_requests / elapsed if elapsed > 0 else 0.0
+        print(f"{mode:<10} {results[mode]:,.0f} requests/sec")
+    
+    return results
+
 if __name__ == "__main__":
-    asyncio.run(test_guard_rail_system()) 
\ No newline at end of file
+    asyncio.run(test_guard_rail_system())
+    asyncio.run(benchmark_guard_rail_system()) 
\ No newline at end of file
@@ -15,9 +15,21 @@ import yaml
 
 # Import core components
 from paradox_resolver import ParadoxResolver
-from guard_rail_system import GuardRailSystem
+from guard_rail_system import GuardRailSystem, RiskLevel, RISK_SEVERITY
 from mythgraph_ledger import MythGraphLedger
-from plugin_framework import PluginManager
+from plugin_framework import PluginManager, PluginType
+from request_pipeline import RequestPipeline, AIMDLimiter
+from kai_metrics import MetricsRegistry, PrometheusExporter
+from verdict_cache import VerdictCache, content_digest
+
+# Timed sections of process_request, plus the whole request
+PIPELINE_STAGES = ("safety", "paradox", "generation", "ledger_write", "total")
+
+# Phrases the engine has always screened for on top of the resolver's defaults
+ENGINE_PARADOX_PATTERNS = {
+    "self_reference": ["the next sentence is true", "self reference"],
+    "circular_dependency": ["circular dependency"]
+}
 
 class KaiCoreEngine:
     """
@@ -33,6 +45,9 @@ class KaiCoreEngine:
         self.guard_rail_system = None
         self.mythgraph_ledger = None
         self.plugin_manager = None
+        self.request_pipeline = None
+        # Content the guard rails recently blocked, so a resubmission takes the incident lane
+        self.blocked_content: Optional[VerdictCache] = None
         
         # System state
         self.status = "initializing"
@@ -50,6 +65,22 @@ class KaiCoreEngine:
             "blocked_requests": 0,
             "resolved_paradoxes": 0
         }
+        
+        # Streaming per-stage latency histograms and counters for export
+        self.metrics_registry = MetricsRegistry()
+        self.stage_latency = {
+            stage: self.metrics_registry.histogram(
+                "kai_stage_latency_seconds", "Latency of each request pipeline stage", stage=stage)
+            for stage in PIPELINE_STAGES
+        }
+        self.request_counters = {
+            outcome: self.metrics_registry.counter(
+                "kai_requests_total", "Processed requests by outcome", outcome=outcome)
+            for outcome in ("success", "blocked", "error")
+        }
+        self.paradox_counter = self.metrics_registry.counter(
+            "kai_paradoxes_resolved_total", "Paradoxes resolved while processing requests")
+        self.metrics_exporter = None
     
     def load_config(self, config_path: str) -> Dict:
         """Load configuration from file"""
@@ -68,18 +99,66 @@ class KaiCoreEngine:
                 },
                 "paradox_resolution": {
                     "timeout_ms": 5000,
-                    "max_iterations": 100
+                    "max_iterations": 100,
+                    "verdict_cache": {
+                        "max_entries": 10000,
+                        "ttl_seconds": 300
+                    }
                 },
                 "guard_rails": {
                     "risk_levels": ["none", "low", "moderate", "high", "banned"],
                     "auto_patch": True,
-                    "incident_logging": True
+                    "incident_logging": True,
+                    "evaluation_mode": "concurrent",
+                    "short_circuit_on_banned": True,
+                    "policy_budget_ms": 50,
+                    "failure_risk": "high",
+                    "layer_details": True,
+                    "verdict_cache": {
+                        "max_entries": 10000,
+                        "ttl_seconds": 300
+                    }
+                },
+                "plugins": {
+                    "directory": "plugins",
+                    "lazy_loading": True,
+                    "hot_reload": True,
+                    "watch_interval_s": 2.0,
+                    "timeout_ms": 100,
+                    "max_concurrency": 8
+                },
+                "metrics": {
+                    "prometheus": {
+                        "enabled": False,
+                        "textfile": "kai_metrics.prom",
+                        "port": None,
+                        "interval_s": 15
+                    }
+                },
+                "serving": {
+                    "enabled": True,
+                    "workers": 64,
+                    "queue_size": 1024,
+                    "initial_concurrency": 16,
+                    "min_concurrency": 2,
+                    "target_latency_ms": 50,
+                    "max_queue_delay_ms": 1000,
+                    "blocked_content_cache": {
+                        "max_entries": 1024,
+                        "ttl_seconds": 300
+                    }
                 },
                 "mythgraph": {
                     "ledger": {
                         "type": "local",
                         "encryption": True,
                         "public_logging": True
+                    },
+                    "writer": {
+                        "enabled": True,
+                        "batch_size": 256,
+                        "flush_interval_ms": 20.0,
+                        "max_pending": 10000
                     }
                 }
             }
@@ -113,6 +192,10 @@ class KaiCoreEngine:
             # Initialize plugin manager
             await self.initialize_plugin_manager()
             
+            # Start the serving front end last, once every component is ready
+            self.initialize_request_pipeline()
+            self.initialize_metrics_exporter()
+            
             # Set system status
             self.status = "active"
             self.start_time = datetime.utcnow()
@@ -132,7 +215,18 @@ class KaiCoreEngine:
         public_key = self.config.get("mythgraph", {}).get("public_key", "kai_core_v8_public_key")
         private_key = self.config.get("mythgraph", {}).get("private_key", "kai_core_v8_private_key")
         
-        self.mythgraph_ledger = MythGraphLedger(public_key, private_key)
+        storage_path = self.config.get("mythgraph", {}).get("storage_path")
+        
+        self.mythgraph_ledger = MythGraphLedger(public_key, private_key, storage_path)
+        
+        # Request logging only enqueues; a background writer group-commits to disk
+        writer_config = self.config.get("mythgraph", {}).get("writer", {})
+        if writer_config.get("enabled", True):
+            await self.mythgraph_ledger.start_writer(
+                batch_size=writer_config.get("batch_size", 256),
+                flush_interval_ms=writer_config.get("flush_interval_ms", 20.0),
+                max_pending=writer_config.get("max_pending", 10000)
+            )
         
         # Log initialization event
         await self.mythgraph_ledger.add_entry("system_event", {
@@ -148,7 +242,18 @@ class KaiCoreEngine:
         self.logger.info("🧠 Initializing paradox resolver...")
         
         from paradox_resolver import DefaultParadoxResolver
-        self.paradox_resolver = DefaultParadoxResolver()
+        
+        # Agent loops resubmit the same content; repeated detections come from the cache.
+        # Extra detection phrases ({paradox_type: [phrases]}) extend the prebuilt matcher.
+        paradox_config = self.config.get("paradox_resolution", {})
+        cache_config = paradox_config.get("verdict_cache", {})
+        self.paradox_resolver = DefaultParadoxResolver(
+            verdict_cache_size=cache_config.get("max_entries", 10000),
+            verdict_cache_ttl=cache_config.get("ttl_seconds", 300)
+        )
+        self.paradox_resolver.add_patterns(ENGINE_PARADOX_PATTERNS)
+        if paradox_config.get("patterns"):
+            self.paradox_resolver.add_patterns(paradox_config["patterns"])
         
         # Log initialization
         await self.mythgraph_ledger.add_entry("system_event", {
@@ -162,7 +267,20 @@ class KaiCoreEngine:
         """Initialize guard-rail safety system"""
         self.logger.info("🛡️ Initializing guard-rail system...")
         
-        self.guard_rail_system = GuardRailSystem()
+        # Guard rails are on every request's hot path: evaluate layers together,
+        # stop at the first BANNED verdict and bound the time spent in policies
+        # Repeated requests are answered from a verdict cache that add_policy invalidates
+        guard_rail_config = self.config.get("guard_rails", {})
+        cache_config = guard_rail_config.get("verdict_cache", {})
+        self.guard_rail_system = GuardRailSystem(
+            evaluation_mode=guard_rail_config.get("evaluation_mode", "concurrent"),
+            short_circuit=guard_rail_config.get("short_circuit_on_banned", True),
+            policy_budget_ms=guard_rail_config.get("policy_budget_ms", 50),
+            include_layer_details=guard_rail_config.get("layer_details", True),
+            verdict_cache_size=cache_config.get("max_entries", 10000),
+            verdict_cache_ttl=cache_config.get("ttl_seconds", 300),
+            failure_risk=RiskLevel(guard_rail_config.get("failure_risk", "high"))
+        )
         
         # Add default policies
         from guard_rail_system import ContentFilterPolicy
@@ -181,24 +299,101 @@ class KaiCoreEngine:
         """Initialize plugin management system"""
         self.logger.info("🔌 Initializing plugin manager...")
         
-        self.plugin_manager = PluginManager(self.mythgraph_ledger)
+        plugin_config = self.config.get("plugins", {})
+        self.plugin_manager = PluginManager(self.mythgraph_ledger,
+                                            plugin_config.get("directory", "plugins"),
+                                            max_concurrency=plugin_config.get("max_concurrency", 8),
+                                            plugin_timeout_ms=plugin_config.get("timeout_ms", 100))
         
-        # Load default plugins if any
-        plugin_directory = Path("plugins")
-        if plugin_directory.exists():
-            for plugin_dir in plugin_directory.iterdir():
-                if plugin_dir.is_dir():
-                    await self.plugin_manager.load_plugin(plugin_dir.name)
+        # Discover plugins from the manifest cache; lazy plugins start on first use
+        registered = await self.plugin_manager.load_all(lazy=plugin_config.get("lazy_loading", True))
+        if plugin_config.get("hot_reload", True):
+            self.plugin_manager.start_watching(plugin_config.get("watch_interval_s", 2.0))
         
         # Log initialization
         await self.mythgraph_ledger.add_entry("system_event", {
             "event": "plugin_manager_initialized",
             "timestamp": datetime.utcnow().isoformat(),
-            "loaded_plugins": len(self.plugin_manager.plugins)
+            "loaded_plugins": len(self.plugin_manager.plugins),
+            "registered_plugins": registered
         })
         
         self.logger.info("✅ Plugin manager initialized")
     
+    def initialize_request_pipeline(self):
+        """Start the bounded, prioritised request queue and its workers"""
+        serving_config = self.config.get("serving", {})
+        if not serving_config.get("enabled", True):
+            return
+        
+        workers = serving_config.get("workers", 64)
+        limiter = AIMDLimiter(
+            initial=serving_config.get("initial_concurrency", 16),
+            minimum=serving_config.get("min_concurrency", 2),
+            maximum=workers,
+            target_latency_ms=serving_config.get("target_latency_ms", 50)
+        )
+        blocked_config = serving_config.get("blocked_content_cache", {})
+        if blocked_config.get("max_entries", 1024) > 0:
+            self.blocked_content = VerdictCache(blocked_config.get("max_entries", 1024),
+                                                blocked_config.get("ttl_seconds", 300))
+        self.request_pipeline = RequestPipeline(
+            self.process_request,
+            workers=workers,
+            queue_size=serving_config.get("queue_size", 1024),
+            max_queue_delay_ms=serving_config.get("max_queue_delay_ms", 1000),
+            limiter=limiter,
+            lane_selector=self.select_lane
+        )
+        self.request_pipeline.start()
+        
+        pipeline = self.request_pipeline
+        self.metrics_registry.gauge("kai_pipeline_queued", "Requests waiting in the pipeline",
+                                    fn=lambda: pipeline.queued)
+        self.metrics_registry.gauge("kai_pipeline_in_flight", "Requests being served",
+                                    fn=lambda: pipeline.in_flight)
+        self.metrics_registry.gauge("kai_pipeline_concurrency_limit", "Adaptive concurrency limit",
+                                    fn=lambda: pipeline.limiter.current)
+        
+        self.logger.info(f"✅ Request pipeline started ({workers} workers)")
+    
+    def initialize_metrics_exporter(self):
+        """Export metrics in Prometheus text format to a file and/or HTTP endpoint"""
+        exporter_config = self.config.get("metrics", {}).get("prometheus", {})
+        if not exporter_config.get("enabled", False):
+            return
+        
+        self.metrics_exporter = PrometheusExporter(
+            self.metrics_registry,
+            textfile=exporter_config.get("textfile"),
+            port=exporter_config.get("port"),
+            host=exporter_config.get("host", "127.0.0.1"),
+            interval_s=exporter_config.get("interval_s", 15)
+        )
+        self.metrics_exporter.start()
+        
+        self.logger.info("✅ Prometheus metrics exporter started")
+    
+    async def submit_request(self, request_data: Dict, priority: Optional[str] = None) -> Dict:
+        """
+        Serve a request through the admission-controlled pipeline
+        
+        priority selects the lane ("incident", "interactive" or "bulk") for
+        trusted in-process callers; otherwise select_lane decides. A "priority"
+        field in request_data is ignored. Under overload the response has
+        "overloaded": True instead of being processed.
+        """
+        if self.request_pipeline is None:
+            return await self.process_request(request_data)
+        return await self.request_pipeline.submit(request_data, priority)
+    
+    def select_lane(self, request_data: Dict) -> str:
+        """Server-side lane: content blocked recently is an incident path, the rest is interactive"""
+        if self.blocked_content is not None and self.blocked_content.get(
+                self.guard_rail_system.policy_version, content_digest(request_data.get("content", ""))):
+            return "incident"
+        return "interactive"
+    
     async def process_request(self, request_data: Dict) -> Dict:
         """
         Process a user request through the complete Kai Core pipeline
@@ -215,18 +410,27 @@ class KaiCoreEngine:
         """
         start_time = time.time()
         self.request_count += 1
+        request_start = stage_start = time.perf_counter()
         
         try:
             # Step 1: Guard-rail safety check
             safety_result = await self.check_safety(request_data)
+            stage_start = self.record_stage("safety", stage_start)
             
             if safety_result["risk"] in ["high", "banned"]:
                 # Request blocked by guard-rails
+                if self.blocked_content is not None:
+                    self.blocked_content.put(self.guard_rail_system.policy_version,
+                                             content_digest(request_data.get("content", "")), True)
                 await self.log_incident("guard_rail_block", {
                     "request": request_data,
                     "reason": safety_result["reason"],
                     "risk": safety_result["risk"]
                 })
+                self.record_stage("ledger_write", stage_start)
+                self.record_stage("total", request_start)
+                self.request_counters["blocked"].inc()
+                self.metrics["blocked_requests"] += 1
                 
                 return {
                     "success": False,
@@ -238,12 +442,16 @@ class KaiCoreEngine:
             
             # Step 2: Paradox resolution (if needed)
             paradox_result = await self.resolve_paradoxes(request_data)
+            stage_start = self.record_stage("paradox", stage_start)
             
             # Step 3: Generate response
             response = await self.generate_response(request_data, paradox_result)
+            stage_start = self.record_stage("generation", stage_start)
             
             # Step 4: Log to MythGraph
             await self.log_request(request_data, response, safety_result, paradox_result)
+            self.record_stage("ledger_write", stage_start)
+            self.record_stage("total", request_start)
             
             # Update metrics
             processing_time = (time.time() - start_time) * 1000
@@ -264,6 +472,8 @@ class KaiCoreEngine:
                 "error": str(e),
                 "timestamp": datetime.utcnow().isoformat()
             })
+            self.record_stage("total", request_start)
+            self.request_counters["error"].inc()
             
             return {
                 "success": False,
@@ -271,38 +481,74 @@ class KaiCoreEngine:
                 "processing_time_ms": (time.time() - start_time) * 1000
             }
     
+    def record_stage(self, stage: str, stage_start: float) -> float:
+        """Record a stage's latency since stage_start; returns the end time for the next stage"""
+        now = time.perf_counter()
+        self.stage_latency[stage].record((now - stage_start) * 1000)
+        return now
+    
     async def check_safety(self, request_data: Dict) -> Dict:
-        """Check request safety using guard-rail system"""
-        return await self.guard_rail_system.check_request(request_data)
+        """Check request safety using guard-rail system and any guard-rail extension plugins"""
+        if not self.plugin_manager or not self.plugin_manager.get_plugins_by_type(PluginType.GUARD_RAIL_EXTENSION):
+            return await self.guard_rail_system.check_request(request_data)
+        
+        # Extensions run alongside the built-in layers, each under the plugin timeout budget
+        safety_result, plugin_result = await asyncio.gather(
+            self.guard_rail_system.check_request(request_data),
+            self.plugin_manager.run_pipeline(PluginType.GUARD_RAIL_EXTENSION, request_data)
+        )
+        self.metrics["plugin_performance"] = plugin_result["duration_ms"]
+        
+        # Extensions that time out or fail are judged like a failed built-in layer
+        failure_risk = self.guard_rail_system.failure_risk
+        failures = {name: "timed out" for name in plugin_result["timed_out"]}
+        failures.update({name: f"failed: {error}" for name, error in plugin_result["errors"].items()})
+        if failures and RISK_SEVERITY[failure_risk] > RISK_SEVERITY[RiskLevel(safety_result["risk"])]:
+            safety_result["risk"] = failure_risk.value
+            safety_result["reason"] = "; ".join(
+                f"{name}: guard-rail extension {failure}" for name, failure in sorted(failures.items()))
+            safety_result["mitigation"] = self.guard_rail_system.get_final_mitigation_strategy(failure_risk)
+        
+        # An extension can only escalate the verdict
+        for name, result in plugin_result["results"].items():
+            try:
+                plugin_risk = RiskLevel(result.get("risk_level", "none"))
+            except (ValueError, AttributeError):
+                continue
+            if RISK_SEVERITY[plugin_risk] > RISK_SEVERITY[RiskLevel(safety_result["risk"])]:
+                safety_result["risk"] = plugin_risk.value
+                safety_result["reason"] = f"{name}: {result.get('reason', 'Guard-rail extension')}"
+                safety_result["mitigation"] = self.guard_rail_system.get_final_mitigation_strategy(plugin_risk)
+        safety_result["plugin_checks"] = plugin_result
+        return safety_result
     
     async def resolve_paradoxes(self, request_data: Dict) -> Dict:
         """Resolve any paradoxes in the request"""
         content = request_data.get("content", "")
         
-        # Check for paradox patterns
-        paradox_patterns = [
-            "this statement is false",
-            "i am lying",
-            "the next sentence is true",
-            "circular dependency",
-            "self reference"
-        ]
+        # Detection goes through the resolver's matcher and verdict cache
+        detection = self.paradox_resolver.detect_paradox(content)
         
         paradoxes_found = []
-        for pattern in paradox_patterns:
-            if pattern.lower() in content.lower():
-                paradox_data = {
-                    "text": content,
-                    "pattern": pattern,
-                    "context": request_data.get("context", {}),
-                    "timestamp": datetime.utcnow().isoformat()
-                }
-                
-                resolution = await self.paradox_resolver.resolve_paradox(paradox_data)
-                paradoxes_found.append({
-                    "pattern": pattern,
-                    "resolution": resolution
-                })
+        seen_patterns = set()
+        for match in detection.get("matches", []):
+            pattern = match["pattern"]
+            if pattern in seen_patterns:
+                continue
+            seen_patterns.add(pattern)
+            paradox_data = {
+                "text": content,
+                "pattern": pattern,
+                "paradox_type": match["paradox_type"],
+                "context": request_data.get("context", {}),
+                "timestamp": datetime.utcnow().isoformat()
+            }
+            
+            resolution = await self.paradox_resolver.resolve_paradox(paradox_data)
+            paradoxes_found.append({
+                "pattern": pattern,
+                "resolution": resolution
+            })
         
         return {
             "paradoxes_found": len(paradoxes_found),
@@ -322,6 +568,7 @@ class KaiCoreEngine:
     
     async def log_request(self, request_data: Dict, response: str, safety_result: Dict, paradox_result: Dict):
         """Log request to MythGraph"""
+        start_time = time.time()
         await self.mythgraph_ledger.add_entry("request_processed", {
             "request": request_data,
             "response": response,
@@ -329,6 +576,7 @@ class KaiCoreEngine:
             "paradox_resolution": paradox_result,
             "timestamp": datetime.utcnow().isoformat()
         })
+        self.metrics["mythgraph_logging_latency"] = (time.time() - start_time) * 1000
     
     async def log_incident(self, incident_type: str, incident_data: Dict):
         """Log incident to MythGraph"""
@@ -343,12 +591,14 @@ class KaiCoreEngine:
     def update_metrics(self, processing_time: float, safety_result: Dict, paradox_result: Dict):
         """Update system metrics"""
         self.metrics["total_requests"] += 1
+        self.request_counters["success"].inc()
         
         if safety_result["risk"] in ["high", "banned"]:
             self.metrics["blocked_requests"] += 1
         
         if paradox_result["resolved"]:
             self.metrics["resolved_paradoxes"] += paradox_result["paradoxes_found"]
+            self.paradox_counter.inc(paradox_result["paradoxes_found"])
         
         # Update rates
         if self.metrics["total_requests"] > 0:
@@ -365,6 +615,12 @@ class KaiCoreEngine:
             "request_count": self.request_count,
             "incident_count": self.incident_count,
             "metrics": self.metrics,
+            "latency": {stage: histogram.snapshot() for stage, histogram in self.stage_latency.items()},
+            "request_pipeline": self.request_pipeline.get_stats() if self.request_pipeline else None,
+            "verdict_cache": {
+                "guard_rails": self.guard_rail_system.get_cache_stats() if self.guard_rail_system else None,
+                "paradox_resolver": self.paradox_resolver.get_cache_stats() if self.paradox_resolver else None
+            },
             "components": {
                 "paradox_resolver": self.paradox_resolver is not None,
                 "guard_rail_system": self.guard_rail_system is not None,
@@ -377,6 +633,18 @@ class KaiCoreEngine:
         """Graceful shutdown of the system"""
         self.logger.info("🛑 Shutting down Kai Core V8+ Engine...")
         
+        # Finish queued requests while every component is still up
+        if self.request_pipeline:
+            await self.request_pipeline.stop()
+        
+        # Final export includes the drained requests
+        if self.metrics_exporter:
+            self.metrics_exporter.stop()
+        
+        # Plugins may still log to MythGraph while shutting down
+        if self.plugin_manager:
+            await self.plugin_manager.shutdown()
+        
         # Log shutdown event
         if self.mythgraph_ledger:
             await self.mythgraph_ledger.add_entry("system_event", {
@@ -384,6 +652,11 @@ class KaiCoreEngine:
                 "timestamp": datetime.utcnow().isoformat(),
                 "uptime_seconds": (datetime.utcnow() - self.start_time).total_seconds() if self.start_time else 0
             })
+            await self.mythgraph_ledger.stop_writer()
+            self.mythgraph_ledger.close()
+        
+        if self.guard_rail_system:
+            self.guard_rail_system.close()
         
         self.status = "shutdown"
         self.logger.info("✅ Kai Core V8+ Engine shutdown complete")
@@ -405,7 +678,7 @@ async def main():
             "timestamp": datetime.utcnow().isoformat()
         }
         
-        result = await engine.process_request(test_request)
+        result = await engine.submit_request(test_request)
         print(f"Request result: {result}")
         
         # Test paradox resolution
@@ -416,7 +689,7 @@ async def main():
             "timestamp": datetime.utcnow().isoformat()
         }
         
-        paradox_result = await engine.process_request(paradox_request)
+        paradox_result = await engine.submit_request(paradox_request)
         print(f"Paradox result: {paradox_result}")
         
         # Get system status
@@ -12,16 +12,20 @@ Master-class coding agent with:
 """
 
 import hashlib
-import pickle
 import os
+import sqlite3
+import zlib
 import time
 import subprocess
 import json
 import ast
 import uuid
 from typing import Dict, List, Optional, Tuple, Any
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass, asdict, field, replace
 from datetime import datetime
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from functools import lru_cache
 import threading
 import queue
 import logging
@@ -97,6 +101,19 @@ class EnsembleResult:
     disagreements: List[str]
     user_choice_required: bool
     trace_id: str
+    early_exit: bool = False
+    timed_out_models: List[str] = field(default_factory=list)
+    # Model response the consensus code came from (None if only fallbacks answered)
+    consensus_response: Optional[CodeResponse] = None
+
+
+@lru_cache(maxsize=4096)
+def ast_fingerprint(code: str) -> Optional[str]:
+    """Formatting- and comment-insensitive AST identity of code (None if invalid)"""
+    try:
+        return hashlib.sha256(ast.dump(ast.parse(code)).encode()).hexdigest()
+    except (SyntaxError, ValueError):
+        return None
 
 
 class ProvableRouter:
@@ -240,38 +257,181 @@ class ByzantineEnsemble:
     - Fallback mechanisms for reliability
     """
 
-    def __init__(self, models: Dict[str, Any]):
+    def __init__(
+        self,
+        models: Dict[str, Any],
+        quorum: Optional[int] = None,
+        model_timeout_s: float = 30.0,
+        model_timeouts: Optional[Dict[str, float]] = None,
+        max_workers: int = 8,
+    ):
         self.models = models
         self.reward_model = self._load_reward_model()
         self.consensus_threshold = 0.8
+        self.quorum = quorum
+        self.model_timeout_s = model_timeout_s
+        self.model_timeouts = model_timeouts or {}
+        self.max_workers = max_workers
+        # One bounded pool for every call; models abandoned at a deadline or an
+        # early exit keep their worker until they return, so they are tracked
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="ensemble"
+        )
+        self._abandoned = set()
+        self._abandoned_lock = threading.Lock()
+        self.abandoned_total = 0
+
+    @property
+    def abandoned(self) -> int:
+        """Workers still held by models a previous call gave up on"""
+        with self._abandoned_lock:
+            return len(self._abandoned)
+
+    def close(self):
+        """Stop the worker pool without waiting for abandoned models"""
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def _abandon(self, future):
+        """Cancel a model's future, or count its worker as held until it returns"""
+        if future.cancel():
+            return
+        with self._abandoned_lock:
+            self._abandoned.add(future)
+            self.abandoned_total += 1
+        future.add_done_callback(self._release)
+
+    def _release(self, future):
+        with self._abandoned_lock:
+            self._abandoned.discard(future)
 
     def generate_ensemble(
         self, request: CodeRequest, selected_models: List[str]
     ) -> EnsembleResult:
-        """Generate code using ensemble of models"""
-        responses = []
+        """Generate code using ensemble of models
+
+        Models run concurrently, each under its own deadline. Once a quorum of
+        responses share the same AST the remaining models are abandoned, so
+        latency tracks the fastest agreeing quorum rather than every model.
+
+        Abandoned models still hold their worker in the shared pool. When hung
+        models hold every worker, the call answers with fallbacks at once
+        rather than queueing behind them.
+        """
+        quorum = self._quorum_size(len(selected_models))
+        responses: Dict[str, CodeResponse] = {}
+        agreement: Dict[str, int] = {}
+        agreed_fingerprint = None
+        fallbacks = set()
+        timed_out = []
+        early_exit = False
+
+        start_time = time.monotonic()
+        deadlines = {
+            model_name: start_time
+            + self.model_timeouts.get(model_name, self.model_timeout_s)
+            for model_name in selected_models
+        }
+        pending = {}
+        if self.abandoned >= self.max_workers:
+            for model_name in selected_models:
+                responses[model_name] = self._generate_fallback(
+                    request, model_name, "Ensemble workers held by abandoned models"
+                )
+                fallbacks.add(model_name)
+        try:
+            for model_name in selected_models:
+                if model_name in fallbacks:
+                    continue
+                future = self._executor.submit(
+                    self._generate_from_model, request, model_name
+                )
+                pending[future] = model_name
+            while pending and not early_exit:
+                next_deadline = min(deadlines[name] for name in pending.values())
+                done, _ = wait(
+                    pending,
+                    timeout=max(0.0, next_deadline - time.monotonic()),
+                    return_when=FIRST_COMPLETED,
+                )
 
-        for model_name in selected_models:
-            try:
-                response = self._generate_from_model(request, model_name)
-                responses.append(response)
-            except Exception as e:
-                # Fallback for failed models
-                fallback_response = self._generate_fallback(request, model_name, str(e))
-                responses.append(fallback_response)
+                for future in done:
+                    model_name = pending.pop(future)
+                    try:
+                        response = future.result()
+                    except Exception as e:
+                        # Fallback for failed models; never counts toward quorum
+                        responses[model_name] = self._generate_fallback(
+                            request, model_name, str(e)
+                        )
+                        fallbacks.add(model_name)
+                        continue
+
+                    responses[model_name] = response
+                    fingerprint = ast_fingerprint(response.code)
+                    if fingerprint is not None:
+                        agreement[fingerprint] = agreement.get(fingerprint, 0) + 1
+                        if agreement[fingerprint] >= quorum:
+                            early_exit = bool(pending)
+                            agreed_fingerprint = agreed_fingerprint or fingerprint
+
+                # Models past their own deadline are replaced by fallbacks
+                now = time.monotonic()
+                for future, model_name in list(pending.items()):
+                    if now >= deadlines[model_name]:
+                        self._abandon(future)
+                        del pending[future]
+                        timed_out.append(model_name)
+                        budget = deadlines[model_name] - start_time
+                        responses[model_name] = self._generate_fallback(
+                            request, model_name, f"Timed out after {budget:.1f}s"
+                        )
+                        fallbacks.add(model_name)
+        finally:
+            # Abandoned models finish (or not) in the background
+            for future in pending:
+                self._abandon(future)
+
+        responses_in_order = [
+            responses[model_name]
+            for model_name in selected_models
+            if model_name in responses
+        ]
+
+        # The consensus code comes from real model output; after an early exit,
+        # from the quorum that agreed rather than from the stragglers
+        candidates = [
+            responses[model_name]
+            for model_name in selected_models
+            if model_name in responses and model_name not in fallbacks
+        ]
+        if early_exit:
+            candidates = [
+                response
+                for response in candidates
+                if ast_fingerprint(response.code) == agreed_fingerprint
+            ]
 
         # Analyze consensus
-        consensus_data = self._analyze_consensus(responses)
+        consensus_data = self._analyze_consensus(responses_in_order, candidates)
 
         return EnsembleResult(
-            responses=responses,
+            responses=responses_in_order,
             consensus_code=consensus_data["consensus_code"],
             confidence=consensus_data["confidence"],
             disagreements=consensus_data["disagreements"],
             user_choice_required=consensus_data["user_choice_required"],
             trace_id=request.trace_id,
+            early_exit=early_exit,
+            timed_out_models=timed_out,
+            consensus_response=consensus_data["consensus_response"],
         )
 
+    def _quorum_size(self, model_count: int) -> int:
+        """Agreeing responses needed to stop early (default: a strict majority)"""
+        if self.quorum is not None:
+            return max(1, min(self.quorum, model_count))
+        return model_count // 2 + 1
+
     def _generate_fallback(
         self, request: CodeRequest, model_name: str, error: str
     ) -> CodeResponse:
@@ -847,11 +1007,21 @@ print(result)'''
 
         return min(1.0, confidence)
 
-    def _analyze_consensus(self, responses: List[CodeResponse]) -> Dict[str, Any]:
-        """Analyze consensus among model responses"""
+    def _analyze_consensus(
+        self,
+        responses: List[CodeResponse],
+        candidates: Optional[List[CodeResponse]] = None,
+    ) -> Dict[str, Any]:
+        """Analyze consensus among model responses
+
+        The consensus code is the best of the candidates (default: every
+        response); all responses count towards confidence and disagreements.
+        """
+        candidates = responses if candidates is None else candidates
         if len(responses) == 1:
             return {
                 "consensus_code": responses[0].code,
+                "consensus_response": candidates[0] if candidates else None,
                 "confidence": responses[0].confidence,
                 "disagreements": [],
                 "user_choice_required": False,
@@ -883,10 +1053,11 @@ print(result)'''
         user_choice_required = confidence < self.consensus_threshold or safety_issues
 
         # Select best code
-        best_response = max(responses, key=lambda r: r.reward_score)
+        best_response = max(candidates or responses, key=lambda r: r.reward_score)
 
         return {
             "consensus_code": best_response.code,
+            "consensus_response": best_response if candidates else None,
             "confidence": confidence,
             "disagreements": self._identify_disagreements(responses),
             "user_choice_required": user_choice_required,
@@ -1147,54 +1318,210 @@ class DeterministicCache:
     """
     Deterministic caching with UUID-signed keys
     - Perfect reproducibility
-    - AST-verified results
-    - Immutable audit trail
+    - Integrity-checked results
+    - Single-file SQLite store, bounded by entry count and bytes (LRU)
+    - In-memory hot tier for repeated requests
     """
 
-    def __init__(self, cache_dir: str = "./cache"):
+    SCHEMA = """
+    CREATE TABLE IF NOT EXISTS responses (
+        key BLOB PRIMARY KEY,
+        payload BLOB NOT NULL,
+        size INTEGER NOT NULL,
+        last_access INTEGER NOT NULL
+    ) WITHOUT ROWID;
+    CREATE INDEX IF NOT EXISTS responses_last_access ON responses (last_access);
+    """
+
+    def __init__(
+        self,
+        cache_dir: str = "./cache",
+        max_entries: int = 1_000_000,
+        max_bytes: int = 1 << 30,
+        hot_entries: int = 1024,
+    ):
         self.cache_dir = Path(cache_dir)
         self.cache_dir.mkdir(exist_ok=True)
-        self.stats = {"hits": 0, "misses": 0}
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.hot_entries = hot_entries
+        self.stats = {"hits": 0, "misses": 0, "hot_hits": 0, "evictions": 0}
+
+        self.hot: "OrderedDict[bytes, CodeResponse]" = OrderedDict()
+        self._touched: Dict[bytes, int] = {}
+        self._lock = threading.Lock()
+
+        self.db_path = self.cache_dir / "responses.sqlite3"
+        self.conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(self.SCHEMA)
+        self.entry_count, self.total_bytes = self.conn.execute(
+            "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses"
+        ).fetchone()
 
     def get_cached_response(self, request: CodeRequest) -> Optional[CodeResponse]:
         """Get cached response if available"""
-        cache_key = self._generate_cache_key(request)
-        cache_file = self.cache_dir / f"{cache_key}.pkl"
+        key = bytes.fromhex(self._generate_cache_key(request))
+
+        with self._lock:
+            response = self.hot.get(key)
+            if response is not None:
+                self.hot.move_to_end(key)
+                self._touch(key)
+                self.stats["hits"] += 1
+                self.stats["hot_hits"] += 1
+                return self._copy_response(response)
 
-        if cache_file.exists():
             try:
-                with open(cache_file, "rb") as f:
-                    cached_data = pickle.load(f)
-                    self.stats["hits"] += 1
+                row = self.conn.execute(
+                    "SELECT payload FROM responses WHERE key = ?", (key,)
+                ).fetchone()
+                if row is not None:
+                    cached_data = json.loads(zlib.decompress(row[0]))
+                    response = self._decode_response(cached_data["response"])
 
                     # Verify cache integrity
-                    if self._verify_cache_integrity(cached_data, request):
-                        return cached_data["response"]
+                    if self._verify_cache_integrity(
+                        cached_data["integrity_hash"], request, response
+                    ):
+                        self._touch(key)
+                        self._remember(key, response)
+                        self.stats["hits"] += 1
+                        return self._copy_response(response)
             except Exception as e:
                 logging.warning(f"Cache read failed: {e}")
 
-        self.stats["misses"] += 1
-        return None
+            self.stats["misses"] += 1
+            return None
 
     def cache_response(self, request: CodeRequest, response: CodeResponse):
         """Cache response with integrity checks"""
-        cache_key = self._generate_cache_key(request)
-        cache_file = self.cache_dir / f"{cache_key}.pkl"
+        key = bytes.fromhex(self._generate_cache_key(request))
 
         try:
             cache_data = {
-                "request": asdict(request),
-                "response": asdict(response),
-                "cache_key": cache_key,
-                "timestamp": datetime.now().isoformat(),
+                "response": self._encode_response(response),
                 "integrity_hash": self._calculate_integrity_hash(request, response),
             }
+            payload = zlib.compress(
+                json.dumps(cache_data, separators=(",", ":")).encode("utf-8")
+            )
 
-            with open(cache_file, "wb") as f:
-                pickle.dump(cache_data, f)
+            with self._lock:
+                previous = self.conn.execute(
+                    "SELECT size FROM responses WHERE key = ?", (key,)
+                ).fetchone()
+                self.conn.execute(
+                    "INSERT OR REPLACE INTO responses "
+                    "(key, payload, size, last_access) VALUES (?, ?, ?, ?)",
+                    (key, payload, len(payload), time.time_ns()),
+                )
+                self._touched.pop(key, None)
+                if previous is None:
+                    self.entry_count += 1
+                else:
+                    self.total_bytes -= previous[0]
+                self.total_bytes += len(payload)
+                self._flush_touches()
+                self._evict()
+                self.conn.commit()
+                self._remember(key, self._decode_response(cache_data["response"]))
         except Exception as e:
             logging.error(f"Cache write failed: {e}")
 
+    def get_stats(self) -> Dict[str, Any]:
+        """Hit counters and store occupancy"""
+        with self._lock:
+            return {
+                **self.stats,
+                "entries": self.entry_count,
+                "bytes": self.total_bytes,
+                "hot_entries": len(self.hot),
+            }
+
+    def close(self):
+        with self._lock:
+            self._flush_touches()
+            self.conn.commit()
+            self.conn.close()
+
+    def _touch(self, key: bytes):
+        """Note a read; access times reach disk in batches instead of per lookup"""
+        self._touched[key] = time.time_ns()
+        if len(self._touched) >= 256:
+            self._flush_touches()
+            self.conn.commit()
+
+    def _flush_touches(self):
+        if self._touched:
+            self.conn.executemany(
+                "UPDATE responses SET last_access = ? WHERE key = ?",
+                [(accessed, key) for key, accessed in self._touched.items()],
+            )
+            self._touched.clear()
+
+    def _remember(self, key: bytes, response: CodeResponse):
+        """
+        Keep a verified response in the hot tier, dropping the least recently used
+
+        Callers only ever receive copies, so hot entries cannot be changed after
+        their integrity check.
+        """
+        if self.hot_entries <= 0:
+            return
+        self.hot[key] = response
+        self.hot.move_to_end(key)
+        while len(self.hot) > self.hot_entries:
+            self.hot.popitem(last=False)
+
+    def _evict(self):
+        """Drop least recently used entries until both bounds hold again (with slack)"""
+        if self.entry_count <= self.max_entries and self.total_bytes <= self.max_bytes:
+            return
+
+        # Evict down to 90% so eviction runs in batches rather than on every write
+        target_entries = int(self.max_entries * 0.9)
+        target_bytes = int(self.max_bytes * 0.9)
+        while self.entry_count > target_entries or self.total_bytes > target_bytes:
+            batch = max(1, min(self.entry_count - target_entries, 1000))
+            victims = self.conn.execute(
+                "SELECT key, size FROM responses ORDER BY last_access LIMIT ?",
+                (batch,),
+            ).fetchall()
+            if not victims:
+                break
+            self.conn.executemany(
+                "DELETE FROM responses WHERE key = ?", [(key,) for key, _ in victims]
+            )
+            for key, size in victims:
+                self.hot.pop(key, None)
+                self.entry_count -= 1
+                self.total_bytes -= size
+            self.stats["evictions"] += len(victims)
+
+    @staticmethod
+    def _encode_response(response: CodeResponse) -> Dict[str, Any]:
+        data = asdict(response)
+        data["timestamp"] = response.timestamp.isoformat()
+        return data
+
+    @staticmethod
+    def _copy_response(response: CodeResponse) -> CodeResponse:
+        """Copy of a hot-tier response that shares no mutable state with it"""
+        return replace(
+            response,
+            guardrail_passes=list(response.guardrail_passes),
+            guardrail_failures=list(response.guardrail_failures),
+        )
+
+    @staticmethod
+    def _decode_response(data: Dict[str, Any]) -> CodeResponse:
+        data = dict(data)
+        data["timestamp"] = datetime.fromisoformat(data["timestamp"])
+        data["cache_hit"] = True
+        return CodeResponse(**data)
+
     def _generate_cache_key(self, request: CodeRequest) -> str:
         """Generate deterministic cache key"""
         key_data = f"{request.prompt}_{request.language}_{request.max_tokens}_{request.temperature}_{request.seed}"
@@ -1207,15 +1534,11 @@ class DeterministicCache:
         data = f"{request.prompt}_{response.code}_{response.model_used}_{response.trace_id}"
         return hashlib.sha256(data.encode()).hexdigest()
 
-    def _verify_cache_integrity(self, cached_data: Dict, request: CodeRequest) -> bool:
-        """Verify cache integrity"""
-        try:
-            expected_hash = self._calculate_integrity_hash(
-                request, cached_data["response"]
-            )
-            return cached_data["integrity_hash"] == expected_hash
-        except:
-            return False
+    def _verify_cache_integrity(
+        self, integrity_hash: str, request: CodeRequest, response: CodeResponse
+    ) -> bool:
+        """Verify cache integrity (on disk reads; hot entries are private copies)"""
+        return integrity_hash == self._calculate_integrity_hash(request, response)
 
 
 class TelemetrySystem:
@@ -1331,9 +1654,21 @@ class KaiOrchestratorV2:
     def __init__(self, config: Dict[str, Any] = None):
         self.config = config or self._default_config()
         self.router = ProvableRouter(self.config["models"])
-        self.ensemble = ByzantineEnsemble(self.config["models"])
+        ensemble_config = self.config.get("ensemble", {})
+        self.ensemble = ByzantineEnsemble(
+            self.config["models"],
+            quorum=ensemble_config.get("quorum"),
+            model_timeout_s=ensemble_config.get("model_timeout_s", 30.0),
+            model_timeouts=ensemble_config.get("model_timeouts"),
+            max_workers=ensemble_config.get("max_workers", 8),
+        )
         self.guardrails = DefenseInDepth()
-        self.cache = DeterministicCache(self.config["cache_dir"])
+        self.cache = DeterministicCache(
+            self.config["cache_dir"],
+            max_entries=self.config.get("cache_max_entries", 1_000_000),
+            max_bytes=self.config.get("cache_max_bytes", 1 << 30),
+            hot_entries=self.config.get("cache_hot_entries", 1024),
+        )
         self.telemetry = TelemetrySystem(self.config["telemetry_dir"])
 
         # Initialize models
@@ -1359,6 +1694,7 @@ class KaiOrchestratorV2:
                     disagreements=[],
                     user_choice_required=False,
                     trace_id=request.trace_id,
+                    consensus_response=cached_response,
                 )
 
             # Route request
@@ -1367,9 +1703,9 @@ class KaiOrchestratorV2:
             # Generate ensemble
             ensemble_result = self.ensemble.generate_ensemble(request, selected_models)
 
-            # Cache result
-            if ensemble_result.responses:
-                self.cache.cache_response(request, ensemble_result.responses[0])
+            # Cache the consensus, never a fallback standing in for a failed model
+            if ensemble_result.consensus_response is not None:
+                self.cache.cache_response(request, ensemble_result.consensus_response)
 
             # Log results
             for response in ensemble_result.responses:
@@ -1396,7 +1732,16 @@ class KaiOrchestratorV2:
                 "codellama-34b": None,
                 "wizardcoder-33b": None,
             },
+            "ensemble": {
+                "quorum": None,  # Strict majority of the selected models
+                "model_timeout_s": 30.0,
+                "model_timeouts": {},
+                "max_workers": 8,
+            },
             "cache_dir": "./cache",
+            "cache_max_entries": 1_000_000,
+            "cache_max_bytes": 1 << 30,  # 1 GiB
+            "cache_hot_entries": 1024,
             "telemetry_dir": "./telemetry",
             "consensus_threshold": 0.8,
             "uncertainty_threshold": 0.3,
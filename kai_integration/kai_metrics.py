@@ -0,0 +1,309 @@
+#!/usr/bin/env python3
+"""
+Kai Core V8+ Metrics
+Latency histograms, counters and a Prometheus text exporter shared by the
+engine and its components
+"""
+
+import os
+import threading
+from collections import OrderedDict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Any, Optional, Callable, Tuple
+
+class LatencyHistogram:
+    """
+    HDR-style latency histogram
+
+    Latencies are recorded in integer microseconds. Values below
+    2**sub_bucket_bits get exact buckets; above that every power-of-two
+    range is split into 2**(sub_bucket_bits - 1) linear sub-buckets, so any
+    percentile is accurate to about 1/2**(sub_bucket_bits - 1) (~3% with the
+    default) in constant memory whatever the number of samples.
+    """
+
+    PERCENTILES = (50.0, 90.0, 95.0, 99.0, 99.9)
+
+    def __init__(self, sub_bucket_bits: int = 6):
+        self.sub_bucket_bits = sub_bucket_bits
+        self._exact_limit = 1 << sub_bucket_bits
+        self._half = 1 << (sub_bucket_bits - 1)
+        self.counts: Dict[int, int] = {}
+        self.count = 0
+        self.total_us = 0
+        self.min_us: Optional[int] = None
+        self.max_us = 0
+
+    def _index(self, value_us: int) -> int:
+        if value_us < self._exact_limit:
+            return value_us
+        shift = value_us.bit_length() - self.sub_bucket_bits
+        return self._exact_limit + (shift - 1) * self._half + ((value_us >> shift) - self._half)
+
+    def _upper_bound(self, index: int) -> int:
+        """Largest value that falls into a bucket"""
+        if index < self._exact_limit:
+            return index
+        shift, offset = divmod(index - self._exact_limit, self._half)
+        shift += 1
+        return (((offset + self._half) + 1) << shift) - 1
+
+    def record(self, latency_ms: float):
+        """Record one latency in milliseconds"""
+        value_us = max(0, int(latency_ms * 1000))
+        index = self._index(value_us)
+        self.counts[index] = self.counts.get(index, 0) + 1
+        self.count += 1
+        self.total_us += value_us
+        if self.min_us is None or value_us < self.min_us:
+            self.min_us = value_us
+        if value_us > self.max_us:
+            self.max_us = value_us
+
+    def merge(self, other: "LatencyHistogram"):
+        """Add another histogram's samples (same sub_bucket_bits) into this one"""
+        if other.sub_bucket_bits != self.sub_bucket_bits:
+            raise ValueError("Cannot merge histograms with different precision")
+        for index, count in other.counts.items():
+            self.counts[index] = self.counts.get(index, 0) + count
+        self.count += other.count
+        self.total_us += other.total_us
+        if other.min_us is not None and (self.min_us is None or other.min_us < self.min_us):
+            self.min_us = other.min_us
+        self.max_us = max(self.max_us, other.max_us)
+
+    def percentile(self, percentile: float) -> float:
+        """Latency in milliseconds at or below which `percentile`% of samples fall"""
+        if not self.count:
+            return 0.0
+        threshold = max(1, int(round(self.count * percentile / 100.0)))
+        seen = 0
+        for index in sorted(self.counts):
+            seen += self.counts[index]
+            if seen >= threshold:
+                return min(self._upper_bound(index), self.max_us) / 1000.0
+        return self.max_us / 1000.0
+
+    def copy(self) -> "LatencyHistogram":
+        """Point-in-time copy, safe to read while other threads keep recording"""
+        copied = LatencyHistogram(self.sub_bucket_bits)
+        copied.counts = dict(self.counts)
+        copied.count = sum(copied.counts.values())
+        copied.total_us = self.total_us
+        copied.min_us = self.min_us
+        copied.max_us = self.max_us
+        return copied
+
+    def reset(self):
+        self.counts.clear()
+        self.count = 0
+        self.total_us = 0
+        self.min_us = None
+        self.max_us = 0
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Count, mean, extremes and standard percentiles in milliseconds"""
+        snapshot = {
+            "count": self.count,
+            "mean_ms": self.total_us / self.count / 1000.0 if self.count else 0.0,
+            "min_ms": (self.min_us or 0) / 1000.0,
+            "max_ms": self.max_us / 1000.0
+        }
+        for percentile in self.PERCENTILES:
+            snapshot[f"p{percentile:g}_ms"] = self.percentile(percentile)
+        return snapshot
+
+class Counter:
+    """
+    Monotonic counter without a lock
+
+    Each thread adds into its own cell (a single dict store under the GIL),
+    and reads sum the cells, so hot paths never contend with each other.
+    """
+
+    def __init__(self):
+        self._cells: Dict[int, float] = {}
+
+    def inc(self, amount: float = 1):
+        ident = threading.get_ident()
+        self._cells[ident] = self._cells.get(ident, 0) + amount
+
+    @property
+    def value(self) -> float:
+        return sum(list(self._cells.values()))
+
+class Gauge:
+    """Current value, either set directly or read from a callback at export time"""
+
+    def __init__(self, fn: Optional[Callable[[], float]] = None):
+        self.fn = fn
+        self._value = 0.0
+
+    def set(self, value: float):
+        self._value = value
+
+    @property
+    def value(self) -> float:
+        if self.fn is not None:
+            try:
+                return float(self.fn())
+            except Exception:
+                return float("nan")
+        return self._value
+
+def _escape_label(value: Any) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+def _format_labels(labels: Tuple[Tuple[str, str], ...], extra: Tuple[Tuple[str, str], ...] = ()) -> str:
+    pairs = labels + extra
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{key}="{_escape_label(value)}"' for key, value in pairs) + "}"
+
+def _format_value(value: float) -> str:
+    if value != value:
+        return "NaN"
+    if value in (float("inf"), float("-inf")):
+        return "+Inf" if value > 0 else "-Inf"
+    return str(int(value)) if float(value).is_integer() else f"{value:.9g}"
+
+class MetricsRegistry:
+    """
+    Named metric families with labelled series
+
+    Histograms are exported as Prometheus summaries in seconds (quantiles,
+    _sum and _count), counters as *_total and gauges as plain samples.
+    """
+
+    QUANTILES = (0.5, 0.9, 0.95, 0.99, 0.999)
+
+    def __init__(self):
+        self._families: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _series(self, kind: str, name: str, help_text: str, labels: Dict[str, Any], factory):
+        key = tuple(sorted((label, str(value)) for label, value in labels.items()))
+        family = self._families.get(name)
+        if family is not None:
+            series = family["series"].get(key)
+            if series is not None:
+                return series
+        with self._lock:
+            family = self._families.setdefault(name, {"type": kind, "help": help_text, "series": {}})
+            if family["type"] != kind:
+                raise ValueError(f"Metric {name} is already registered as a {family['type']}")
+            return family["series"].setdefault(key, factory())
+
+    def counter(self, name: str, help_text: str = "", **labels) -> Counter:
+        return self._series("counter", name, help_text, labels, Counter)
+
+    def gauge(self, name: str, help_text: str = "", fn: Optional[Callable[[], float]] = None, **labels) -> Gauge:
+        return self._series("gauge", name, help_text, labels, lambda: Gauge(fn))
+
+    def histogram(self, name: str, help_text: str = "", **labels) -> LatencyHistogram:
+        return self._series("summary", name, help_text, labels, LatencyHistogram)
+
+    def render_prometheus(self) -> str:
+        """All families in the Prometheus text exposition format (version 0.0.4)"""
+        lines = []
+        with self._lock:
+            families = [(name, family["type"], family["help"], list(family["series"].items()))
+                        for name, family in self._families.items()]
+        for name, kind, help_text, series in families:
+            if help_text:
+                lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {kind}")
+            for labels, metric in series:
+                if kind == "summary":
+                    snapshot = metric.copy()
+                    for quantile in self.QUANTILES:
+                        value = snapshot.percentile(quantile * 100) / 1000.0
+                        lines.append(f"{name}{_format_labels(labels, (('quantile', f'{quantile:g}'),))} "
+                                     f"{_format_value(value)}")
+                    lines.append(f"{name}_sum{_format_labels(labels)} {_format_value(snapshot.total_us / 1e6)}")
+                    lines.append(f"{name}_count{_format_labels(labels)} {snapshot.count}")
+                else:
+                    lines.append(f"{name}{_format_labels(labels)} {_format_value(metric.value)}")
+        return "\n".join(lines) + "\n"
+
+class PrometheusExporter:
+    """
+    Publish a registry as Prometheus text
+
+    With textfile set, the file is rewritten atomically every interval_s (for
+    node_exporter's textfile collector); with port set, /metrics is served
+    over HTTP. Both run on daemon threads.
+    """
+
+    def __init__(self, registry: MetricsRegistry, textfile: Optional[str] = None,
+                 port: Optional[int] = None, host: str = "127.0.0.1", interval_s: float = 15.0):
+        self.registry = registry
+        self.textfile = textfile
+        self.port = port
+        self.host = host
+        self.interval_s = interval_s
+        self.server: Optional[ThreadingHTTPServer] = None
+        self._stop = threading.Event()
+        self._threads = []
+
+    def write_textfile(self):
+        if not self.textfile:
+            return
+        temp_file = f"{self.textfile}.tmp"
+        with open(temp_file, "w", encoding="utf-8") as f:
+            f.write(self.registry.render_prometheus())
+        os.replace(temp_file, self.textfile)
+
+    def _textfile_loop(self):
+        while not self._stop.wait(self.interval_s):
+            try:
+                self.write_textfile()
+            except OSError as e:
+                print(f"Metrics textfile export failed: {e}")
+
+    def start(self):
+        self._stop.clear()
+        if self.textfile:
+            self.write_textfile()
+            thread = threading.Thread(target=self._textfile_loop, name="metrics-textfile", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+        if self.port is not None:
+            registry = self.registry
+
+            class MetricsHandler(BaseHTTPRequestHandler):
+                def do_GET(self):
+                    if self.path.split("?")[0] != "/metrics":
+                        self.send_error(404)
+                        return
+                    body = registry.render_prometheus().encode("utf-8")
+                    self.send_response(200)
+                    self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+                    self.send_header("Content-Length", str(len(body)))
+                    self.end_headers()
+                    self.wfile.write(body)
+
+                def log_message(self, format, *args):
+                    pass
+
+            self.server = ThreadingHTTPServer((self.host, self.port), MetricsHandler)
+            self.port = self.server.server_address[1]
+            thread = threading.Thread(target=self.server.serve_forever, name="metrics-http", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def stop(self):
+        """Stop exporting; the textfile is written one final time"""
+        self._stop.set()
+        if self.server is not None:
+            self.server.shutdown()
+            self.server.server_close()
+            self.server = None
+        for thread in self._threads:
+            thread.join(timeout=5)
+        self._threads = []
+        if self.textfile:
+            try:
+                self.write_textfile()
+            except OSError as e:
+                print(f"Metrics textfile export failed: {e}")
@@ -11,6 +11,7 @@ import os
 import sys
 import json
 import time
+import hashlib
 import requests
 import subprocess
 from datetime import datetime, timedelta
@@ -19,7 +20,9 @@ from typing import Dict, List, Any, Optional
 import logging
 import threading
 import queue
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
 import smtplib
+from sentinel_history import CheckHistoryStore
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 
@@ -45,6 +48,29 @@ class KaiSentinelMesh:
         self.check_interval = self.config.get("check_interval", 3600)  # 1 hour
         self.alert_queue = queue.Queue()
         self.running = False
+        self._stop_event = threading.Event()
+        
+        # Repositories are checked concurrently, each on its own schedule
+        self.max_workers = self.config.get("max_workers", 8)
+        self.next_check_due: Dict[str, float] = {}
+        
+        # Incremental checks: skip health checks and fire drills while a repo's
+        # git HEAD and critical files match its last passing check
+        self.incremental_checks = self.config.get("incremental_checks", True)
+        self.max_skip_age = self.config.get("max_skip_age", 86400)
+        self.state_file = Path(self.config.get("state_file", "sentinel_mesh_state.json"))
+        self._state_lock = threading.Lock()
+        self.last_passing: Dict[str, Dict[str, Any]] = self.load_state()
+        
+        # Compact check history with rollups for dashboards
+        retention = self.config.get("history_retention", {})
+        self.history = CheckHistoryStore(
+            self.config.get("history_db", "sentinel_history.db"),
+            max_output_chars=self.config.get("max_output_chars", 4096),
+            raw_retention_days=retention.get("raw_days", 7),
+            hourly_retention_days=retention.get("hourly_days", 90),
+            daily_retention_days=retention.get("daily_days", 730)
+        )
         
     def load_config(self) -> Dict[str, Any]:
         """Load or create Sentinel mesh configuration."""
@@ -68,7 +94,18 @@ class KaiSentinelMesh:
             "slack_webhook": "",
             "discord_webhook": "",
             "auto_fix": False,
-            "evidence_retention_days": 30
+            "evidence_retention_days": 30,
+            "max_workers": 8,
+            "incremental_checks": True,
+            "max_skip_age": 86400,
+            "state_file": "sentinel_mesh_state.json",
+            "history_db": "sentinel_history.db",
+            "max_output_chars": 4096,
+            "history_retention": {
+                "raw_days": 7,
+                "hourly_days": 90,
+                "daily_days": 730
+            }
         }
         
         if self.config_file.exists():
@@ -84,8 +121,72 @@ class KaiSentinelMesh:
                 json.dump(default_config, f, indent=2)
             return default_config
             
-    def check_repository_health(self, repo_config: Dict[str, Any]) -> Dict[str, Any]:
-        """Check health of a single repository."""
+    def load_state(self) -> Dict[str, Dict[str, Any]]:
+        """Load the fingerprints of each repository's last passing check."""
+        if not self.state_file.exists():
+            return {}
+        try:
+            with open(self.state_file, 'r') as f:
+                return json.load(f).get("last_passing", {})
+        except Exception as e:
+            logging.error(f"Failed to load sentinel state: {e}")
+            return {}
+            
+    def save_state(self):
+        """Persist last-passing fingerprints so restarts stay incremental."""
+        try:
+            with self._state_lock:
+                state = {"last_passing": dict(self.last_passing)}
+                temp_file = self.state_file.with_name(self.state_file.name + ".tmp")
+                with open(temp_file, 'w') as f:
+                    json.dump(state, f, indent=2)
+                os.replace(temp_file, self.state_file)
+        except Exception as e:
+            logging.error(f"Failed to save sentinel state: {e}")
+            
+    def get_git_head(self, repo_path: Path) -> Optional[str]:
+        """Commit hash of the repository's HEAD, or None outside git."""
+        try:
+            head_result = subprocess.run(
+                ["git", "rev-parse", "HEAD"],
+                cwd=repo_path,
+                capture_output=True,
+                text=True,
+                timeout=30
+            )
+            if head_result.returncode == 0:
+                return head_result.stdout.strip()
+        except Exception:
+            pass
+        return None
+        
+    def repository_fingerprint(self, repo_config: Dict[str, Any]) -> Optional[str]:
+        """Fingerprint of git HEAD, critical file contents and check commands.
+        
+        None when the repository has no git HEAD, so it is always fully checked.
+        """
+        repo_path = Path(repo_config["path"])
+        head = self.get_git_head(repo_path)
+        if head is None:
+            return None
+            
+        digest = hashlib.sha256()
+        digest.update(json.dumps([head, repo_config.get("health_check"), repo_config.get("fire_drill")]).encode())
+        for file_name in sorted(repo_config.get("critical_files", [])):
+            digest.update(file_name.encode())
+            try:
+                digest.update(hashlib.sha256((repo_path / file_name).read_bytes()).digest())
+            except OSError:
+                digest.update(b"missing")
+        return digest.hexdigest()
+        
+    def check_repository_health(self, repo_config: Dict[str, Any], force: bool = False) -> Dict[str, Any]:
+        """Check health of a single repository.
+        
+        Unless force is set, the health check and fire drill are skipped (and
+        their last passing results reused) when the repository fingerprint
+        matches its last passing check from within max_skip_age seconds.
+        """
         repo_name = repo_config["name"]
         repo_path = Path(repo_config["path"])
         
@@ -114,8 +215,21 @@ class KaiSentinelMesh:
                 if not file_path.exists():
                     result["alerts"].append(f"Critical file missing: {file_name}")
                     
+            fingerprint = self.repository_fingerprint(repo_config) if self.incremental_checks else None
+            result["fingerprint"] = fingerprint
+            previous = self.last_passing.get(repo_name)
+            unchanged = (
+                not force and fingerprint is not None and previous is not None
+                and previous["fingerprint"] == fingerprint
+                and time.time() - previous["checked_at"] < self.max_skip_age
+            )
+            
+            if unchanged:
+                result["health_check"] = {**previous["health_check"], "skipped": True}
+                result["fire_drill"] = {**previous["fire_drill"], "skipped": True}
+                
             # Run health check
-            if repo_config.get("health_check"):
+            if repo_config.get("health_check") and not unchanged:
                 try:
                     health_result = subprocess.run(
                         repo_config["health_check"].split(),
@@ -137,7 +251,7 @@ class KaiSentinelMesh:
                     result["alerts"].append(f"Health check error: {e}")
                     
             # Run fire drill
-            if repo_config.get("fire_drill"):
+            if repo_config.get("fire_drill") and not unchanged:
                 try:
                     drill_result = subprocess.run(
                         repo_config["fire_drill"].split(),
@@ -181,12 +295,36 @@ class KaiSentinelMesh:
             else:
                 result["status"] = "WARNING"
                 
+            self.record_check_outcome(repo_name, result, fingerprint, skipped=unchanged)
+                
         except Exception as e:
             result["status"] = "ERROR"
             result["alerts"].append(f"Repository check error: {e}")
             
         return result
         
+    def record_check_outcome(self, repo_name: str, result: Dict[str, Any],
+                             fingerprint: Optional[str], skipped: bool):
+        """Remember a passing fully-run check's fingerprint; forget it on failure."""
+        if skipped:
+            return
+        if result["status"] == "HEALTHY" and fingerprint is not None:
+            outcome = {
+                "fingerprint": fingerprint,
+                "checked_at": time.time(),
+                "health_check": {key: result["health_check"][key] for key in ("success", "return_code")
+                                 if key in result["health_check"]},
+                "fire_drill": {key: result["fire_drill"][key] for key in ("success", "return_code")
+                               if key in result["fire_drill"]}
+            }
+            with self._state_lock:
+                self.last_passing[repo_name] = outcome
+        else:
+            with self._state_lock:
+                if self.last_passing.pop(repo_name, None) is None:
+                    return
+        self.save_state()
+            
     def send_alert(self, alert_data: Dict[str, Any]):
         """Send alert through configured channels."""
         alert_message = f"""
@@ -299,7 +437,8 @@ Generated by Kai Sentinel Mesh v1.0
                 "alerts": alert_data['alerts'],
                 "health_check": alert_data['health_check'],
                 "fire_drill": alert_data['fire_drill'],
-                "evidence_bundles": len(alert_data['evidence_bundles'])
+                "evidence_bundles": len(alert_data['evidence_bundles']),
+                "trend_24h": self.history.summary(alert_data['repo_name'])
             }
             
             response = requests.post(
@@ -344,53 +483,80 @@ Generated by Kai Sentinel Mesh v1.0
             logging.error(f"Auto-fix error for {repo_config['name']}: {e}")
             return False
             
+    def repo_interval(self, repo_config: Dict[str, Any]) -> float:
+        """Seconds between checks of one repository."""
+        return repo_config.get("check_interval", self.check_interval)
+        
+    def handle_check_result(self, repo_config: Dict[str, Any], health_result: Dict[str, Any]):
+        """Log, alert on, auto-fix and save one finished repository check."""
+        logging.info(f"Repository {repo_config['name']}: {health_result['status']}")
+        
+        # Send alerts if needed
+        if health_result['status'] in ['CRITICAL', 'WARNING', 'ERROR']:
+            self.send_alert(health_result)
+            
+            # Attempt auto-fix if enabled
+            if self.config.get("auto_fix", False):
+                self.auto_fix_repository(repo_config, health_result)
+                
+        # Save result to history
+        self.save_check_result(health_result)
+        
     def monitor_repositories(self):
-        """Monitor all repositories in the mesh."""
+        """Monitor all repositories in the mesh.
+        
+        Due repositories are checked concurrently on a bounded worker pool and
+        each result is handled as soon as its own check finishes, so one slow
+        repository never delays alerting for the others.
+        """
         logging.info("🏛️ Kai Sentinel Mesh started - monitoring repositories")
         
-        while self.running:
-            try:
-                for repo_config in self.repos:
-                    logging.info(f"Checking repository: {repo_config['name']}")
-                    
-                    # Check repository health
-                    health_result = self.check_repository_health(repo_config)
+        in_flight = {}
+        with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="sentinel") as executor:
+            while self.running:
+                try:
+                    now = time.time()
+                    busy = {repo_config["name"] for repo_config in in_flight.values()}
+                    for repo_config in self.repos:
+                        name = repo_config["name"]
+                        if name in busy or self.next_check_due.get(name, 0) > now:
+                            continue
+                        logging.info(f"Checking repository: {name}")
+                        self.next_check_due[name] = now + self.repo_interval(repo_config)
+                        in_flight[executor.submit(self.check_repository_health, repo_config)] = repo_config
                     
-                    # Log result
-                    logging.info(f"Repository {repo_config['name']}: {health_result['status']}")
+                    # Sleep until the next repo is due or a running check finishes
+                    next_due = min((self.next_check_due.get(r["name"], now) for r in self.repos
+                                    if r["name"] not in busy), default=now + self.check_interval)
+                    timeout = min(max(next_due - time.time(), 0.1), 1.0)
+                    if in_flight:
+                        done, _ = wait(in_flight, timeout=timeout, return_when=FIRST_COMPLETED)
+                    else:
+                        done = set()
+                        self._stop_event.wait(timeout)
                     
-                    # Send alerts if needed
-                    if health_result['status'] in ['CRITICAL', 'WARNING', 'ERROR']:
-                        self.send_alert(health_result)
+                    for future in done:
+                        repo_config = in_flight.pop(future)
+                        self.handle_check_result(repo_config, future.result())
                         
-                        # Attempt auto-fix if enabled
-                        if self.config.get("auto_fix", False):
-                            self.auto_fix_repository(repo_config, health_result)
-                            
-                    # Save result to history
-                    self.save_check_result(health_result)
-                    
-                # Wait for next check
-                time.sleep(self.check_interval)
-                
-            except Exception as e:
-                logging.error(f"Monitor loop error: {e}")
-                time.sleep(60)  # Wait a minute before retrying
+                except Exception as e:
+                    logging.error(f"Monitor loop error: {e}")
+                    self._stop_event.wait(60)  # Wait a minute before retrying
+            
+            for future in in_flight:
+                future.cancel()
                 
     def save_check_result(self, result: Dict[str, Any]):
         """Save check result to history."""
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        history_file = Path(f"sentinel_history_{result['repo_name'].replace(' ', '_')}_{timestamp}.json")
-        
         try:
-            with open(history_file, 'w') as f:
-                json.dump(result, f, indent=2, default=str)
+            self.history.record(result)
         except Exception as e:
             logging.error(f"Failed to save check result: {e}")
             
     def start_monitoring(self):
         """Start the Sentinel mesh monitoring."""
         self.running = True
+        self._stop_event.clear()
         self.monitor_thread = threading.Thread(target=self.monitor_repositories)
         self.monitor_thread.daemon = True
         self.monitor_thread.start()
@@ -400,25 +566,34 @@ Generated by Kai Sentinel Mesh v1.0
     def stop_monitoring(self):
         """Stop the Sentinel mesh monitoring."""
         self.running = False
+        self._stop_event.set()
         if hasattr(self, 'monitor_thread'):
             self.monitor_thread.join()
             
         logging.info("🏛️ Kai Sentinel Mesh monitoring stopped")
         
-    def run_single_check(self):
-        """Run a single check of all repositories."""
+    def run_single_check(self, force: bool = False):
+        """Run a single check of all repositories concurrently (results in config order)."""
         logging.info("🏛️ Running single check of all repositories")
         
-        results = []
-        for repo_config in self.repos:
-            result = self.check_repository_health(repo_config)
-            results.append(result)
-            
-            # Send alerts if needed
-            if result['status'] in ['CRITICAL', 'WARNING', 'ERROR']:
-                self.send_alert(result)
-                
-        return results
+        results = {}
+        with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="sentinel") as executor:
+            futures = {
+                executor.submit(self.check_repository_health, repo_config, force): index
+                for index, repo_config in enumerate(self.repos)
+            }
+            pending = set(futures)
+            while pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    result = future.result()
+                    results[futures[future]] = result
+                    
+                    # Send alerts as soon as each repository finishes
+                    if result['status'] in ['CRITICAL', 'WARNING', 'ERROR']:
+                        self.send_alert(result)
+                        
+        return [results[index] for index in range(len(self.repos))]
 
 def main():
     """Main execution function."""
@@ -428,6 +603,8 @@ def main():
     parser.add_argument("--start", action="store_true", help="Start continuous monitoring")
     parser.add_argument("--check", action="store_true", help="Run single check")
     parser.add_argument("--config", default="sentinel_mesh_config.json", help="Configuration file")
+    parser.add_argument("--history", metavar="REPO", help="Show the last 24 hours of check history for a repository")
+    parser.add_argument("--force", action="store_true", help="Run every health check and fire drill, even for unchanged repositories")
     
     args = parser.parse_args()
     
@@ -446,7 +623,7 @@ def main():
             
     elif args.check:
         print("🏛️ Running single check...")
-        results = sentinel.run_single_check()
+        results = sentinel.run_single_check(force=args.force)
         
         for result in results:
             status_emoji = "✅" if result['status'] == 'HEALTHY' else "❌"
@@ -456,10 +633,19 @@ def main():
                 for alert in result['alerts']:
                     print(f"  ⚠️  {alert}")
                     
+    elif args.history:
+        summary = sentinel.history.summary(args.history)
+        print(f"🏛️ {args.history}: {summary['checks']} checks in the last 24h, "
+              f"{summary['health_ratio']:.1%} healthy, {summary['alerts']} alerts")
+        for row in sentinel.history.trend(args.history, "hour"):
+            hour = datetime.fromtimestamp(row['bucket']).strftime("%Y-%m-%d %H:00")
+            print(f"  {hour}  {row['healthy']}/{row['checks']} healthy  {row['alerts']} alerts")
+            
     else:
         print("Usage:")
         print("  python kai_sentinel_mesh.py --start")
         print("  python kai_sentinel_mesh.py --check")
+        print("  python kai_sentinel_mesh.py --history REPO")
         print("  python kai_sentinel_mesh.py --config custom_config.json")
 
 if __name__ == "__main__":
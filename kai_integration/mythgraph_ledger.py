@@ -5,13 +5,44 @@ Transparency and audit trail system
 """
 
 import asyncio
+import bisect
+import copy
 import hashlib
+import itertools
 import json
+import os
+import threading
 import time
+from array import array
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, Callable, Iterable, Iterator, Tuple
 from pathlib import Path
 
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+try:
+    import fcntl
+    FCNTL_AVAILABLE = True
+except ImportError:
+    import msvcrt
+    FCNTL_AVAILABLE = False
+
+GENESIS_HASH = "0000000000000000000000000000000000000000000000000000000000000000"
+
+# Next to this module rather than the working directory, so every entry point shares one ledger
+DEFAULT_STORAGE_PATH = Path(__file__).resolve().parent / "mythgraph"
+
+class MythGraphWriteError(RuntimeError):
+    """Raised when chained entries could not be persisted"""
+
+class MythGraphStorageError(RuntimeError):
+    """Raised when a ledger directory cannot be opened safely"""
+
 class MythGraphEntry:
     """
     Individual entry in the MythGraph ledger
@@ -75,19 +106,769 @@ class MythGraphEntry:
             "signature": self.signature,
             "previous_hash": self.previous_hash
         }
+    
+    @classmethod
+    def from_dict(cls, entry_data: Dict) -> "MythGraphEntry":
+        """Rebuild an entry from its stored dictionary"""
+        entry = cls(entry_data["entry_type"], entry_data["data"], entry_data["timestamp"])
+        entry.hash = entry_data["hash"]
+        entry.signature = entry_data["signature"]
+        entry.previous_hash = entry_data["previous_hash"]
+        return entry
+
+class MythGraphIndex:
+    """
+    In-memory secondary indexes over the segment log
+    
+    Entries are addressed by sequence number (their position in the log):
+    hash -> seq, seq -> (segment, offset), type -> posting list of seqs, and
+    a sparse time index holding the min/max timestamp of each block of
+    `time_block` consecutive entries.
+    """
+    
+    def __init__(self, time_block: int = 256):
+        self.time_block = max(1, time_block)
+        self.hash_to_seq: Dict[str, int] = {}
+        self.segments = array('l')
+        self.offsets = array('q')
+        self.type_postings: Dict[str, array] = {}
+        self.block_min: List[str] = []
+        self.block_max: List[str] = []
+    
+    @property
+    def count(self) -> int:
+        return len(self.offsets)
+    
+    def add(self, entry_hash: str, entry_type: str, timestamp: str, segment: int, offset: int) -> int:
+        """Index one record and return its sequence number"""
+        seq = len(self.offsets)
+        self.hash_to_seq[entry_hash] = seq
+        self.segments.append(segment)
+        self.offsets.append(offset)
+        
+        postings = self.type_postings.get(entry_type)
+        if postings is None:
+            postings = self.type_postings[entry_type] = array('q')
+        postings.append(seq)
+        
+        if seq % self.time_block == 0:
+            self.block_min.append(timestamp)
+            self.block_max.append(timestamp)
+        elif timestamp < self.block_min[-1]:
+            self.block_min[-1] = timestamp
+        elif timestamp > self.block_max[-1]:
+            self.block_max[-1] = timestamp
+        return seq
+    
+    def position(self, seq: int) -> Tuple[int, int]:
+        """(segment, offset) of an entry"""
+        return self.segments[seq], self.offsets[seq]
+    
+    def type_counts(self) -> Dict[str, int]:
+        return {entry_type: len(postings) for entry_type, postings in self.type_postings.items()}
+    
+    def candidate_seqs(self, entry_type: Optional[str] = None,
+                       start_time: Optional[str] = None,
+                       end_time: Optional[str] = None,
+                       start: int = 0, stop: Optional[int] = None) -> Iterator[int]:
+        """Sequence numbers that may match; exact unless a time range is given"""
+        stop = self.count if stop is None else min(stop, self.count)
+        
+        if entry_type is not None:
+            postings = self.type_postings.get(entry_type, array('q'))
+            seqs = postings[bisect.bisect_left(postings, start):bisect.bisect_left(postings, stop)]
+        else:
+            seqs = range(start, stop)
+        
+        if start_time is None and end_time is None:
+            return iter(seqs)
+        
+        # Keep only seqs whose time block overlaps the requested range
+        blocks = {
+            block for block in range(len(self.block_min))
+            if (start_time is None or self.block_max[block] >= start_time)
+            and (end_time is None or self.block_min[block] <= end_time)
+        }
+        return (seq for seq in seqs if seq // self.time_block in blocks)
+
+class MythGraphSegmentLog:
+    """
+    Append-only, segmented JSON-lines log backing the MythGraph ledger
+    
+    Each record carries the previous record's hash, so the chain head is
+    simply the hash of the last record written. Appends flush to the OS and
+    are fsynced in batches. A sealed segment gets a sidecar index file, so
+    reopening reads one sidecar per sealed segment and scans only the
+    active segment; a checkpoint (segment, offset, count, chain head) is
+    written periodically as the last known durable position.
+    """
+    
+    SEGMENT_PREFIX = "segment_"
+    SEGMENT_SUFFIX = ".jsonl"
+    SIDECAR_SUFFIX = ".idx.json"
+    CHECKPOINT_FILE = "checkpoint.json"
+    LOCK_FILE = "writer.lock"
+    
+    def __init__(self, directory: Path,
+                 segment_max_bytes: int = 64 * 1024 * 1024,
+                 fsync_every: int = 64,
+                 fsync_interval: float = 1.0,
+                 checkpoint_every: int = 1000,
+                 time_block: int = 256):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.segment_max_bytes = segment_max_bytes
+        self.fsync_every = max(1, fsync_every)
+        self.fsync_interval = fsync_interval
+        self.checkpoint_every = max(1, checkpoint_every)
+        
+        self.index = MythGraphIndex(time_block)
+        self.entry_count = 0
+        self.chain_head: Optional[str] = None
+        self.segment_id = 0
+        self.segment_bytes = 0
+        self.stats = {"appends": 0, "fsyncs": 0, "checkpoints": 0, "rotations": 0,
+                      "sidecars_loaded": 0, "segments_scanned": 0}
+        
+        self._file = None
+        self._readers: Dict[int, Any] = {}
+        self._segment_rows = self._new_rows()
+        self._segment_first_seq = 0
+        self._unsynced = 0
+        self._since_checkpoint = 0
+        self._last_sync = time.time()
+        self._lock = threading.RLock()
+        
+        # Only one log instance, in any process, may append to a directory
+        self._lock_file = self._acquire_directory_lock()
+        try:
+            self._recover()
+            self._open_segment(self.segment_id)
+        except Exception:
+            self._release_directory_lock()
+            raise
+    
+    def _acquire_directory_lock(self):
+        """Take an exclusive, non-blocking lock on the directory's lock file"""
+        lock_file = open(self.directory / self.LOCK_FILE, 'a+b')
+        try:
+            if FCNTL_AVAILABLE:
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+            else:
+                lock_file.seek(0)
+                msvcrt.locking(lock_file.fileno(), msvcrt.LK_NBLCK, 1)
+        except OSError:
+            lock_file.close()
+            raise MythGraphStorageError(
+                f"MythGraph log {self.directory} is already open in another ledger or process"
+            )
+        lock_file.seek(0)
+        lock_file.truncate()
+        lock_file.write(str(os.getpid()).encode())
+        lock_file.flush()
+        return lock_file
+    
+    def _release_directory_lock(self):
+        # Closing the handle releases the lock
+        if self._lock_file is not None:
+            self._lock_file.close()
+            self._lock_file = None
+    
+    def segment_path(self, segment_id: int) -> Path:
+        """Path of a segment file"""
+        return self.directory / f"{self.SEGMENT_PREFIX}{segment_id:08d}{self.SEGMENT_SUFFIX}"
+    
+    def sidecar_path(self, segment_id: int) -> Path:
+        """Path of a sealed segment's index file"""
+        return self.directory / f"{self.SEGMENT_PREFIX}{segment_id:08d}{self.SIDECAR_SUFFIX}"
+    
+    def list_segments(self) -> List[int]:
+        """Segment ids present on disk, oldest first"""
+        segment_ids = []
+        for path in self.directory.glob(f"{self.SEGMENT_PREFIX}*{self.SEGMENT_SUFFIX}"):
+            try:
+                segment_ids.append(int(path.name[len(self.SEGMENT_PREFIX):-len(self.SEGMENT_SUFFIX)]))
+            except ValueError:
+                continue
+        return sorted(segment_ids)
+    
+    @staticmethod
+    def _new_rows() -> Dict[str, list]:
+        return {"offsets": [], "hashes": [], "types": [], "timestamps": []}
+    
+    def _read_checkpoint(self) -> Optional[Dict]:
+        checkpoint_file = self.directory / self.CHECKPOINT_FILE
+        try:
+            with open(checkpoint_file, 'r') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+    
+    def _index_record(self, record: Dict, segment_id: int, offset: int):
+        """Add a record to the indexes and to the active segment's sidecar rows"""
+        self.index.add(record["hash"], record["entry_type"], record["timestamp"], segment_id, offset)
+        rows = self._segment_rows
+        rows["offsets"].append(offset)
+        rows["hashes"].append(record["hash"])
+        rows["types"].append(record["entry_type"])
+        rows["timestamps"].append(record["timestamp"])
+    
+    def _load_sidecar(self, segment_id: int) -> bool:
+        """Index a sealed segment from its sidecar; False if missing or stale"""
+        try:
+            with open(self.sidecar_path(segment_id), 'r') as f:
+                sidecar = json.load(f)
+        except (OSError, ValueError):
+            return False
+        if sidecar.get("first_seq") != self.index.count:
+            return False
+        
+        for offset, entry_hash, entry_type, timestamp in zip(
+                sidecar["offsets"], sidecar["hashes"], sidecar["types"], sidecar["timestamps"]):
+            self.index.add(entry_hash, entry_type, timestamp, segment_id, offset)
+        self.stats["sidecars_loaded"] += 1
+        return True
+    
+    def _write_sidecar(self, segment_id: int, first_seq: int):
+        """Persist the finished segment's index rows next to it"""
+        sidecar = dict(self._segment_rows, segment=segment_id, first_seq=first_seq)
+        sidecar_file = self.sidecar_path(segment_id)
+        temp_file = sidecar_file.with_suffix(".tmp")
+        with open(temp_file, 'w') as f:
+            json.dump(sidecar, f, separators=(",", ":"))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_file, sidecar_file)
+    
+    def _scan_segment(self, segment_id: int, truncate_torn: bool):
+        """Index a segment by reading its records"""
+        path = self.segment_path(segment_id)
+        offset = 0
+        torn = False
+        with open(path, 'rb') as f:
+            for line in f:
+                if not line.endswith(b"\n"):
+                    torn = True
+                    break
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    torn = True
+                    break
+                self._index_record(record, segment_id, offset)
+                offset += len(line)
+        self.stats["segments_scanned"] += 1
+        
+        if torn:
+            if truncate_torn:
+                # Drop a partially written final record left by a crash
+                with open(path, 'r+b') as f:
+                    f.truncate(offset)
+                print(f"MythGraph log: truncated torn record in {path.name} at offset {offset}")
+            else:
+                print(f"MythGraph log: unreadable record in {path.name} at offset {offset}")
+    
+    def _recover(self):
+        """Rebuild the indexes from sidecars plus a scan of unsealed segments"""
+        segments = self.list_segments()
+        
+        for segment_id in segments:
+            sealed = segment_id != segments[-1]
+            if sealed and self._load_sidecar(segment_id):
+                continue
+            
+            first_seq = self.index.count
+            self._segment_rows = self._new_rows()
+            self._scan_segment(segment_id, truncate_torn=not sealed)
+            if sealed:
+                self._write_sidecar(segment_id, first_seq)
+        
+        self.segment_id = segments[-1] if segments else 0
+        self._segment_first_seq = self.index.count - len(self._segment_rows["offsets"])
+        
+        self.entry_count = self.index.count
+        if self.entry_count:
+            self.chain_head = self._read_at(*self.index.position(self.entry_count - 1))["hash"]
+        
+        checkpoint = self._read_checkpoint()
+        if checkpoint and checkpoint.get("entry_count", 0) > self.entry_count:
+            print(f"MythGraph log: checkpoint records {checkpoint['entry_count']} entries "
+                  f"but only {self.entry_count} were recovered")
+    
+    def _open_segment(self, segment_id: int):
+        self.segment_id = segment_id
+        self._file = open(self.segment_path(segment_id), 'ab')
+        self.segment_bytes = self._file.tell()
+    
+    def append(self, record: Dict) -> int:
+        """Append one record and return its sequence number"""
+        line = (json.dumps(record, sort_keys=True, separators=(",", ":")) + "\n").encode()
+        
+        with self._lock:
+            if self.segment_bytes and self.segment_bytes + len(line) > self.segment_max_bytes:
+                self._rotate()
+            
+            offset = self.segment_bytes
+            self._write_whole(line)
+            self._index_record(record, self.segment_id, offset)
+            
+            self.segment_bytes += len(line)
+            self.entry_count += 1
+            self.chain_head = record["hash"]
+            self._unsynced += 1
+            self._since_checkpoint += 1
+            self.stats["appends"] += 1
+            
+            self._maybe_sync()
+            return self.entry_count - 1
+    
+    def append_many(self, records: List[Dict]) -> int:
+        """
+        Group commit: append a batch with one flush and one fsync; returns the last sequence number
+        
+        Records are encoded before anything is written and each segment's run
+        goes out in one write, so a failure leaves whole records only: those
+        already indexed are on disk and the rest can be retried.
+        """
+        lines = [(json.dumps(record, sort_keys=True, separators=(",", ":")) + "\n").encode()
+                 for record in records]
+        
+        with self._lock:
+            start = 0
+            while start < len(records):
+                if self.segment_bytes and self.segment_bytes + len(lines[start]) > self.segment_max_bytes:
+                    self._rotate()
+                
+                # Take as many records as fit in the active segment
+                end, size = start + 1, self.segment_bytes + len(lines[start])
+                while end < len(records) and size + len(lines[end]) <= self.segment_max_bytes:
+                    size += len(lines[end])
+                    end += 1
+                self._write_whole(b"".join(lines[start:end]))
+                
+                for record, line in zip(records[start:end], lines[start:end]):
+                    self._index_record(record, self.segment_id, self.segment_bytes)
+                    self.segment_bytes += len(line)
+                    self.entry_count += 1
+                    self.chain_head = record["hash"]
+                self._unsynced += end - start
+                self._since_checkpoint += end - start
+                self.stats["appends"] += end - start
+                start = end
+            
+            self._sync()
+            if self._since_checkpoint >= self.checkpoint_every:
+                self._write_checkpoint()
+            return self.entry_count - 1
+    
+    def _write_whole(self, data: bytes):
+        """Write and flush whole records, truncating back to the last whole record on failure"""
+        if self._file is None:
+            self._reopen_active_segment()
+        try:
+            self._file.write(data)
+            self._file.flush()
+        except OSError:
+            try:
+                self._reopen_active_segment()
+            except OSError:
+                # Retried before the next write
+                self._file = None
+            raise
+    
+    def _reopen_active_segment(self):
+        """Drop any partial record past segment_bytes and reopen the active segment"""
+        if self._file is not None:
+            try:
+                self._file.close()
+            except OSError:
+                pass
+            self._file = None
+        os.truncate(self.segment_path(self.segment_id), self.segment_bytes)
+        self._open_segment(self.segment_id)
+    
+    def _maybe_sync(self):
+        """fsync once enough records or time have accumulated, checkpointing periodically"""
+        if self._unsynced and (self._unsynced >= self.fsync_every or
+                               time.time() - self._last_sync >= self.fsync_interval):
+            self._sync()
+        if self._since_checkpoint >= self.checkpoint_every:
+            self._write_checkpoint()
+    
+    def _sync(self):
+        if self._file is None or not self._unsynced:
+            return
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self._unsynced = 0
+        self._last_sync = time.time()
+        self.stats["fsyncs"] += 1
+    
+    def _write_checkpoint(self):
+        """Atomically record a durable position in the log"""
+        self._sync()
+        checkpoint = {
+            "segment": self.segment_id,
+            "offset": self.segment_bytes,
+            "entry_count": self.entry_count,
+            "chain_head": self.chain_head,
+            "last_updated": datetime.utcnow().isoformat()
+        }
+        checkpoint_file = self.directory / self.CHECKPOINT_FILE
+        temp_file = checkpoint_file.with_suffix(".tmp")
+        with open(temp_file, 'w') as f:
+            json.dump(checkpoint, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_file, checkpoint_file)
+        self._since_checkpoint = 0
+        self.stats["checkpoints"] += 1
+    
+    def _rotate(self):
+        """Seal the current segment with its sidecar index and start the next one"""
+        self._sync()
+        if self._file is not None:
+            self._file.close()
+        self._write_sidecar(self.segment_id, self._segment_first_seq)
+        self._segment_first_seq = self.entry_count
+        self._segment_rows = self._new_rows()
+        self._open_segment(self.segment_id + 1)
+        self._write_checkpoint()
+        self.stats["rotations"] += 1
+    
+    def _read_at(self, segment_id: int, offset: int) -> Dict:
+        """Read the record stored at a position, reusing open segment handles"""
+        reader = self._readers.get(segment_id)
+        if reader is None:
+            reader = self._readers[segment_id] = open(self.segment_path(segment_id), 'rb')
+        reader.seek(offset)
+        return json.loads(reader.readline())
+    
+    def read_record(self, seq: int) -> Dict:
+        """Read one record by sequence number"""
+        with self._lock:
+            return self._read_at(*self.index.position(seq))
+    
+    def read_records(self, seqs: Iterable[int], page_size: int = 256) -> Iterator[Dict]:
+        """Lazily read records by sequence number, a page at a time"""
+        seqs = iter(seqs)
+        while True:
+            page = list(itertools.islice(seqs, page_size))
+            if not page:
+                return
+            with self._lock:
+                records = [self._read_at(*self.index.position(seq)) for seq in page]
+            yield from records
+    
+    def sync(self):
+        """Force buffered records to disk"""
+        with self._lock:
+            self._sync()
+    
+    def checkpoint(self):
+        """Force a checkpoint"""
+        with self._lock:
+            self._write_checkpoint()
+    
+    def iter_records(self, start: int = 0, stop: Optional[int] = None) -> Iterator[Dict]:
+        """Stream records in log order, oldest first"""
+        stop = self.entry_count if stop is None else min(stop, self.entry_count)
+        return self.read_records(range(start, stop))
+    
+    def close(self):
+        """Sync, checkpoint and close the active segment, then release the directory lock"""
+        with self._lock:
+            for reader in self._readers.values():
+                reader.close()
+            self._readers = {}
+            try:
+                if self._file is not None:
+                    self._write_checkpoint()
+                    self._file.close()
+                    self._file = None
+            finally:
+                self._release_directory_lock()
+
+class MythGraphLedgerWriter:
+    """
+    Background group-commit writer for the MythGraph ledger
+    
+    Entries are chained and signed by the caller and queued here; one task
+    drains the queue in batches (batch_size entries, or whatever arrived
+    within flush_interval_ms of the first) and appends each batch with a
+    single write and fsync on a worker thread, off the event loop. Callers
+    wait for room once max_pending entries are queued.
+    
+    I/O errors are retried with exponential backoff. If a batch still cannot
+    be written, it and everything queued behind it (all chained onto it) are
+    kept in failed_records, on_failure is called so the ledger can rewind its
+    chain head, the writer stops accepting and flush() raises.
+    """
+    
+    _STOP = object()
+    
+    def __init__(self, log: MythGraphSegmentLog, batch_size: int = 256,
+                 flush_interval_ms: float = 20.0, max_pending: int = 10000,
+                 max_retries: int = 5, retry_backoff_ms: float = 50.0,
+                 on_failure: Optional[Callable[[List[Dict], Exception], None]] = None):
+        self.log = log
+        self.batch_size = max(1, batch_size)
+        self.flush_interval = max(0.0, flush_interval_ms) / 1000.0
+        self.max_pending = max(1, max_pending)
+        self.max_retries = max(0, max_retries)
+        self.retry_backoff = max(0.0, retry_backoff_ms) / 1000.0
+        self.on_failure = on_failure
+        self.accepting = False
+        self.error: Optional[Exception] = None
+        self.failed_records: List[Dict] = []
+        self.stats = {
+            "entries_written": 0,
+            "batches_written": 0,
+            "largest_batch": 0,
+            "max_pending_seen": 0,
+            "backpressure_waits": 0,
+            "write_retries": 0,
+            "write_errors": 0,
+            "failed_entries": 0
+        }
+        
+        self._queue: Optional[asyncio.Queue] = None
+        self._has_room: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+    
+    async def start(self):
+        """Start the writer task on the running event loop"""
+        if self.accepting:
+            return
+        self._queue = asyncio.Queue()
+        self._has_room = asyncio.Event()
+        self._has_room.set()
+        self.accepting = True
+        self._task = asyncio.create_task(self._run())
+    
+    async def wait_for_room(self):
+        """Back-pressure: wait while max_pending entries are queued"""
+        if not self._has_room.is_set():
+            self.stats["backpressure_waits"] += 1
+            # Re-check after waking: earlier waiters may have refilled the queue
+            while not self._has_room.is_set():
+                await self._has_room.wait()
+    
+    def enqueue(self, record: Dict):
+        """Queue a record for the next group commit"""
+        self._queue.put_nowait(record)
+        pending = self._queue.qsize()
+        if pending > self.stats["max_pending_seen"]:
+            self.stats["max_pending_seen"] = pending
+        if pending >= self.max_pending:
+            self._has_room.clear()
+    
+    async def flush(self):
+        """Wait until everything queued so far is on disk; raises if the writer has failed"""
+        if self.accepting:
+            await self._queue.join()
+        if self.error is not None:
+            raise MythGraphWriteError(
+                f"{len(self.failed_records)} ledger entries were not persisted: {self.error}"
+            ) from self.error
+    
+    async def stop(self):
+        """Drain the queue durably and stop the writer task"""
+        if self._task is None:
+            return
+        if self.accepting:
+            self._queue.put_nowait(self._STOP)
+        await self._task
+        self._task = None
+    
+    def _drain(self, batch: List[Dict]) -> bool:
+        """Move queued records into batch without waiting; True if stop was requested"""
+        while len(batch) < self.batch_size:
+            try:
+                item = self._queue.get_nowait()
+            except asyncio.QueueEmpty:
+                return False
+            if item is self._STOP:
+                self._queue.task_done()
+                return True
+            batch.append(item)
+        return False
+    
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        stopping = False
+        
+        while not stopping:
+            item = await self._queue.get()
+            batch = []
+            if item is self._STOP:
+                self._queue.task_done()
+                stopping = True
+            else:
+                batch.append(item)
+                deadline = loop.time() + self.flush_interval
+                stopping = self._drain(batch)
+                while not stopping and len(batch) < self.batch_size:
+                    remaining = deadline - loop.time()
+                    if remaining <= 0:
+                        break
+                    try:
+                        item = await asyncio.wait_for(self._queue.get(), remaining)
+                    except asyncio.TimeoutError:
+                        break
+                    if item is self._STOP:
+                        self._queue.task_done()
+                        stopping = True
+                    else:
+                        batch.append(item)
+                        stopping = self._drain(batch)
+            
+            if not await self._write(loop, batch):
+                break
+            
+            # Anything queued behind the stop marker is still written before exiting
+            while stopping and not self._queue.empty():
+                batch = []
+                self._drain(batch)
+                if not await self._write(loop, batch):
+                    break
+        
+        # No await between the final empty check and here, so nothing can slip in
+        self.accepting = False
+    
+    async def _write(self, loop, batch: List[Dict]) -> bool:
+        """Append a batch, retrying I/O errors with backoff; False once the writer has failed"""
+        if not batch:
+            return True
+        pending = batch
+        try:
+            for attempt in range(self.max_retries + 1):
+                try:
+                    await loop.run_in_executor(None, self.log.append_many, pending)
+                    break
+                except OSError as e:
+                    # Records indexed before the failure are on disk; only the rest are retried
+                    pending = [record for record in pending if record["hash"] not in self.log.index.hash_to_seq]
+                    if attempt == self.max_retries:
+                        raise
+                    self.stats["write_retries"] += 1
+                    print(f"MythGraph writer retrying {len(pending)} entries after: {e}")
+                    await asyncio.sleep(self.retry_backoff * 2 ** attempt)
+            self.stats["entries_written"] += len(batch)
+            self.stats["batches_written"] += 1
+            self.stats["largest_batch"] = max(self.stats["largest_batch"], len(batch))
+            return True
+        except Exception as e:
+            self._fail(list(pending), e)
+            return False
+        finally:
+            for _ in batch:
+                self._queue.task_done()
+            if self._queue.qsize() < self.max_pending:
+                self._has_room.set()
+    
+    def _fail(self, records: List[Dict], error: Exception):
+        """Stop accepting and hand back every unwritten record"""
+        self.accepting = False
+        self.error = error
+        # Everything still queued is chained onto the failed records, so it cannot be written either
+        while True:
+            try:
+                item = self._queue.get_nowait()
+            except asyncio.QueueEmpty:
+                break
+            self._queue.task_done()
+            if item is not self._STOP:
+                records.append(item)
+        self.failed_records = records
+        self.stats["write_errors"] += 1
+        self.stats["failed_entries"] += len(records)
+        print(f"MythGraph writer failed to persist {len(records)} entries: {error}")
+        if self.on_failure is not None:
+            self.on_failure(records, error)
+
+def verify_segment_chunk(segment_path: str, start_offset: int, count: int,
+                         first_seq: int, public_key: str) -> Dict:
+    """
+    Verify a contiguous run of records read straight from a segment file
+    
+    Runs in a worker process: recomputes each record's hash from its content
+    and previous_hash and checks its signature. Chain linkage across records
+    is checked by the caller from the returned hash lists.
+    """
+    hashes, previous_hashes, failures = [], [], []
+    with open(segment_path, 'rb') as f:
+        f.seek(start_offset)
+        for seq in range(first_seq, first_seq + count):
+            record = json.loads(f.readline())
+            entry = MythGraphEntry.from_dict(record)
+            hashes.append(record["hash"])
+            previous_hashes.append(record["previous_hash"])
+            
+            if entry.calculate_hash(record["previous_hash"]) != record["hash"]:
+                failures.append((seq, f"Hash mismatch for entry {record['hash']}"))
+            elif not entry.verify_signature(public_key):
+                failures.append((seq, f"Invalid signature for entry {record['hash']}"))
+    
+    return {"first_seq": first_seq, "hashes": hashes, "previous_hashes": previous_hashes, "failures": failures}
+
+def find_chain_breaks(hashes: List[str], previous_hashes: List[Optional[str]],
+                      head_before: Optional[str]) -> List[int]:
+    """Positions whose previous_hash does not match the preceding record's hash"""
+    expected = [head_before] + hashes[:-1]
+    if NUMPY_AVAILABLE:
+        mismatch = np.array(previous_hashes, dtype=object) != np.array(expected, dtype=object)
+        return np.flatnonzero(mismatch).tolist()
+    return [i for i, (actual, wanted) in enumerate(zip(previous_hashes, expected)) if actual != wanted]
 
 class MythGraphLedger:
     """
     MythGraph ledger implementation
     """
     
-    def __init__(self, public_key: str, private_key: str):
+    VERIFY_STATE_FILE = "verify_state.json"
+    LEGACY_INDEX_FILE = "ledger_index.json"
+    GENESIS_DATA = {
+        "message": "MythGraph Ledger initialized",
+        "timestamp": "2025-01-17T00:00:00Z"
+    }
+    
+    def __init__(self, public_key: str, private_key: str, storage_path: Optional[str] = None,
+                 segment_max_bytes: int = 64 * 1024 * 1024,
+                 fsync_every: int = 64,
+                 fsync_interval: float = 1.0,
+                 checkpoint_every: int = 1000,
+                 recent_cache_size: int = 1000):
+        # Window of the most recent entries; older ones are read back from the log
         self.entries: List[MythGraphEntry] = []
+        self.recent_cache_size = max(1, recent_cache_size)
         self.public_key = public_key
         self.private_key = private_key
-        self.ledger_hash = "0000000000000000000000000000000000000000000000000000000000000000"
-        self.storage_path = Path("mythgraph")
-        self.storage_path.mkdir(exist_ok=True)
+        self.storage_path = Path(storage_path) if storage_path is not None else DEFAULT_STORAGE_PATH
+        self.storage_path.mkdir(parents=True, exist_ok=True)
+        self._check_legacy_layout()
+        
+        # Append-only segment log; reopening rebuilds its indexes and chain head
+        self.log = MythGraphSegmentLog(
+            self.storage_path,
+            segment_max_bytes=segment_max_bytes,
+            fsync_every=fsync_every,
+            fsync_interval=fsync_interval,
+            checkpoint_every=checkpoint_every
+        )
+        self.ledger_hash = self.log.chain_head or GENESIS_HASH
+        
+        # Optional background group-commit writer (see start_writer)
+        self.writer: Optional[MythGraphLedgerWriter] = None
+    
+    def _check_legacy_layout(self):
+        """Refuse to start a new log over a ledger stored as per-entry JSON files"""
+        has_segments = any(self.storage_path.glob(f"{MythGraphSegmentLog.SEGMENT_PREFIX}*"))
+        if (self.storage_path / self.LEGACY_INDEX_FILE).exists() and not has_segments:
+            raise MythGraphStorageError(
+                f"{self.storage_path} holds a ledger in the old per-entry JSON layout "
+                f"({self.LEGACY_INDEX_FILE}); move it aside or choose another storage_path"
+            )
     
     def initialize(self):
         """Initialize the MythGraph ledger system"""
@@ -95,50 +876,51 @@ class MythGraphLedger:
             # Create storage directory if it doesn't exist
             self.storage_path.mkdir(exist_ok=True)
             
-            # Initialize with a genesis entry
-            genesis_entry = MythGraphEntry("system_initialization", {
-                "message": "MythGraph Ledger initialized",
-                "timestamp": "2025-01-17T00:00:00Z"
-            })
+            # A reopened ledger already has its genesis entry
+            if self.log.entry_count > 0:
+                return True
             
-            # Add to entries list
-            self.entries.append(genesis_entry)
+            # Initialize with a genesis entry
+            genesis_entry = MythGraphEntry("system_initialization", dict(self.GENESIS_DATA))
             
-            # Update ledger hash
-            self.update_ledger_hash()
+            self._append_entry(genesis_entry)
+            self._persist_record(genesis_entry.to_dict())
             
             return True
         except Exception as e:
+            self._rewind_to_log()
             print(f"MythGraph initialization failed: {e}")
             return False
     
-    def log_event(self, event_type: str, message: str) -> str:
+    def log_event(self, event_type: str, message: str, additional_data: Optional[Dict] = None) -> str:
         """
         Log an event to the MythGraph ledger
         
         Args:
             event_type: Type of event (e.g., 'repair_strategy_creation', 'paradox_detected')
             message: Event message
+            additional_data: Additional event data
         
         Returns:
             Entry hash of the logged event
         """
         try:
             # Create event entry
-            event_entry = MythGraphEntry(event_type, {
+            event_data = {
                 "message": message,
                 "timestamp": datetime.utcnow().isoformat()
-            })
-            
-            # Add to entries list
-            self.entries.append(event_entry)
+            }
+            if additional_data:
+                event_data.update(additional_data)
+            event_entry = MythGraphEntry(event_type, event_data)
             
-            # Update ledger hash
-            self.update_ledger_hash()
+            self._append_entry(event_entry)
+            self._persist_record(event_entry.to_dict())
             
             return event_entry.hash if event_entry.hash else "event_logged"
             
         except Exception as e:
+            self._rewind_to_log()
             print(f"Event logging failed: {e}")
             return "logging_failed"
     
@@ -152,109 +934,192 @@ class MythGraphLedger:
         
         Returns:
             Entry hash
+        
+        Raises:
+            Exception: if the entry could not be persisted; the chain head is
+                rewound so the next entry links to the last persisted one
         """
-        # Create new entry
-        entry = MythGraphEntry(entry_type, data)
+        # Wait for writer capacity before chaining so queue order matches chain order
+        if self.writer is not None and self.writer.accepting:
+            await self.writer.wait_for_room()
         
-        # Calculate hash with previous entry hash
-        previous_hash = self.ledger_hash if self.entries else None
-        entry_hash = entry.calculate_hash(previous_hash)
+        # Create new entry, chained to the current head and signed. The entry keeps
+        # its own copy of data: the writer serializes it later, on another thread,
+        # and a caller's changes must not alter a record after it was hashed
+        entry = MythGraphEntry(entry_type, copy.deepcopy(data))
+        entry_hash = self._append_entry(entry)
+        
+        # Persist to storage
+        try:
+            self._persist_record(entry.to_dict())
+        except Exception:
+            self._rewind_to_log()
+            raise
+        
+        # Log to console for transparency
+        print(f"MYTHGRAPH: {entry_hash} - {entry_type} - {data.get('reason', 'Unknown')}")
         
-        # Sign entry
+        return entry_hash
+    
+    def _append_entry(self, entry: MythGraphEntry) -> str:
+        """Chain, sign and record an entry in memory; O(1) regardless of ledger size"""
+        # The first entry has no predecessor; later ones link to the chain head
+        previous_hash = self.ledger_hash if self.log.entry_count or self.entries else None
+        entry_hash = entry.calculate_hash(previous_hash)
         entry.sign_entry(self.private_key)
         
-        # Add to ledger
         self.entries.append(entry)
-        
-        # Update ledger hash
         self.update_ledger_hash()
         
-        # Persist to storage
-        await self.persist_entry(entry)
-        
-        # Log to console for transparency
-        print(f"MYTHGRAPH: {entry_hash} - {entry_type} - {data.get('reason', 'Unknown')}")
+        # Trim the recent window in bulk so appends stay amortised O(1), but never
+        # past an entry the writer has not persisted yet: lookups rely on the window
+        if len(self.entries) > 2 * self.recent_cache_size:
+            cut = len(self.entries) - self.recent_cache_size
+            if self.entries[cut - 1].hash in self.log.index.hash_to_seq:
+                del self.entries[:cut]
         
         return entry_hash
     
     def update_ledger_hash(self):
-        """Update the ledger hash with all entries"""
-        ledger_data = json.dumps([entry.to_dict() for entry in self.entries], sort_keys=True)
-        self.ledger_hash = hashlib.sha256(ledger_data.encode()).hexdigest()
+        """Advance the rolling chain head to the newest entry"""
+        if self.entries and self.entries[-1].hash:
+            self.ledger_hash = self.entries[-1].hash
+    
+    def _rewind_to_log(self, records: Optional[List[Dict]] = None, error: Optional[Exception] = None):
+        """Forget entries the log does not hold and move the chain head back to the log's"""
+        persisted = self.log.index.hash_to_seq
+        self.entries = [entry for entry in self.entries if entry.hash in persisted]
+        self.ledger_hash = self.log.chain_head or GENESIS_HASH
     
     async def persist_entry(self, entry: MythGraphEntry):
         """Persist entry to storage"""
         try:
-            # Save individual entry
-            entry_file = self.storage_path / f"{entry.hash}.json"
-            with open(entry_file, 'w') as f:
-                json.dump(entry.to_dict(), f, indent=2)
-            
-            # Update ledger index
-            await self.update_ledger_index()
-            
+            self._persist_record(entry.to_dict())
         except Exception as e:
             print(f"Failed to persist entry: {e}")
     
+    def _persist_record(self, record: Dict):
+        """Hand a record to the background writer if running, else append it directly"""
+        if self.writer is not None and self.writer.accepting:
+            self.writer.enqueue(record)
+        else:
+            self.log.append(record)
+    
+    async def start_writer(self, batch_size: int = 256, flush_interval_ms: float = 20.0,
+                           max_pending: int = 10000) -> MythGraphLedgerWriter:
+        """Route appends through a background group-commit writer"""
+        if self.writer is None or not self.writer.accepting:
+            self.writer = MythGraphLedgerWriter(self.log, batch_size, flush_interval_ms, max_pending,
+                                                on_failure=self._rewind_to_log)
+            await self.writer.start()
+        return self.writer
+    
+    async def flush(self):
+        """Wait for queued entries to be written and synced"""
+        if self.writer is not None:
+            await self.writer.flush()
+        self.log.sync()
+    
+    async def stop_writer(self):
+        """Drain queued entries to disk and stop the background writer"""
+        if self.writer is not None:
+            await self.writer.stop()
+    
     async def update_ledger_index(self):
-        """Update ledger index file"""
+        """Write a checkpoint of the segment log"""
         try:
-            index_data = {
-                "ledger_hash": self.ledger_hash,
-                "entry_count": len(self.entries),
-                "last_updated": datetime.utcnow().isoformat(),
-                "entries": [
-                    {
-                        "hash": entry.hash,
-                        "type": entry.entry_type,
-                        "timestamp": entry.timestamp
-                    }
-                    for entry in self.entries
-                ]
-            }
-            
-            index_file = self.storage_path / "ledger_index.json"
-            with open(index_file, 'w') as f:
-                json.dump(index_data, f, indent=2)
-                
+            self.log.checkpoint()
         except Exception as e:
             print(f"Failed to update ledger index: {e}")
     
+    def close(self):
+        """Flush and checkpoint the segment log"""
+        try:
+            self.log.close()
+        except Exception as e:
+            print(f"Failed to close ledger: {e}")
+    
     def verify_entry(self, entry_hash: str) -> bool:
         """Verify entry hash is in ledger"""
-        for entry in self.entries:
-            if entry.hash == entry_hash:
-                return entry.verify_signature(self.public_key)
-        return False
+        entry = self.get_entry_by_hash(entry_hash)
+        return entry.verify_signature(self.public_key) if entry else False
     
     def get_entry_by_hash(self, entry_hash: str) -> Optional[MythGraphEntry]:
-        """Get entry by hash"""
-        for entry in self.entries:
+        """Get entry by hash, including entries still queued for the writer"""
+        # The recent window holds queued entries before the log has indexed them
+        for entry in reversed(self.entries):
             if entry.hash == entry_hash:
                 return entry
-        return None
+        seq = self.log.index.hash_to_seq.get(entry_hash)
+        if seq is None:
+            return None
+        return MythGraphEntry.from_dict(self.log.read_record(seq))
     
     def get_recent_entries(self, limit: int = 10) -> List[MythGraphEntry]:
         """Get recent entries"""
-        return self.entries[-limit:] if self.entries else []
+        if limit <= 0:
+            return []
+        if limit <= len(self.entries):
+            return self.entries[-limit:]
+        return list(self.iter_entries(start=max(0, self.log.entry_count - limit)))
     
-    def get_entries_by_type(self, entry_type: str) -> List[MythGraphEntry]:
+    def get_entries_by_type(self, entry_type: str, limit: Optional[int] = None) -> List[MythGraphEntry]:
         """Get entries by type"""
-        return [entry for entry in self.entries if entry.entry_type == entry_type]
+        return list(itertools.islice(self.iter_entries(entry_type=entry_type), limit))
     
-    def get_statistics(self) -> Dict:
-        """Get ledger statistics"""
-        total_entries = len(self.entries)
-        entry_types = {}
+    def iter_entries(self, entry_type: Optional[str] = None,
+                     start_time: Optional[str] = None,
+                     end_time: Optional[str] = None,
+                     start: int = 0, stop: Optional[int] = None) -> Iterator[MythGraphEntry]:
+        """
+        Lazily iterate entries in log order
         
-        for entry in self.entries:
-            entry_type = entry.entry_type
-            entry_types[entry_type] = entry_types.get(entry_type, 0) + 1
+        Args:
+            entry_type: Only entries of this type (type posting list)
+            start_time: Inclusive ISO timestamp lower bound (sparse time index)
+            end_time: Inclusive ISO timestamp upper bound
+            start: First sequence number
+            stop: Sequence number to stop before
+        """
+        seqs = self.log.index.candidate_seqs(entry_type, start_time, end_time, start, stop)
+        for record in self.log.read_records(seqs):
+            if start_time is not None and record["timestamp"] < start_time:
+                continue
+            if end_time is not None and record["timestamp"] > end_time:
+                continue
+            yield MythGraphEntry.from_dict(record)
+    
+    def query_entries(self, entry_type: Optional[str] = None,
+                      start_time: Optional[str] = None,
+                      end_time: Optional[str] = None,
+                      offset: int = 0, limit: int = 100) -> Dict:
+        """
+        One page of matching entries
         
+        Returns:
+            Dictionary with the page's entries and the offset of the next page
+            (None when the results are exhausted)
+        """
+        entries = list(itertools.islice(
+            self.iter_entries(entry_type, start_time, end_time), offset, offset + limit + 1
+        ))
+        has_more = len(entries) > limit
         return {
-            "total_entries": total_entries,
-            "entry_types": entry_types,
+            "entries": [entry.to_dict() for entry in entries[:limit]],
+            "offset": offset,
+            "limit": limit,
+            "next_offset": offset + limit if has_more else None
+        }
+    
+    def get_statistics(self) -> Dict:
+        """Get ledger statistics"""
+        return {
+            "total_entries": self.log.entry_count,
+            "entry_types": self.log.index.type_counts(),
             "ledger_hash": self.ledger_hash,
+            "segments": len(self.log.list_segments()),
+            "log_stats": dict(self.log.stats),
+            "writer_stats": dict(self.writer.stats) if self.writer is not None else None,
             "last_updated": datetime.utcnow().isoformat(),
             "verification_enabled": True
         }
@@ -264,64 +1129,141 @@ class MythGraphLedger:
         if format == "json":
             return json.dumps({
                 "ledger_hash": self.ledger_hash,
-                "entry_count": len(self.entries),
-                "entries": [entry.to_dict() for entry in self.entries]
+                "entry_count": self.log.entry_count,
+                "entries": [entry.to_dict() for entry in self.iter_entries()]
             }, indent=2)
         else:
             raise ValueError(f"Unsupported format: {format}")
     
     async def load_from_storage(self):
-        """Load entries from storage"""
+        """Load the recent-entry window from storage"""
         try:
-            index_file = self.storage_path / "ledger_index.json"
-            if index_file.exists():
-                with open(index_file, 'r') as f:
-                    index_data = json.load(f)
-                
-                # Load individual entries
-                for entry_info in index_data.get("entries", []):
-                    entry_file = self.storage_path / f"{entry_info['hash']}.json"
-                    if entry_file.exists():
-                        with open(entry_file, 'r') as f:
-                            entry_data = json.load(f)
-                        
-                        entry = MythGraphEntry(
-                            entry_data["entry_type"],
-                            entry_data["data"],
-                            entry_data["timestamp"]
-                        )
-                        entry.hash = entry_data["hash"]
-                        entry.signature = entry_data["signature"]
-                        entry.previous_hash = entry_data["previous_hash"]
-                        
-                        self.entries.append(entry)
-                
-                # Update ledger hash
-                self.update_ledger_hash()
+            # Indexes were rebuilt when the log was opened; only warm the recent window
+            start = max(0, self.log.entry_count - self.recent_cache_size)
+            self.entries = list(self.iter_entries(start=start))
+            
+            self.ledger_hash = self.log.chain_head or GENESIS_HASH
                 
         except Exception as e:
             print(f"Failed to load from storage: {e}")
     
-    async def verify_ledger_integrity(self) -> Dict:
-        """Verify ledger integrity"""
+    def _load_verify_state(self) -> Dict:
+        try:
+            with open(self.storage_path / self.VERIFY_STATE_FILE, 'r') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+    
+    def _save_verify_state(self, verified_seq: int, chain_head: Optional[str]):
+        """Atomically record how far the ledger has been verified"""
+        state_file = self.storage_path / self.VERIFY_STATE_FILE
+        temp_file = state_file.with_suffix(".tmp")
+        with open(temp_file, 'w') as f:
+            json.dump({
+                "verified_seq": verified_seq,
+                "chain_head": chain_head,
+                "key_fingerprint": hashlib.sha256(self.public_key.encode()).hexdigest()[:16],
+                "last_verified": datetime.utcnow().isoformat()
+            }, f)
+        os.replace(temp_file, state_file)
+    
+    def _verified_watermark(self) -> Tuple[int, Optional[str]]:
+        """Resume point from the last run, or (0, None) if it no longer holds"""
+        state = self._load_verify_state()
+        verified_seq = state.get("verified_seq", 0)
+        chain_head = state.get("chain_head")
+        
+        if (verified_seq <= 0 or verified_seq > self.log.entry_count or
+                state.get("key_fingerprint") != hashlib.sha256(self.public_key.encode()).hexdigest()[:16]):
+            return 0, None
+        # The watermark only holds if the entry it ends on is unchanged
+        if self.log.read_record(verified_seq - 1)["hash"] != chain_head:
+            return 0, None
+        return verified_seq, chain_head
+    
+    def _plan_verification_chunks(self, start: int, stop: int, chunk_size: int) -> List[Tuple[str, int, int, int]]:
+        """Split [start, stop) into (segment_path, offset, count, first_seq) runs within segments"""
+        chunks = []
+        seq = start
+        while seq < stop:
+            segment_id, offset = self.log.index.position(seq)
+            end = min(seq + chunk_size, stop)
+            # Never let a chunk cross into the next segment
+            while self.log.index.segments[end - 1] != segment_id:
+                end -= 1
+            chunks.append((str(self.log.segment_path(segment_id)), offset, end - seq, seq))
+            seq = end
+        return chunks
+    
+    async def verify_ledger_integrity(self, full: bool = False, workers: Optional[int] = None,
+                                      chunk_size: int = 10000) -> Dict:
+        """
+        Verify ledger integrity
+        
+        Only entries appended since the last verified watermark are checked
+        unless full is set. Chunks of entries are verified across a process
+        pool and the watermark advances (and is saved) as each contiguous,
+        fully valid prefix completes, so an interrupted run resumes.
+        """
+        await self.flush()
+        total_entries = self.log.entry_count
+        start, chain_head = (0, None) if full else self._verified_watermark()
+        
         verification_results = {
-            "total_entries": len(self.entries),
-            "verified_entries": 0,
+            "total_entries": total_entries,
+            "previously_verified": start,
+            "newly_checked": total_entries - start,
+            "verified_entries": start,
             "failed_verifications": 0,
+            "chain_breaks": 0,
             "errors": []
         }
         
-        for entry in self.entries:
-            try:
-                if entry.verify_signature(self.public_key):
-                    verification_results["verified_entries"] += 1
-                else:
-                    verification_results["failed_verifications"] += 1
-                    verification_results["errors"].append(f"Invalid signature for entry {entry.hash}")
-            except Exception as e:
-                verification_results["failed_verifications"] += 1
-                verification_results["errors"].append(f"Verification error for entry {entry.hash}: {e}")
+        chunks = self._plan_verification_chunks(start, total_entries, max(1, chunk_size))
+        pending: Dict[int, Dict] = {}
+        next_seq, watermark, watermark_valid = start, start, True
+        
+        def absorb(result: Dict):
+            """Fold results in log order, advancing the watermark over clean prefixes"""
+            nonlocal next_seq, chain_head, watermark, watermark_valid
+            pending[result["first_seq"]] = result
+            while next_seq in pending:
+                result = pending.pop(next_seq)
+                failed = dict(result["failures"])
+                for position in find_chain_breaks(result["hashes"], result["previous_hashes"], chain_head):
+                    verification_results["chain_breaks"] += 1
+                    failed.setdefault(next_seq + position,
+                                      f"Broken chain link at entry {result['hashes'][position]}")
+                
+                verification_results["verified_entries"] += len(result["hashes"]) - len(failed)
+                verification_results["failed_verifications"] += len(failed)
+                verification_results["errors"].extend(failed[seq] for seq in sorted(failed))
+                
+                next_seq += len(result["hashes"])
+                chain_head = result["hashes"][-1]
+                if failed:
+                    watermark_valid = False
+                if watermark_valid:
+                    watermark = next_seq
+                    self._save_verify_state(watermark, chain_head)
+        
+        try:
+            if len(chunks) <= 1 or workers == 1:
+                for chunk in chunks:
+                    absorb(verify_segment_chunk(*chunk, self.public_key))
+            else:
+                loop = asyncio.get_running_loop()
+                with ProcessPoolExecutor(max_workers=workers) as executor:
+                    futures = [
+                        asyncio.wrap_future(executor.submit(verify_segment_chunk, *chunk, self.public_key), loop=loop)
+                        for chunk in chunks
+                    ]
+                    for future in asyncio.as_completed(futures):
+                        absorb(await future)
+        except Exception as e:
+            verification_results["errors"].append(f"Verification error: {e}")
         
+        verification_results["verified_watermark"] = watermark
         verification_results["integrity_score"] = (
             verification_results["verified_entries"] / verification_results["total_entries"]
             if verification_results["total_entries"] > 0 else 0.0
@@ -377,6 +1319,8 @@ async def test_mythgraph_ledger():
     # Export ledger
     exported = ledger.export_ledger("json")
     print(f"Exported ledger length: {len(exported)} characters")
+    
+    ledger.close()
 
 if __name__ == "__main__":
     asyncio.run(test_mythgraph_ledger()) 
\ No newline at end of file
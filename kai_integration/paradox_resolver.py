@@ -6,10 +6,13 @@ Handles logical contradictions and paradoxes
 
 import asyncio
 import re
-from typing import Dict, List, Optional, Any
+from typing import Dict, Iterable, List, Optional, Any
 from enum import Enum
 from datetime import datetime
 
+from pattern_matcher import PatternMatcher
+from verdict_cache import VerdictCache, content_digest
+
 class ContainmentScope(Enum):
     NIGHTMARE = "NIGHTMARE"  # High-risk paradoxes
     SAFE = "SAFE"           # Standard paradoxes
@@ -27,21 +30,80 @@ class ParadoxType(Enum):
     RECURSIVE_LOOP = "recursive_loop"
     LOGICAL_CONTRADICTION = "logical_contradiction"
 
+# Phrases screened by detect_paradox; types and phrases are in priority order
+DEFAULT_PARADOX_PATTERNS = {
+    ParadoxType.SELF_REFERENCE: [
+        "this statement is false",
+        "i am lying",
+        "the following is true: the following is false",
+        "everything i say is a lie"
+    ],
+    ParadoxType.CIRCULAR_DEPENDENCY: [
+        "depends on itself",
+        "circular reference",
+        "recursive definition",
+        "infinite loop"
+    ],
+    ParadoxType.LOGICAL_CONTRADICTION: [
+        "both true and false",
+        "impossible condition",
+        "contradictory statements",
+        "mutually exclusive"
+    ]
+}
+
 class ParadoxResolver:
     """
     Core paradox resolution engine
+    
+    detect_paradox screens text with a PatternMatcher built once from
+    DEFAULT_PARADOX_PATTERNS (or the patterns given); its verdicts are cached
+    by normalized text hash and pattern_version (verdict_cache_size=0
+    disables the cache).
     """
     
-    def __init__(self):
+    def __init__(self, verdict_cache_size: int = 10000, verdict_cache_ttl: Optional[float] = 300.0,
+                 patterns: Optional[Dict[Any, List[str]]] = None):
         self.containment_scopes = list(ContainmentScope)
         self.resolution_methods = list(ResolutionMethod)
         self.paradox_types = list(ParadoxType)
         self.max_iterations = 100
         self.timeout_ms = 5000
+        
+        # Bump (or call invalidate_cache) whenever detection patterns change
+        self.pattern_version = 0
+        self.verdict_cache: Optional[VerdictCache] = None
+        if verdict_cache_size > 0:
+            self.verdict_cache = VerdictCache(verdict_cache_size, verdict_cache_ttl)
+        
+        self.detection_patterns: Dict[ParadoxType, List[str]] = {}
+        self.pattern_matcher: Optional[PatternMatcher] = None
+        self.add_patterns(DEFAULT_PARADOX_PATTERNS if patterns is None else patterns)
+    
+    def add_patterns(self, patterns: Dict[Any, List[str]]):
+        """
+        Add detection phrases (keyed by ParadoxType or its value) and rebuild the matcher
+        
+        Cached detection verdicts are invalidated.
+        """
+        for paradox_type, phrases in patterns.items():
+            paradox_type = ParadoxType(paradox_type)
+            existing = self.detection_patterns.setdefault(paradox_type, [])
+            for phrase in phrases:
+                phrase = phrase.lower()
+                if phrase not in existing:
+                    existing.append(phrase)
+        
+        self.pattern_matcher = PatternMatcher(
+            (paradox_type, phrase)
+            for paradox_type, phrases in self.detection_patterns.items()
+            for phrase in phrases
+        )
+        self.invalidate_cache()
     
     def detect_paradox(self, text: str) -> Dict[str, Any]:
         """
-        Detect paradoxes in text
+        Detect paradoxes in text, answering repeated text from the verdict cache
         
         Args:
             text: Text to analyze for paradoxes
@@ -52,48 +114,64 @@ class ParadoxResolver:
                 - paradox_type: Type of paradox detected
                 - details: Description of the paradox
                 - containment_scope: Recommended containment scope
+                - matches: Every phrase match, with paradox_type, pattern,
+                  start and end, highest priority first
         """
+        if self.verdict_cache is None:
+            return self._detect_paradox_uncached(text)
+        
+        digest = content_digest(text)
+        cached = self.verdict_cache.get(self.pattern_version, digest)
+        if cached is not None:
+            return self._copy_detection(cached)
+        
+        result = self._detect_paradox_uncached(text)
+        if result["paradox_type"] != "error":
+            self.verdict_cache.put(self.pattern_version, digest, self._copy_detection(result))
+        return result
+    
+    def detect_paradoxes(self, texts: Iterable[str]) -> List[Dict[str, Any]]:
+        """detect_paradox over many texts, sharing the prebuilt matcher and the cache"""
+        return [self.detect_paradox(text) for text in texts]
+    
+    @staticmethod
+    def _copy_detection(result: Dict[str, Any]) -> Dict[str, Any]:
+        """Copy so callers never mutate a cached verdict"""
+        copied = dict(result)
+        if "matches" in copied:
+            copied["matches"] = [dict(match) for match in copied["matches"]]
+        return copied
+    
+    def _detect_paradox_uncached(self, text: str) -> Dict[str, Any]:
+        """One automaton pass behind detect_paradox"""
         try:
-            # Simple paradox detection patterns
-            paradox_patterns = {
-                ParadoxType.SELF_REFERENCE: [
-                    "this statement is false",
-                    "i am lying",
-                    "the following is true: the following is false",
-                    "everything i say is a lie"
-                ],
-                ParadoxType.CIRCULAR_DEPENDENCY: [
-                    "depends on itself",
-                    "circular reference",
-                    "recursive definition",
-                    "infinite loop"
-                ],
-                ParadoxType.LOGICAL_CONTRADICTION: [
-                    "both true and false",
-                    "impossible condition",
-                    "contradictory statements",
-                    "mutually exclusive"
-                ]
-            }
-            
-            text_lower = text.lower()
+            matches = [
+                {
+                    "paradox_type": match["label"].value,
+                    "pattern": match["pattern"],
+                    "start": match["start"],
+                    "end": match["end"]
+                }
+                for match in self.pattern_matcher.find_all(text.lower())
+            ]
             
-            for paradox_type, patterns in paradox_patterns.items():
-                for pattern in patterns:
-                    if pattern in text_lower:
-                        return {
-                            "paradox_detected": True,
-                            "paradox_type": paradox_type.value,
-                            "details": f"Detected {paradox_type.value} paradox: '{pattern}'",
-                            "containment_scope": ContainmentScope.SAFE.value
-                        }
+            if matches:
+                primary = matches[0]
+                return {
+                    "paradox_detected": True,
+                    "paradox_type": primary["paradox_type"],
+                    "details": f"Detected {primary['paradox_type']} paradox: '{primary['pattern']}'",
+                    "containment_scope": ContainmentScope.SAFE.value,
+                    "matches": matches
+                }
             
             # No paradox detected
             return {
                 "paradox_detected": False,
                 "paradox_type": None,
                 "details": "No paradoxes detected in text",
-                "containment_scope": ContainmentScope.SAFE.value
+                "containment_scope": ContainmentScope.SAFE.value,
+                "matches": []
             }
             
         except Exception as e:
@@ -104,6 +182,18 @@ class ParadoxResolver:
                 "containment_scope": ContainmentScope.SAFE.value
             }
     
+    def invalidate_cache(self):
+        """Forget cached detection verdicts (detection patterns changed)"""
+        self.pattern_version += 1
+        if self.verdict_cache is not None:
+            self.verdict_cache.invalidate()
+    
+    def get_cache_stats(self) -> Dict[str, Any]:
+        """Verdict cache hit-rate metrics"""
+        if self.verdict_cache is None:
+            return {"enabled": False}
+        return {"enabled": True, **self.verdict_cache.get_stats()}
+    
     async def classify_paradox(self, paradox_data: Dict) -> ParadoxType:
         """Classify the type of paradox"""
         text = paradox_data.get("text", "").lower()
@@ -226,8 +316,9 @@ class DefaultParadoxResolver(ParadoxResolver):
     Default implementation of paradox resolver
     """
     
-    def __init__(self):
-        super().__init__()
+    def __init__(self, verdict_cache_size: int = 10000, verdict_cache_ttl: Optional[float] = 300.0,
+                 patterns: Optional[Dict[Any, List[str]]] = None):
+        super().__init__(verdict_cache_size, verdict_cache_ttl, patterns)
         # Additional configuration for default implementation
         self.pattern_matchers = {
             ParadoxType.SELF_REFERENCE: [
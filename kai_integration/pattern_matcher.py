@@ -0,0 +1,192 @@
+#!/usr/bin/env python3
+"""
+Kai Core V8+ Pattern Matcher
+Single-pass multi-pattern matching shared by the paradox detectors and guard-rail policies
+"""
+
+import re
+from collections import deque
+from typing import Dict, Iterable, Iterator, List, Optional, Any, Tuple
+
+# Characters that end the literal prefix of a regex pattern
+_REGEX_META = set(".^$*+?{}[]|()\\")
+
+def _has_top_level_alternation(pattern: str) -> bool:
+    """Whether pattern has a | outside every group and character class"""
+    depth = 0
+    in_class = escaped = False
+    for char in pattern:
+        if escaped:
+            escaped = False
+        elif char == "\\":
+            escaped = True
+        elif in_class:
+            in_class = char != "]"
+        elif char == "[":
+            in_class = True
+        elif char == "(":
+            depth += 1
+        elif char == ")":
+            depth -= 1
+        elif char == "|" and depth == 0:
+            return True
+    return False
+
+def literal_anchor(pattern: str) -> str:
+    """Literal text every match of a regex must start with ('' if there is none)"""
+    # Alternatives inside a group come after the prefix and do not affect it
+    if _has_top_level_alternation(pattern):
+        return ""
+    prefix = []
+    for char in pattern:
+        if char in _REGEX_META:
+            break
+        prefix.append(char)
+    # A quantifier right after the prefix makes its last character optional
+    following = pattern[len(prefix):len(prefix) + 1]
+    if following and following in "?*{" and prefix:
+        prefix.pop()
+    return "".join(prefix)
+
+class AhoCorasickAutomaton:
+    """
+    Aho-Corasick automaton over a fixed set of keywords
+    
+    One left-to-right pass over a text reports every keyword occurrence,
+    overlapping ones included, in time linear in the text length however
+    many keywords there are.
+    """
+    
+    def __init__(self, keywords: Iterable[str]):
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._output: List[Tuple[str, ...]] = [()]
+        
+        for keyword in keywords:
+            if keyword:
+                self._insert(keyword)
+        self._link()
+    
+    def _insert(self, keyword: str):
+        node = 0
+        for char in keyword:
+            child = self._goto[node].get(char)
+            if child is None:
+                child = len(self._goto)
+                self._goto[node][char] = child
+                self._goto.append({})
+                self._fail.append(0)
+                self._output.append(())
+            node = child
+        if keyword not in self._output[node]:
+            self._output[node] += (keyword,)
+    
+    def _link(self):
+        """Breadth-first failure links; each node also reports its suffixes' keywords"""
+        queue = deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for char, child in self._goto[node].items():
+                queue.append(child)
+                fallback = self._fail[node]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                target = self._goto[fallback].get(char, 0)
+                self._fail[child] = target if target != child else 0
+                self._output[child] += self._output[self._fail[child]]
+    
+    def iter_matches(self, text: str) -> Iterator[Tuple[int, str]]:
+        """Yield (start, keyword) for every keyword occurrence in text"""
+        goto, fail, output = self._goto, self._fail, self._output
+        node = 0
+        for index, char in enumerate(text):
+            while True:
+                child = goto[node].get(char)
+                if child is not None:
+                    node = child
+                    break
+                if not node:
+                    break
+                node = fail[node]
+            if output[node]:
+                for keyword in output[node]:
+                    yield index - len(keyword) + 1, keyword
+
+class PatternMatcher:
+    """
+    Prebuilt multi-pattern matcher
+    
+    Literal phrases and the literal prefixes ("anchors") of regex patterns
+    share one Aho-Corasick automaton, so a single pass over the text finds
+    every candidate; regex patterns are then confirmed only at their anchor
+    positions. Regexes without a literal anchor fall back to a plain scan.
+    Callers normalise case themselves (the detectors and policies match
+    lower-cased text against lower-case patterns).
+    """
+    
+    def __init__(self, patterns: Iterable[Tuple], regex: bool = False):
+        """
+        Args:
+            patterns: (label, pattern) or (label, pattern, is_regex) tuples in priority order
+            regex: Whether two-element patterns are regexes (otherwise literals)
+        """
+        # (label, pattern, compiled-or-None), in priority order
+        self.patterns: List[Tuple[Any, str, Optional[re.Pattern]]] = []
+        self.anchored: Dict[str, List[int]] = {}
+        self.unanchored: List[int] = []
+        
+        for label, pattern, *flag in patterns:
+            is_regex = flag[0] if flag else regex
+            compiled = re.compile(pattern) if is_regex else None
+            anchor = literal_anchor(pattern) if is_regex else pattern
+            if compiled is not None and anchor == pattern:
+                # A regex that is exactly its anchor needs no confirmation
+                compiled = None
+            priority = len(self.patterns)
+            self.patterns.append((label, pattern, compiled))
+            if anchor:
+                self.anchored.setdefault(anchor, []).append(priority)
+            else:
+                self.unanchored.append(priority)
+        
+        self.automaton = AhoCorasickAutomaton(self.anchored)
+    
+    def __len__(self) -> int:
+        return len(self.patterns)
+    
+    def find_all(self, text: str) -> List[Dict[str, Any]]:
+        """
+        Every pattern match in text, ordered by pattern priority then position
+        
+        Each match is {"label", "pattern", "priority", "start", "end"}.
+        """
+        found = []
+        for start, anchor in self.automaton.iter_matches(text):
+            for priority in self.anchored[anchor]:
+                label, pattern, compiled = self.patterns[priority]
+                if compiled is None:
+                    found.append((priority, start, start + len(anchor)))
+                    continue
+                match = compiled.match(text, start)
+                if match:
+                    found.append((priority, start, match.end()))
+        
+        for priority in self.unanchored:
+            for match in self.patterns[priority][2].finditer(text):
+                found.append((priority, match.start(), match.end()))
+        
+        found.sort()
+        return [
+            {
+                "label": self.patterns[priority][0],
+                "pattern": self.patterns[priority][1],
+                "priority": priority,
+                "start": start,
+                "end": end
+            }
+            for priority, start, end in found
+        ]
+    
+    def find_all_batch(self, texts: Iterable[str]) -> List[List[Dict[str, Any]]]:
+        """find_all over many texts with the same prebuilt automaton"""
+        return [self.find_all(text) for text in texts]
@@ -6,13 +6,19 @@ Extensibility system for custom modules
 
 import asyncio
 import json
+import os
+import tempfile
+import time
 import yaml
-from typing import Dict, List, Optional, Any
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Any, Tuple
 from enum import Enum
 from abc import ABC, abstractmethod
 from pathlib import Path
 from datetime import datetime
 
+from kai_metrics import LatencyHistogram
+
 class PluginType(Enum):
     PARADOX_MODULE = "paradox_module"
     SEED_GENERATOR = "seed_generator"
@@ -260,16 +266,236 @@ class GuardRailExtensionPlugin(BasePlugin):
             "reason": "Custom safety check passed"
         }
 
+# Plugin class for each plugin type; extend with register_plugin_class
+PLUGIN_CLASSES: Dict[PluginType, type] = {
+    PluginType.PARADOX_MODULE: ParadoxModulePlugin,
+    PluginType.SEED_GENERATOR: SeedGeneratorPlugin,
+    PluginType.GUARD_RAIL_EXTENSION: GuardRailExtensionPlugin
+}
+
+def register_plugin_class(plugin_type: PluginType, plugin_class: type):
+    """Register the BasePlugin subclass instantiated for a plugin type"""
+    PLUGIN_CLASSES[plugin_type] = plugin_class
+
+@dataclass
+class PluginManifest:
+    """Parsed config.yaml of one plugin directory"""
+    name: str
+    config_path: str
+    mtime_ns: int
+    size: int
+    config: Dict[str, Any]
+    
+    @property
+    def plugin_type(self) -> PluginType:
+        return PluginType(self.config.get("plugin_type", "paradox_module"))
+    
+    @property
+    def version(self) -> str:
+        return self.config.get("version", "1.0.0")
+
+class PluginRegistry:
+    """
+    Discovery of plugin manifests under a plugin directory
+    
+    One scandir pass finds every plugin directory; a config.yaml is only
+    parsed when its mtime or size differs from the cached copy. Parsed
+    manifests are persisted in a JSON cache file so restarts skip YAML
+    parsing entirely for unchanged plugins.
+    """
+    
+    CACHE_FILE = ".plugin_manifest_cache.json"
+    
+    def __init__(self, plugin_directory: Path, use_cache_file: bool = True):
+        self.plugin_directory = Path(plugin_directory)
+        self.cache_path = self.plugin_directory / self.CACHE_FILE if use_cache_file else None
+        self.manifests: Dict[str, PluginManifest] = {}
+        self._cache_loaded = False
+    
+    def _load_cache(self):
+        self._cache_loaded = True
+        if self.cache_path is None or not self.cache_path.exists():
+            return
+        try:
+            with open(self.cache_path, 'r') as f:
+                cached = json.load(f)
+            for name, entry in cached.items():
+                self.manifests[name] = PluginManifest(name=name, **entry)
+        except Exception as e:
+            print(f"Ignoring unreadable plugin manifest cache {self.cache_path}: {e}")
+            self.manifests = {}
+    
+    def _save_cache(self):
+        if self.cache_path is None:
+            return
+        entries = {
+            name: {
+                "config_path": manifest.config_path,
+                "mtime_ns": manifest.mtime_ns,
+                "size": manifest.size,
+                "config": manifest.config
+            }
+            for name, manifest in self.manifests.items()
+        }
+        try:
+            fd, temp_path = tempfile.mkstemp(dir=str(self.plugin_directory), suffix=".tmp")
+            with os.fdopen(fd, 'w') as f:
+                json.dump(entries, f, default=str)
+            os.replace(temp_path, self.cache_path)
+        except Exception as e:
+            print(f"Failed to write plugin manifest cache {self.cache_path}: {e}")
+    
+    def _read_manifest(self, name: str, config_path: str, stat: os.stat_result) -> Optional[PluginManifest]:
+        cached = self.manifests.get(name)
+        if cached is not None and (cached.mtime_ns, cached.size) == (stat.st_mtime_ns, stat.st_size):
+            return cached
+        try:
+            with open(config_path, 'r') as f:
+                config = yaml.safe_load(f) or {}
+            # Reject unknown plugin types at discovery time
+            PluginType(config.get("plugin_type", "paradox_module"))
+            return PluginManifest(name, config_path, stat.st_mtime_ns, stat.st_size, config)
+        except Exception as e:
+            print(f"Failed to read plugin config {config_path}: {e}")
+            return None
+    
+    def scan(self) -> Tuple[List[str], List[str], List[str]]:
+        """
+        Rescan the plugin directory
+        
+        Returns:
+            (added, changed, removed) plugin names since the previous scan
+        """
+        if not self._cache_loaded:
+            self._load_cache()
+        previous = dict(self.manifests)
+        current: Dict[str, PluginManifest] = {}
+        
+        if self.plugin_directory.exists():
+            with os.scandir(self.plugin_directory) as entries:
+                for entry in entries:
+                    if entry.name.startswith(".") or not entry.is_dir():
+                        continue
+                    config_path = os.path.join(entry.path, "config.yaml")
+                    try:
+                        stat = os.stat(config_path)
+                    except OSError:
+                        continue
+                    manifest = self._read_manifest(entry.name, config_path, stat)
+                    if manifest is not None:
+                        current[entry.name] = manifest
+        
+        added = [name for name in current if name not in previous]
+        changed = [name for name in current if name in previous and current[name] is not previous[name]]
+        removed = [name for name in previous if name not in current]
+        
+        self.manifests = current
+        if added or changed or removed:
+            self._save_cache()
+        return added, changed, removed
+    
+    def refresh(self, name: str) -> Optional[PluginManifest]:
+        """Re-stat (and if needed re-parse) a single plugin's manifest"""
+        if not self._cache_loaded:
+            self._load_cache()
+        config_path = str(self.plugin_directory / name / "config.yaml")
+        try:
+            stat = os.stat(config_path)
+        except OSError:
+            if self.manifests.pop(name, None) is not None:
+                self._save_cache()
+            return None
+        manifest = self._read_manifest(name, config_path, stat)
+        if manifest is None:
+            return None
+        if self.manifests.get(name) is not manifest:
+            self.manifests[name] = manifest
+            self._save_cache()
+        return manifest
+
 class PluginManager:
     """
     Plugin management system
+    
+    Plugins are discovered through a PluginRegistry. load_all registers
+    them lazily by default: a plugin is instantiated and initialized on its
+    first execute_plugin call, and eager loading initializes every plugin
+    concurrently. A lazy plugin that fails to initialize is set aside and
+    reported as failed, not retried, until its config.yaml changes. start_watching polls the plugin directory and hot-reloads
+    plugins whose config.yaml changed.
+    
+    run_pipeline dispatches one request to every plugin of a type at once,
+    bounded by max_concurrency and a per-plugin timeout budget, and keeps a
+    latency histogram per plugin.
     """
     
-    def __init__(self, mythgraph):
+    def __init__(self, mythgraph, plugin_directory: str = "plugins",
+                 max_concurrency: int = 8, plugin_timeout_ms: Optional[float] = 1000.0):
         self.plugins: Dict[str, BasePlugin] = {}
         self.mythgraph = mythgraph
-        self.plugin_directory = Path("plugins")
+        self.plugin_directory = Path(plugin_directory)
         self.plugin_directory.mkdir(exist_ok=True)
+        self.registry = PluginRegistry(self.plugin_directory)
+        
+        # Discovered but not yet instantiated (lazy) plugins
+        self.pending: Dict[str, PluginManifest] = {}
+        # Lazy plugins whose initialization failed (retried after a config change)
+        self.failed: Dict[str, PluginManifest] = {}
+        self._activations: Dict[str, asyncio.Task] = {}
+        self._watch_task: Optional[asyncio.Task] = None
+        
+        self.max_concurrency = max_concurrency
+        self.plugin_timeout_ms = plugin_timeout_ms
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self.latency: Dict[str, LatencyHistogram] = {}
+        self.call_stats: Dict[str, Dict[str, int]] = {}
+    
+    def discover(self) -> List[str]:
+        """Scan the plugin directory; returns every discovered plugin name"""
+        self.registry.scan()
+        return list(self.registry.manifests)
+    
+    async def load_all(self, lazy: bool = True) -> int:
+        """
+        Discover every plugin and register it
+        
+        With lazy=True plugins are only instantiated on first use; otherwise
+        all of them are initialized concurrently. Returns the number of
+        plugins registered or loaded.
+        """
+        names = [name for name in self.discover() if name not in self.plugins]
+        if lazy:
+            for name in names:
+                self.failed.pop(name, None)
+                self.pending[name] = self.registry.manifests[name]
+            return len(names)
+        
+        results = await asyncio.gather(*(self.load_plugin(name) for name in names))
+        return sum(1 for loaded in results if loaded)
+    
+    def _create_plugin(self, manifest: PluginManifest) -> Optional[BasePlugin]:
+        """Instantiate a plugin from its manifest (not yet initialized)"""
+        plugin_type = manifest.plugin_type
+        plugin_class = PLUGIN_CLASSES.get(plugin_type)
+        if plugin_class is None:
+            print(f"Unsupported plugin type: {plugin_type}")
+            return None
+        
+        plugin = plugin_class(manifest.name, manifest.version)
+        # Set MythGraph integration and the already-parsed configuration
+        plugin.mythgraph = self.mythgraph
+        plugin.config = dict(manifest.config)
+        return plugin
+    
+    async def _start_plugin(self, manifest: PluginManifest) -> Optional[BasePlugin]:
+        """Instantiate and initialize a plugin; None on failure"""
+        plugin = self._create_plugin(manifest)
+        if plugin is None:
+            return None
+        if not await plugin.initialize():
+            print(f"❌ Failed to initialize plugin: {manifest.name}")
+            return None
+        return plugin
     
     async def load_plugin(self, plugin_name: str) -> bool:
         """Load plugin by name"""
@@ -280,50 +506,53 @@ class PluginManager:
                 print(f"Plugin directory not found: {plugin_path}")
                 return False
             
-            # Load plugin configuration
-            config_path = plugin_path / "config.yaml"
-            if not config_path.exists():
-                print(f"Plugin config not found: {config_path}")
+            manifest = self.registry.refresh(plugin_name)
+            if manifest is None:
+                print(f"Plugin config not found: {plugin_path / 'config.yaml'}")
                 return False
             
-            # Determine plugin type from config
-            with open(config_path, 'r') as f:
-                config = yaml.safe_load(f)
-            
-            plugin_type_str = config.get("plugin_type", "paradox_module")
-            plugin_type = PluginType(plugin_type_str)
-            
-            # Create plugin instance based on type
-            if plugin_type == PluginType.PARADOX_MODULE:
-                plugin = ParadoxModulePlugin(plugin_name, config.get("version", "1.0.0"))
-            elif plugin_type == PluginType.SEED_GENERATOR:
-                plugin = SeedGeneratorPlugin(plugin_name, config.get("version", "1.0.0"))
-            elif plugin_type == PluginType.GUARD_RAIL_EXTENSION:
-                plugin = GuardRailExtensionPlugin(plugin_name, config.get("version", "1.0.0"))
-            else:
-                print(f"Unsupported plugin type: {plugin_type}")
-                return False
-            
-            # Set MythGraph integration
-            plugin.mythgraph = self.mythgraph
-            
-            # Load configuration
-            if not plugin.load_config(str(config_path)):
+            plugin = await self._start_plugin(manifest)
+            if plugin is None:
                 return False
             
-            # Initialize plugin
-            if await plugin.initialize():
-                self.plugins[plugin_name] = plugin
-                print(f"✅ Loaded plugin: {plugin_name}")
-                return True
-            else:
-                print(f"❌ Failed to initialize plugin: {plugin_name}")
-                return False
+            self.plugins[plugin_name] = plugin
+            self.pending.pop(plugin_name, None)
+            self.failed.pop(plugin_name, None)
+            print(f"✅ Loaded plugin: {plugin_name}")
+            return True
                 
         except Exception as e:
             print(f"Failed to load plugin {plugin_name}: {e}")
             return False
     
+    async def _activate(self, plugin_name: str) -> Optional[BasePlugin]:
+        """
+        Instantiate a lazily registered plugin on first use
+        
+        Activation runs as one task however many calls wait for it, and a
+        caller that gives up (its budget ran out) does not cancel it.
+        """
+        if plugin_name in self.plugins:
+            return self.plugins[plugin_name]
+        if plugin_name not in self.pending:
+            return None
+        task = self._activations.get(plugin_name)
+        if task is None:
+            task = asyncio.ensure_future(self._load_pending(plugin_name))
+            self._activations[plugin_name] = task
+        return await asyncio.shield(task)
+    
+    async def _load_pending(self, plugin_name: str) -> Optional[BasePlugin]:
+        try:
+            if await self.load_plugin(plugin_name):
+                return self.plugins[plugin_name]
+            manifest = self.pending.pop(plugin_name, None)
+            if manifest is not None:
+                self.failed[plugin_name] = manifest
+            return None
+        finally:
+            self._activations.pop(plugin_name, None)
+    
     async def unload_plugin(self, plugin_name: str) -> bool:
         """Unload plugin by name"""
         if plugin_name in self.plugins:
@@ -335,21 +564,113 @@ class PluginManager:
             else:
                 print(f"❌ Failed to unload plugin: {plugin_name}")
                 return False
+        elif self.pending.pop(plugin_name, None) is not None or self.failed.pop(plugin_name, None) is not None:
+            return True
         else:
             print(f"Plugin not found: {plugin_name}")
             return False
     
     async def execute_plugin(self, plugin_name: str, data: Dict) -> Dict:
-        """Execute plugin with data"""
-        if plugin_name in self.plugins:
-            plugin = self.plugins[plugin_name]
-            return await plugin.execute(data)
-        else:
+        """Execute plugin with data (instantiating a lazy plugin first)"""
+        plugin = self.plugins.get(plugin_name)
+        if plugin is None and plugin_name in self.pending:
+            plugin = await self._activate(plugin_name)
+            if plugin is None:
+                return {"error": f"Plugin {plugin_name} failed to load"}
+        if plugin is None and plugin_name in self.failed:
+            return {"error": f"Plugin {plugin_name} failed to load"}
+        if plugin is None:
             return {"error": f"Plugin {plugin_name} not found"}
+        return await plugin.execute(data)
+    
+    async def run_pipeline(self, plugin_type: PluginType, data: Dict,
+                           timeout_ms: Optional[float] = None) -> Dict:
+        """
+        Dispatch data to every plugin of a type concurrently
+        
+        Args:
+            plugin_type: Plugins to run
+            data: Request passed to each plugin's execute()
+            timeout_ms: Budget for each plugin, semaphore wait and lazy
+                        activation included (defaults to plugin_timeout_ms;
+                        None waits forever)
+        
+        Returns:
+            Pipeline result dictionary, keyed in plugin name order
+                - plugin_type: Type dispatched
+                - results: {plugin_name: result} for plugins that finished
+                - errors: {plugin_name: error} for plugins that failed
+                - timed_out: Plugins that exceeded the budget
+                - duration_ms: Wall time of the whole pipeline
+        """
+        if timeout_ms is None:
+            timeout_ms = self.plugin_timeout_ms
+        names = sorted(self.get_plugins_by_type(plugin_type))
+        start_time = time.perf_counter()
+        
+        outcomes = await asyncio.gather(*(self._run_with_budget(name, data, timeout_ms) for name in names))
+        
+        results, errors, timed_out = {}, {}, []
+        for name, (status, value) in zip(names, outcomes):
+            if status == "ok":
+                results[name] = value
+            elif status == "timeout":
+                timed_out.append(name)
+            else:
+                errors[name] = value
+        
+        return {
+            "plugin_type": plugin_type.value,
+            "results": results,
+            "errors": errors,
+            "timed_out": timed_out,
+            "duration_ms": (time.perf_counter() - start_time) * 1000
+        }
+    
+    async def _run_with_budget(self, plugin_name: str, data: Dict,
+                               timeout_ms: Optional[float]) -> Tuple[str, Any]:
+        """("ok", result), ("timeout", None) or ("error", message) for one plugin"""
+        stats = self.call_stats.setdefault(plugin_name, {"calls": 0, "errors": 0, "timeouts": 0})
+        stats["calls"] += 1
+        try:
+            if timeout_ms is None:
+                result = await self._execute_limited(plugin_name, data)
+            else:
+                result = await asyncio.wait_for(self._execute_limited(plugin_name, data), timeout_ms / 1000.0)
+        except asyncio.TimeoutError:
+            stats["timeouts"] += 1
+            return "timeout", None
+        except Exception as e:
+            stats["errors"] += 1
+            return "error", str(e)
+        
+        if isinstance(result, dict) and "error" in result:
+            stats["errors"] += 1
+            return "error", result["error"]
+        return "ok", result
+    
+    async def _execute_limited(self, plugin_name: str, data: Dict) -> Dict:
+        """execute_plugin under the concurrency limit, timing the execution itself"""
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        async with self._semaphore:
+            start_time = time.perf_counter()
+            try:
+                return await self.execute_plugin(plugin_name, data)
+            finally:
+                self.latency.setdefault(plugin_name, LatencyHistogram()).record(
+                    (time.perf_counter() - start_time) * 1000)
+    
+    def get_plugin_metrics(self) -> Dict[str, Dict]:
+        """Per-plugin call counters and latency percentiles from run_pipeline"""
+        return {
+            name: {**stats, "latency": self.latency[name].snapshot() if name in self.latency else None}
+            for name, stats in sorted(self.call_stats.items())
+        }
     
     def list_plugins(self) -> List[Dict]:
-        """List all loaded plugins"""
-        return [
+        """List all loaded plugins, and lazily registered ones as inactive"""
+        plugins = [
             {
                 "name": name,
                 "type": plugin.plugin_type.value,
@@ -358,6 +679,25 @@ class PluginManager:
             }
             for name, plugin in self.plugins.items()
         ]
+        plugins.extend(
+            {
+                "name": name,
+                "type": manifest.plugin_type.value,
+                "version": manifest.version,
+                "status": PluginStatus.INACTIVE.value
+            }
+            for name, manifest in self.pending.items()
+        )
+        plugins.extend(
+            {
+                "name": name,
+                "type": manifest.plugin_type.value,
+                "version": manifest.version,
+                "status": PluginStatus.ERROR.value
+            }
+            for name, manifest in self.failed.items()
+        )
+        return plugins
     
     def get_plugin_info(self, plugin_name: str) -> Optional[Dict]:
         """Get detailed plugin information"""
@@ -370,22 +710,117 @@ class PluginManager:
                 "status": plugin.status.value,
                 "config": plugin.config
             }
+        for registered, status in ((self.pending, PluginStatus.INACTIVE), (self.failed, PluginStatus.ERROR)):
+            if plugin_name in registered:
+                manifest = registered[plugin_name]
+                return {
+                    "name": manifest.name,
+                    "type": manifest.plugin_type.value,
+                    "version": manifest.version,
+                    "status": status.value,
+                    "config": manifest.config
+                }
         return None
     
     async def reload_plugin(self, plugin_name: str) -> bool:
-        """Reload plugin"""
-        # Unload first
-        if await self.unload_plugin(plugin_name):
-            # Load again
-            return await self.load_plugin(plugin_name)
-        return False
+        """
+        Reload plugin from its current config.yaml
+        
+        The replacement is initialized before the old instance is shut down,
+        so the plugin stays available throughout; a failed reload keeps the
+        old instance.
+        """
+        if plugin_name in self.pending or plugin_name in self.failed:
+            # A lazy plugin that failed to initialize gets another chance with the new config
+            self.failed.pop(plugin_name, None)
+            manifest = self.registry.refresh(plugin_name)
+            if manifest is None:
+                self.pending.pop(plugin_name, None)
+                return False
+            self.pending[plugin_name] = manifest
+            return True
+        
+        old_plugin = self.plugins.get(plugin_name)
+        if old_plugin is None:
+            print(f"Plugin not found: {plugin_name}")
+            return False
+        
+        manifest = self.registry.refresh(plugin_name)
+        if manifest is None:
+            return await self.unload_plugin(plugin_name)
+        
+        plugin = await self._start_plugin(manifest)
+        if plugin is None:
+            return False
+        
+        self.plugins[plugin_name] = plugin
+        await old_plugin.shutdown()
+        print(f"🔄 Reloaded plugin: {plugin_name}")
+        return True
+    
+    async def apply_changes(self) -> Dict[str, List[str]]:
+        """Rescan the plugin directory and hot-reload whatever changed"""
+        added, changed, removed = self.registry.scan()
+        
+        for name in added:
+            self.pending[name] = self.registry.manifests[name]
+        await asyncio.gather(*(self.reload_plugin(name) for name in changed
+                               if name in self.plugins or name in self.pending or name in self.failed))
+        for name in removed:
+            await self.unload_plugin(name)
+        
+        return {"added": added, "changed": changed, "removed": removed}
+    
+    def start_watching(self, interval: float = 2.0):
+        """Poll the plugin directory for config changes in the background"""
+        if self._watch_task is not None and not self._watch_task.done():
+            return
+        
+        async def watch():
+            while True:
+                await asyncio.sleep(interval)
+                try:
+                    changes = await self.apply_changes()
+                    if any(changes.values()):
+                        print(f"🔌 Plugin changes applied: {changes}")
+                except Exception as e:
+                    print(f"Plugin watch failed: {e}")
+        
+        self._watch_task = asyncio.ensure_future(watch())
+    
+    async def stop_watching(self):
+        """Stop the background plugin watcher"""
+        if self._watch_task is not None:
+            self._watch_task.cancel()
+            try:
+                await self._watch_task
+            except asyncio.CancelledError:
+                pass
+            self._watch_task = None
+    
+    async def shutdown(self):
+        """Stop watching and shut every loaded plugin down concurrently"""
+        await self.stop_watching()
+        for task in list(self._activations.values()):
+            task.cancel()
+        plugins = list(self.plugins.values())
+        await asyncio.gather(*(plugin.shutdown() for plugin in plugins), return_exceptions=True)
+        self.plugins.clear()
+        self.pending.clear()
+        self.failed.clear()
     
     def get_plugins_by_type(self, plugin_type: PluginType) -> List[str]:
-        """Get plugin names by type"""
-        return [
+        """Get plugin names by type (lazily registered and failed plugins included)"""
+        names = [
             name for name, plugin in self.plugins.items()
             if plugin.plugin_type == plugin_type
         ]
+        names.extend(
+            name for registered in (self.pending, self.failed)
+            for name, manifest in registered.items()
+            if manifest.plugin_type == plugin_type
+        )
+        return names
 
 # Example usage
 async def test_plugin_framework():
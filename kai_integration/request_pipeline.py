@@ -0,0 +1,348 @@
+#!/usr/bin/env python3
+"""
+Kai Core V8+ Request Pipeline
+Bounded, prioritised serving front end for KaiCoreEngine with adaptive concurrency
+"""
+
+import asyncio
+import random
+import time
+from collections import deque
+from typing import Dict, List, Any, Optional, Callable, Awaitable
+
+from kai_metrics import LatencyHistogram
+
+# Lanes in dequeue order; later lanes are shed first under overload
+DEFAULT_LANES = ("incident", "interactive", "bulk")
+
+class AIMDLimiter:
+    """
+    Additive-increase / multiplicative-decrease concurrency limit
+
+    Every request served within target_latency_ms grows the limit by about one
+    per limit's worth of requests; a slower one cuts it by backoff, at most
+    once per observed latency so a single burst does not collapse the limit.
+    """
+
+    def __init__(self, initial: int = 16, minimum: int = 1, maximum: int = 64,
+                 target_latency_ms: float = 50.0, backoff: float = 0.9):
+        self.minimum = minimum
+        self.maximum = maximum
+        self.target_latency_ms = target_latency_ms
+        self.backoff = backoff
+        self.limit = float(min(max(initial, minimum), maximum))
+        self.last_decrease = 0.0
+        self.increases = 0
+        self.decreases = 0
+
+    def on_sample(self, latency_ms: float):
+        """Adjust the limit from one request's service latency"""
+        now = time.monotonic()
+        if latency_ms <= self.target_latency_ms:
+            self.limit = min(self.maximum, self.limit + 1.0 / self.limit)
+            self.increases += 1
+        elif (now - self.last_decrease) * 1000 >= latency_ms:
+            self.limit = max(self.minimum, self.limit * self.backoff)
+            self.last_decrease = now
+            self.decreases += 1
+
+    @property
+    def current(self) -> int:
+        return int(self.limit)
+
+class ShardStats:
+    """Counters and latency histograms owned by a single worker, merged on read"""
+
+    def __init__(self):
+        self.completed = 0
+        self.failed = 0
+        self.queue_wait = LatencyHistogram()
+        self.service = LatencyHistogram()
+
+class RequestPipeline:
+    """
+    Serving front end: bounded lane queues drained by N worker coroutines
+
+    At most limiter.current requests are in service at once. When the queue
+    is full an incoming request displaces the newest request of a lower lane,
+    or is refused; requests that waited longer than max_queue_delay_ms are
+    shed at dequeue instead of being served late.
+
+    Lanes are decided server-side: by the caller's lane argument, else by
+    lane_selector(request_data), else default_lane. Fields of the request
+    payload never choose a lane.
+    """
+
+    def __init__(self, handler: Callable[[Dict], Awaitable[Dict]], workers: int = 64,
+                 queue_size: int = 1024, lanes=DEFAULT_LANES, default_lane: str = "interactive",
+                 max_queue_delay_ms: float = 1000.0, limiter: Optional[AIMDLimiter] = None,
+                 lane_selector: Optional[Callable[[Dict], Optional[str]]] = None):
+        if default_lane not in lanes:
+            raise ValueError(f"Unknown default lane: {default_lane}")
+
+        self.handler = handler
+        self.workers = workers
+        self.queue_size = queue_size
+        self.lanes = tuple(lanes)
+        self.default_lane = default_lane
+        self.max_queue_delay_ms = max_queue_delay_ms
+        self.limiter = limiter or AIMDLimiter(maximum=workers)
+        self.lane_selector = lane_selector
+
+        self.queues: Dict[str, deque] = {lane: deque() for lane in self.lanes}
+        self.queued = 0
+        self.in_flight = 0
+        self.shards = [ShardStats() for _ in range(workers)]
+        self.admitted = {lane: 0 for lane in self.lanes}
+        self.shed = {"queue_full": 0, "displaced": 0, "queue_timeout": 0, "shutdown": 0}
+
+        self._condition: Optional[asyncio.Condition] = None
+        self._tasks: List[asyncio.Task] = []
+        self._closing = False
+
+    @property
+    def running(self) -> bool:
+        return bool(self._tasks)
+
+    def start(self):
+        """Spawn the worker coroutines on the running event loop"""
+        if self._tasks:
+            return
+        self._closing = False
+        self._condition = asyncio.Condition()
+        self._tasks = [asyncio.create_task(self._worker(self.shards[shard])) for shard in range(self.workers)]
+
+    async def stop(self, drain: bool = True):
+        """Stop accepting work; serve (or shed) what is queued and wait for workers"""
+        if not self._tasks:
+            return
+        async with self._condition:
+            self._closing = True
+            if not drain:
+                for lane in self.lanes:
+                    while self.queues[lane]:
+                        self._shed(self.queues[lane].pop(), "shutdown")
+            self._condition.notify_all()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    @staticmethod
+    def _overloaded(reason: str, started: float) -> Dict:
+        return {
+            "success": False,
+            "overloaded": True,
+            "reason": reason,
+            "processing_time_ms": (time.monotonic() - started) * 1000
+        }
+
+    def _shed(self, item, reason: str):
+        future, _, enqueued_at, _ = item
+        self.queued -= 1
+        self.shed[reason] += 1
+        if not future.done():
+            future.set_result(self._overloaded(f"Shed: {reason.replace('_', ' ')}", enqueued_at))
+
+    async def submit(self, request_data: Dict, lane: Optional[str] = None) -> Dict:
+        """Queue a request and wait for its response (or an overload response)"""
+        started = time.monotonic()
+        if lane is None and self.lane_selector is not None:
+            lane = self.lane_selector(request_data)
+        lane = lane or self.default_lane
+        if lane not in self.queues:
+            lane = self.default_lane
+        if not self._tasks or self._closing:
+            return self._overloaded("Pipeline not running", started)
+
+        future = asyncio.get_running_loop().create_future()
+        async with self._condition:
+            if self.queued >= self.queue_size:
+                # Make room by dropping the newest request of the lowest lane below ours
+                rank = self.lanes.index(lane)
+                victim_lane = next((other for other in reversed(self.lanes[rank + 1:]) if self.queues[other]), None)
+                if victim_lane is None:
+                    self.shed["queue_full"] += 1
+                    return self._overloaded("Shed: queue full", started)
+                self._shed(self.queues[victim_lane].pop(), "displaced")
+
+            self.queues[lane].append((future, request_data, started, lane))
+            self.queued += 1
+            self.admitted[lane] += 1
+            self._condition.notify()
+        return await future
+
+    def _next_item(self):
+        """Pop the oldest request of the highest non-empty lane, shedding stale ones"""
+        deadline = time.monotonic() - self.max_queue_delay_ms / 1000.0
+        for lane in self.lanes:
+            queue = self.queues[lane]
+            while queue:
+                item = queue.popleft()
+                if self.max_queue_delay_ms and item[2] < deadline:
+                    self._shed(item, "queue_timeout")
+                    continue
+                self.queued -= 1
+                return item
+        return None
+
+    async def _worker(self, shard: ShardStats):
+        condition = self._condition
+        while True:
+            async with condition:
+                await condition.wait_for(
+                    lambda: (self._closing and not self.queued)
+                    or (self.queued and self.in_flight < self.limiter.current)
+                )
+                if not self.queued:
+                    return
+                item = self._next_item()
+                if item is None:
+                    continue
+                self.in_flight += 1
+
+            future, request_data, enqueued_at, _ = item
+            dequeued_at = time.monotonic()
+            shard.queue_wait.record((dequeued_at - enqueued_at) * 1000)
+            try:
+                response = await self.handler(request_data)
+                shard.completed += 1
+            except Exception as e:
+                response = {"success": False, "error": str(e)}
+                shard.failed += 1
+
+            service_ms = (time.monotonic() - dequeued_at) * 1000
+            shard.service.record(service_ms)
+            self.limiter.on_sample(service_ms)
+            if not future.done():
+                future.set_result(response)
+
+            async with condition:
+                self.in_flight -= 1
+                # The limit may have grown, so more than one worker can proceed
+                condition.notify_all()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Queue depth, concurrency limit, shedding counts and merged latency percentiles"""
+        queue_wait = LatencyHistogram()
+        service = LatencyHistogram()
+        completed = failed = 0
+        for shard in self.shards:
+            queue_wait.merge(shard.queue_wait)
+            service.merge(shard.service)
+            completed += shard.completed
+            failed += shard.failed
+        return {
+            "running": self.running,
+            "workers": self.workers,
+            "queued": self.queued,
+            "queued_by_lane": {lane: len(queue) for lane, queue in self.queues.items()},
+            "in_flight": self.in_flight,
+            "concurrency_limit": self.limiter.current,
+            "admitted": dict(self.admitted),
+            "completed": completed,
+            "failed": failed,
+            "shed": dict(self.shed),
+            "queue_wait": queue_wait.snapshot(),
+            "service": service.snapshot()
+        }
+
+async def generate_load(submit: Callable[[Dict], Awaitable[Dict]], make_request: Callable[[int], Dict],
+                        qps: float, duration_s: float) -> Dict[str, Any]:
+    """
+    Open-loop load generator: Poisson arrivals at the offered rate
+
+    Arrivals do not wait for earlier responses, so latency reflects queueing
+    under the offered load rather than the client's own pacing.
+    """
+    latency = LatencyHistogram()
+    outcomes = {"ok": 0, "shed": 0, "error": 0}
+
+    async def one(index: int):
+        started = time.monotonic()
+        response = await submit(make_request(index))
+        if response.get("overloaded"):
+            outcomes["shed"] += 1
+            return
+        latency.record((time.monotonic() - started) * 1000)
+        outcomes["ok" if response.get("success") or response.get("blocked") else "error"] += 1
+
+    tasks = []
+    started = time.monotonic()
+    next_arrival = started
+    index = 0
+    while next_arrival - started < duration_s:
+        delay = next_arrival - time.monotonic()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        tasks.append(asyncio.create_task(one(index)))
+        index += 1
+        next_arrival += random.expovariate(qps)
+    await asyncio.gather(*tasks)
+    elapsed = time.monotonic() - started
+
+    snapshot = latency.snapshot()
+    return {
+        "offered_qps": qps,
+        "sent": index,
+        "achieved_qps": outcomes["ok"] / elapsed if elapsed else 0.0,
+        "ok": outcomes["ok"],
+        "shed": outcomes["shed"],
+        "errors": outcomes["error"],
+        "p50_ms": snapshot["p50_ms"],
+        "p95_ms": snapshot["p95_ms"],
+        "p99_ms": snapshot["p99_ms"]
+    }
+
+async def benchmark_pipeline(qps_levels: List[float], duration_s: float = 5.0,
+                             config_path: str = "kai-config.yaml") -> List[Dict[str, Any]]:
+    """Drive a real KaiCoreEngine through its pipeline at each offered QPS"""
+    from kai_core_engine import KaiCoreEngine
+
+    engine = KaiCoreEngine(config_path)
+    if not await engine.initialize():
+        raise RuntimeError("Engine failed to initialize")
+
+    contents = [
+        "What is the weather today?",
+        "Summarise this design document for me",
+        "This statement is false",
+        "Explain the circular dependency in this module",
+        "Help me write a unit test"
+    ]
+
+    def make_request(index: int) -> Dict:
+        return {
+            "content": f"{contents[index % len(contents)]} #{index}",
+            "user_id": f"load_user_{index % 50}",
+            "context": {"session_id": str(index % 200)}
+        }
+
+    rows = []
+    try:
+        for qps in qps_levels:
+            row = await generate_load(engine.submit_request, make_request, qps, duration_s)
+            row["concurrency_limit"] = engine.request_pipeline.limiter.current
+            rows.append(row)
+    finally:
+        await engine.shutdown()
+    return rows
+
+def main():
+    import argparse
+    import logging
+
+    parser = argparse.ArgumentParser(description="Kai Core request pipeline load benchmark")
+    parser.add_argument("--qps", default="100,500,1000,2000,4000", help="Comma-separated offered QPS levels")
+    parser.add_argument("--duration", type=float, default=5.0, help="Seconds of load per level")
+    parser.add_argument("--config", default="kai-config.yaml", help="Engine configuration file")
+    args = parser.parse_args()
+
+    logging.disable(logging.INFO)
+    rows = asyncio.run(benchmark_pipeline([float(q) for q in args.qps.split(",")], args.duration, args.config))
+
+    print(f"{'offered':>8} {'achieved':>9} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'shed':>6} {'limit':>6}")
+    for row in rows:
+        print(f"{row['offered_qps']:>8.0f} {row['achieved_qps']:>9.0f} {row['p50_ms']:>8.2f} "
+              f"{row['p95_ms']:>8.2f} {row['p99_ms']:>8.2f} {row['shed']:>6} {row['concurrency_limit']:>6}")
+
+if __name__ == "__main__":
+    main()
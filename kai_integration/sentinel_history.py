@@ -0,0 +1,288 @@
+#!/usr/bin/env python3
+"""
+🏛️ KAI SENTINEL MESH - CHECK HISTORY STORE
+Compact SQLite-backed history of Sentinel repository checks.
+
+Each check is one narrow row; stdout/stderr and alert lists are truncated
+and stored once per distinct content hash. Per-repo hourly and daily rollups
+are maintained as checks are recorded, so dashboards read a few pre-aggregated
+rows instead of scanning raw history, and retention prunes each tier on its
+own schedule.
+"""
+
+import json
+import time
+import sqlite3
+import hashlib
+import logging
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Any, Optional
+
+STATUSES = ("HEALTHY", "WARNING", "CRITICAL", "ERROR", "MISSING")
+
+PERIODS = {"hour": 3600, "day": 86400}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS blobs (
+    hash TEXT PRIMARY KEY,
+    content TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS checks (
+    id INTEGER PRIMARY KEY,
+    repo TEXT NOT NULL,
+    ts REAL NOT NULL,
+    status TEXT NOT NULL,
+    health_rc INTEGER,
+    drill_rc INTEGER,
+    skipped INTEGER NOT NULL DEFAULT 0,
+    alert_count INTEGER NOT NULL DEFAULT 0,
+    evidence_bundles INTEGER NOT NULL DEFAULT 0,
+    alerts TEXT,
+    health_stdout TEXT,
+    health_stderr TEXT,
+    drill_stdout TEXT,
+    drill_stderr TEXT
+);
+CREATE INDEX IF NOT EXISTS checks_repo_ts ON checks (repo, ts);
+CREATE INDEX IF NOT EXISTS checks_ts ON checks (ts);
+CREATE TABLE IF NOT EXISTS rollups (
+    repo TEXT NOT NULL,
+    period TEXT NOT NULL,
+    bucket INTEGER NOT NULL,
+    checks INTEGER NOT NULL DEFAULT 0,
+    healthy INTEGER NOT NULL DEFAULT 0,
+    warning INTEGER NOT NULL DEFAULT 0,
+    critical INTEGER NOT NULL DEFAULT 0,
+    error INTEGER NOT NULL DEFAULT 0,
+    missing INTEGER NOT NULL DEFAULT 0,
+    skipped INTEGER NOT NULL DEFAULT 0,
+    alerts INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (repo, period, bucket)
+) WITHOUT ROWID;
+"""
+
+ROLLUP_UPSERT = """
+INSERT INTO rollups (repo, period, bucket, checks, healthy, warning, critical, error, missing, skipped, alerts)
+VALUES (?, ?, ?, 1, ?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT (repo, period, bucket) DO UPDATE SET
+    checks = checks + 1,
+    healthy = healthy + excluded.healthy,
+    warning = warning + excluded.warning,
+    critical = critical + excluded.critical,
+    error = error + excluded.error,
+    missing = missing + excluded.missing,
+    skipped = skipped + excluded.skipped,
+    alerts = alerts + excluded.alerts
+"""
+
+def truncate_output(text: Optional[str], max_chars: int) -> Optional[str]:
+    """Keep the head and tail of long command output, where the useful lines usually are."""
+    if not text or len(text) <= max_chars:
+        return text or None
+    half = max_chars // 2
+    return f"{text[:half]}\n... [{len(text) - 2 * half} chars truncated] ...\n{text[-half:]}"
+
+def bucket_ceiling(ts: float, seconds: int) -> int:
+    """Start of the first whole rollup bucket at or after ts."""
+    return int(-(-ts // seconds) * seconds)
+
+def parse_timestamp(value: Any) -> float:
+    """Epoch seconds from a result timestamp (ISO string or number)."""
+    if isinstance(value, (int, float)):
+        return float(value)
+    if isinstance(value, str):
+        try:
+            return datetime.fromisoformat(value).timestamp()
+        except ValueError:
+            pass
+    return time.time()
+
+class CheckHistoryStore:
+    """Append-only check log with deduplicated outputs, rollups and retention."""
+
+    def __init__(self, db_path: str = "sentinel_history.db", max_output_chars: int = 4096,
+                 raw_retention_days: float = 7, hourly_retention_days: float = 90,
+                 daily_retention_days: float = 730, retention_interval: float = 3600):
+        self.db_path = Path(db_path)
+        self.max_output_chars = max_output_chars
+        self.retention_days = {
+            "raw": raw_retention_days,
+            "hour": hourly_retention_days,
+            "day": daily_retention_days
+        }
+        self.retention_interval = retention_interval
+        self.last_retention = 0.0
+        self._lock = threading.Lock()
+
+        self.conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+        # Must precede table creation to take effect on a new database
+        self.conn.execute("PRAGMA auto_vacuum=INCREMENTAL")
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(SCHEMA)
+        self.conn.commit()
+
+    def _blob(self, content: Optional[str]) -> Optional[str]:
+        """Store content once and return its hash reference."""
+        if not content:
+            return None
+        digest = hashlib.blake2b(content.encode("utf-8", "replace"), digest_size=16).hexdigest()
+        self.conn.execute("INSERT OR IGNORE INTO blobs (hash, content) VALUES (?, ?)", (digest, content))
+        return digest
+
+    def _output(self, check: Dict[str, Any], stream: str) -> Optional[str]:
+        return self._blob(truncate_output(check.get(stream), self.max_output_chars))
+
+    def record(self, result: Dict[str, Any]):
+        """Append one check result and fold it into the hourly and daily rollups."""
+        ts = parse_timestamp(result.get("timestamp"))
+        status = result.get("status", "ERROR")
+        health_check = result.get("health_check") or {}
+        fire_drill = result.get("fire_drill") or {}
+        alerts = result.get("alerts") or []
+        skipped = int(bool(health_check.get("skipped") or fire_drill.get("skipped")))
+
+        with self._lock:
+            self.conn.execute(
+                """INSERT INTO checks (repo, ts, status, health_rc, drill_rc, skipped, alert_count,
+                                       evidence_bundles, alerts, health_stdout, health_stderr,
+                                       drill_stdout, drill_stderr)
+                   VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)""",
+                (
+                    result["repo_name"], ts, status,
+                    health_check.get("return_code"), fire_drill.get("return_code"),
+                    skipped, len(alerts), len(result.get("evidence_bundles") or []),
+                    self._blob(json.dumps(alerts)) if alerts else None,
+                    self._output(health_check, "stdout"), self._output(health_check, "stderr"),
+                    self._output(fire_drill, "stdout"), self._output(fire_drill, "stderr")
+                )
+            )
+            flags = [int(status == name) for name in STATUSES]
+            for period, seconds in PERIODS.items():
+                bucket = int(ts // seconds * seconds)
+                self.conn.execute(ROLLUP_UPSERT, (result["repo_name"], period, bucket, *flags, skipped, len(alerts)))
+            self.conn.commit()
+
+        if time.time() - self.last_retention >= self.retention_interval:
+            self.apply_retention()
+
+    def apply_retention(self, now: Optional[float] = None) -> Dict[str, int]:
+        """Drop raw checks and rollups past their retention, then unreferenced outputs."""
+        now = now or time.time()
+        deleted = {}
+        with self._lock:
+            cutoff = now - self.retention_days["raw"] * 86400
+            deleted["checks"] = self.conn.execute("DELETE FROM checks WHERE ts < ?", (cutoff,)).rowcount
+            for period in PERIODS:
+                cutoff = now - self.retention_days[period] * 86400
+                deleted[period] = self.conn.execute(
+                    "DELETE FROM rollups WHERE period = ? AND bucket < ?", (period, cutoff)
+                ).rowcount
+            if deleted["checks"]:
+                deleted["blobs"] = self.conn.execute(
+                    """DELETE FROM blobs WHERE hash NOT IN (
+                           SELECT alerts FROM checks WHERE alerts IS NOT NULL
+                           UNION SELECT health_stdout FROM checks WHERE health_stdout IS NOT NULL
+                           UNION SELECT health_stderr FROM checks WHERE health_stderr IS NOT NULL
+                           UNION SELECT drill_stdout FROM checks WHERE drill_stdout IS NOT NULL
+                           UNION SELECT drill_stderr FROM checks WHERE drill_stderr IS NOT NULL)"""
+                ).rowcount
+            self.conn.commit()
+            if any(deleted.values()):
+                # Return freed pages to the filesystem so the file stays small
+                self.conn.execute("PRAGMA incremental_vacuum")
+                self.conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+            self.last_retention = now
+        return deleted
+
+    def recent_checks(self, repo: str, limit: int = 20, include_output: bool = False) -> List[Dict[str, Any]]:
+        """Latest raw checks for a repository, newest first."""
+        columns = "id, repo, ts, status, health_rc, drill_rc, skipped, alert_count, evidence_bundles, alerts"
+        if include_output:
+            columns += ", health_stdout, health_stderr, drill_stdout, drill_stderr"
+        with self._lock:
+            cursor = self.conn.execute(
+                f"SELECT {columns} FROM checks WHERE repo = ? ORDER BY ts DESC LIMIT ?", (repo, limit)
+            )
+            names = [description[0] for description in cursor.description]
+            rows = [dict(zip(names, row)) for row in cursor.fetchall()]
+            for row in rows:
+                for key in ("alerts", "health_stdout", "health_stderr", "drill_stdout", "drill_stderr"):
+                    if row.get(key):
+                        found = self.conn.execute("SELECT content FROM blobs WHERE hash = ?", (row[key],)).fetchone()
+                        row[key] = found[0] if found else None
+                if row.get("alerts"):
+                    row["alerts"] = json.loads(row["alerts"])
+        return rows
+
+    def trend(self, repo: Optional[str] = None, period: str = "hour",
+              since: Optional[float] = None) -> List[Dict[str, Any]]:
+        """
+        Rollup rows (oldest first) for one repository, or all repositories when repo is None.
+
+        Only buckets that start at or after since are returned; the bucket straddling
+        since would stretch the window by up to one period.
+        """
+        if period not in PERIODS:
+            raise ValueError(f"Unknown rollup period: {period}")
+        since = since if since is not None else time.time() - 86400
+        query = ("SELECT repo, bucket, checks, healthy, warning, critical, error, missing, skipped, alerts "
+                 "FROM rollups WHERE period = ? AND bucket >= ?")
+        params: List[Any] = [period, bucket_ceiling(since, PERIODS[period])]
+        if repo is not None:
+            query += " AND repo = ?"
+            params.append(repo)
+        query += " ORDER BY repo, bucket"
+        with self._lock:
+            cursor = self.conn.execute(query, params)
+            names = [description[0] for description in cursor.description]
+            rows = [dict(zip(names, row)) for row in cursor.fetchall()]
+        for row in rows:
+            row["health_ratio"] = row["healthy"] / row["checks"] if row["checks"] else 0.0
+        return rows
+
+    def summary(self, repo: str, since: Optional[float] = None) -> Dict[str, Any]:
+        """
+        Totals since a point in time (default: last 24 hours).
+
+        Whole hours come from the hourly rollups and the partial hour after since from
+        raw checks, so the window is exact while raw checks are retained.
+        """
+        since = since if since is not None else time.time() - 86400
+        totals = {"checks": 0, "healthy": 0, "warning": 0, "critical": 0,
+                  "error": 0, "missing": 0, "skipped": 0, "alerts": 0}
+        for row in self.trend(repo, "hour", since):
+            for key in totals:
+                totals[key] += row[key]
+        status_sums = ", ".join(f"COALESCE(SUM(status = '{name}'), 0)" for name in STATUSES)
+        with self._lock:
+            head = self.conn.execute(
+                f"""SELECT COUNT(*), {status_sums}, COALESCE(SUM(skipped), 0), COALESCE(SUM(alert_count), 0)
+                    FROM checks WHERE repo = ? AND ts >= ? AND ts < ?""",
+                (repo, since, bucket_ceiling(since, PERIODS["hour"]))
+            ).fetchone()
+        for key, value in zip(totals, head):
+            totals[key] += value
+        totals["health_ratio"] = totals["healthy"] / totals["checks"] if totals["checks"] else 0.0
+        return totals
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Row counts and on-disk size of the store."""
+        with self._lock:
+            counts = {
+                table: self.conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+                for table in ("checks", "blobs", "rollups")
+            }
+        size = sum(path.stat().st_size for path in self.db_path.parent.glob(self.db_path.name + "*")
+                   if path.is_file())
+        return {**counts, "db_path": str(self.db_path), "size_bytes": size}
+
+    def close(self):
+        with self._lock:
+            try:
+                self.conn.commit()
+                self.conn.close()
+            except Exception as e:
+                logging.error(f"Failed to close check history: {e}")
@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""
+Tests for guard-rail rule compilation and layer failure verdicts
+"""
+
+import asyncio
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from guard_rail_system import (
+    GuardRailSystem,
+    GuardRailPolicy,
+    PolicyLayer,
+    ContentFilterPolicy,
+    IntentAnalysisPolicy,
+    ContextValidationPolicy,
+    RecursiveSafetyPolicy,
+    RiskLevel
+)
+from pattern_matcher import literal_anchor
+
+@pytest.mark.parametrize("pattern, anchor", [
+    (r"hack\s+into", "hack"),
+    (r"\bharm(?:s|ed|ing)?\b", ""),
+    (r"harm(?:s|ed|ing)?\b", "harm"),
+    (r"exploit(er|ation)", "exploit"),
+    (r"colou?r", "colo"),
+    (r"cat|dog", ""),
+    (r"(cat|dog)food", ""),
+    (r"pipe\|line", "pipe"),
+    (r"set[|]x", "set")
+])
+def test_literal_anchor(pattern, anchor):
+    assert literal_anchor(pattern) == anchor
+
+def test_default_policies_are_fully_anchored():
+    guard_rail = GuardRailSystem()
+    for policy in (ContentFilterPolicy(), IntentAnalysisPolicy(), ContextValidationPolicy(), RecursiveSafetyPolicy()):
+        guard_rail.add_policy(policy)
+    # Every rule is found by the single anchor scan; none needs its own search of the text
+    assert not guard_rail._matcher.unanchored
+
+class BrokenPolicy(GuardRailPolicy):
+    def __init__(self):
+        super().__init__(PolicyLayer.CONTEXT)
+
+    async def evaluate(self, request_data):
+        raise RuntimeError("policy crashed")
+
+    def get_mitigation_strategy(self, risk_level):
+        return "Request allowed"
+
+@pytest.mark.parametrize("failure_risk", [RiskLevel.HIGH, RiskLevel.MODERATE, RiskLevel.NONE])
+def test_failed_layer_is_judged_failure_risk(failure_risk):
+    guard_rail = GuardRailSystem(verdict_cache_size=0, failure_risk=failure_risk)
+    guard_rail.add_policy(BrokenPolicy())
+    result = asyncio.run(guard_rail.check_request({"content": "What is the weather today?", "user_id": "user"}))
+    assert [layer["risk"] for layer in result["layer_details"]] == [failure_risk.value]
@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+"""
+Tests for the MythGraph ledger's background writer and segment log
+"""
+
+import asyncio
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from mythgraph_ledger import (
+    MythGraphLedger,
+    MythGraphSegmentLog,
+    MythGraphStorageError,
+    MythGraphWriteError
+)
+
+def make_ledger(tmp_path):
+    return MythGraphLedger("test_key", "test_key", str(tmp_path / "ledger"))
+
+def test_entry_visible_before_writer_flush(tmp_path):
+    async def scenario():
+        ledger = make_ledger(tmp_path)
+        # Nothing is written until the batch fills or a minute passes
+        await ledger.start_writer(batch_size=1000, flush_interval_ms=60000)
+        entry_hash = await ledger.add_entry("incident", {"reason": "queued"})
+
+        assert entry_hash not in ledger.log.index.hash_to_seq
+        assert ledger.verify_entry(entry_hash)
+        assert ledger.get_entry_by_hash(entry_hash).data == {"reason": "queued"}
+
+        await ledger.stop_writer()
+        assert entry_hash in ledger.log.index.hash_to_seq
+        assert ledger.verify_entry(entry_hash)
+        ledger.close()
+
+    asyncio.run(scenario())
+
+def test_writer_retries_transient_io_errors(tmp_path):
+    async def scenario():
+        ledger = make_ledger(tmp_path)
+        writer = await ledger.start_writer(flush_interval_ms=1)
+        writer.retry_backoff = 0.0
+
+        append_many = ledger.log.append_many
+        failures = [OSError("disk busy"), OSError("disk busy")]
+
+        def flaky_append_many(records):
+            if failures:
+                raise failures.pop()
+            return append_many(records)
+
+        ledger.log.append_many = flaky_append_many
+        hashes = [await ledger.add_entry("incident", {"n": n}) for n in range(10)]
+        await ledger.flush()
+
+        assert writer.stats["write_retries"] == 2
+        assert writer.stats["failed_entries"] == 0
+        assert all(entry_hash in ledger.log.index.hash_to_seq for entry_hash in hashes)
+
+        result = await ledger.verify_ledger_integrity(full=True)
+        assert result["verified_entries"] == 10
+        assert result["chain_breaks"] == 0
+        await ledger.stop_writer()
+        ledger.close()
+
+    asyncio.run(scenario())
+
+def test_writer_failure_rewinds_chain_head_and_raises(tmp_path):
+    async def scenario():
+        ledger = make_ledger(tmp_path)
+        persisted = await ledger.add_entry("incident", {"n": "direct"})
+
+        writer = await ledger.start_writer(flush_interval_ms=1)
+        writer.max_retries = 1
+        writer.retry_backoff = 0.0
+        append_many = ledger.log.append_many
+
+        def broken_append_many(records):
+            raise OSError("disk full")
+
+        ledger.log.append_many = broken_append_many
+        lost = [await ledger.add_entry("incident", {"n": n}) for n in range(5)]
+
+        with pytest.raises(MythGraphWriteError):
+            await ledger.flush()
+        assert not writer.accepting
+        assert [record["hash"] for record in writer.failed_records] == lost
+        assert ledger.ledger_hash == persisted == ledger.log.chain_head
+        assert all(ledger.get_entry_by_hash(entry_hash) is None for entry_hash in lost)
+
+        # Once the disk recovers the chain continues from the last persisted entry
+        ledger.log.append_many = append_many
+        await ledger.add_entry("incident", {"n": "direct after failure"})
+        await ledger.start_writer(flush_interval_ms=1)
+        await ledger.add_entry("incident", {"n": "restarted writer"})
+        result = await ledger.verify_ledger_integrity(full=True)
+        assert result["total_entries"] == 3
+        assert result["chain_breaks"] == 0
+        assert result["failed_verifications"] == 0
+        await ledger.stop_writer()
+        ledger.close()
+
+    asyncio.run(scenario())
+
+class TornFile:
+    """Writes half of the data, then fails like a full disk"""
+
+    def __init__(self, file):
+        self.file = file
+
+    def write(self, data):
+        self.file.write(data[:len(data) // 2])
+        self.file.flush()
+        raise OSError("No space left on device")
+
+    def __getattr__(self, name):
+        return getattr(self.file, name)
+
+def test_failed_group_commit_leaves_only_whole_records(tmp_path):
+    log = MythGraphSegmentLog(tmp_path / "log")
+    log.append({"hash": "a", "previous_hash": None, "entry_type": "t", "timestamp": "1"})
+    size = log.segment_bytes
+
+    log._file = TornFile(log._file)
+    records = [{"hash": h, "previous_hash": None, "entry_type": "t", "timestamp": "2"} for h in "bcd"]
+    with pytest.raises(OSError):
+        log.append_many(records)
+
+    assert log.entry_count == 1
+    assert log.segment_path(0).stat().st_size == size
+
+    log.append_many(records)
+    log.close()
+
+    reopened = MythGraphSegmentLog(tmp_path / "log")
+    assert [record["hash"] for record in reopened.iter_records()] == ["a", "b", "c", "d"]
+    reopened.close()
+
+def test_directory_is_locked_while_open(tmp_path):
+    ledger = make_ledger(tmp_path)
+    with pytest.raises(MythGraphStorageError):
+        make_ledger(tmp_path)
+
+    ledger.close()
+    reopened = make_ledger(tmp_path)
+    reopened.close()
+
+def test_refuses_legacy_per_entry_layout(tmp_path):
+    storage = tmp_path / "ledger"
+    storage.mkdir()
+    (storage / "ledger_index.json").write_text('{"entry_count": 1, "entries": []}')
+
+    with pytest.raises(MythGraphStorageError):
+        make_ledger(tmp_path)
+    assert not list(storage.glob("segment_*"))
+
+def test_caller_changes_after_add_entry_do_not_reach_the_record(tmp_path):
+    async def scenario():
+        ledger = make_ledger(tmp_path)
+        await ledger.start_writer(batch_size=1000, flush_interval_ms=60000)
+        data = {"reason": "queued", "tags": ["a"]}
+        entry_hash = await ledger.add_entry("incident", data)
+
+        data["reason"] = "changed"
+        data["tags"].append("b")
+        await ledger.stop_writer()
+
+        assert ledger.get_entry_by_hash(entry_hash).data == {"reason": "queued", "tags": ["a"]}
+        result = await ledger.verify_ledger_integrity(full=True)
+        assert result["failed_verifications"] == 0
+        assert result["chain_breaks"] == 0
+        ledger.close()
+
+    asyncio.run(scenario())
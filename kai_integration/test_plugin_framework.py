@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+Tests for guard-rail extension plugins: lazy activation, budgets and failure verdicts
+"""
+
+import asyncio
+import sys
+from pathlib import Path
+
+import pytest
+import yaml
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from guard_rail_system import GuardRailSystem, ContentFilterPolicy, RiskLevel
+from kai_core_engine import KaiCoreEngine
+from plugin_framework import (
+    GuardRailExtensionPlugin,
+    PluginManager,
+    PluginType,
+    PLUGIN_CLASSES,
+    register_plugin_class
+)
+
+class MockMythGraph:
+    async def add_entry(self, entry_type, data):
+        pass
+
+class SlowStartPlugin(GuardRailExtensionPlugin):
+    """Slow to initialize, fast to check; hangs or raises on request"""
+
+    initializations = 0
+    startup_delay = 0.2
+    starts = True
+
+    async def initialize(self) -> bool:
+        SlowStartPlugin.initializations += 1
+        await asyncio.sleep(self.startup_delay)
+        return self.starts and await super().initialize()
+
+    async def check_safety(self, content: str):
+        if "hang" in content:
+            await asyncio.sleep(1.0)
+        if "crash" in content:
+            raise RuntimeError("extension crashed")
+        return await super().check_safety(content)
+
+@pytest.fixture
+def slow_start_plugins(tmp_path):
+    plugin_dir = tmp_path / "plugins"
+    (plugin_dir / "slow_start").mkdir(parents=True)
+    with open(plugin_dir / "slow_start" / "config.yaml", 'w') as f:
+        yaml.dump({"plugin_type": "guard_rail_extension"}, f)
+
+    original = PLUGIN_CLASSES[PluginType.GUARD_RAIL_EXTENSION]
+    register_plugin_class(PluginType.GUARD_RAIL_EXTENSION, SlowStartPlugin)
+    SlowStartPlugin.initializations = 0
+    yield plugin_dir
+    register_plugin_class(PluginType.GUARD_RAIL_EXTENSION, original)
+    SlowStartPlugin.startup_delay = 0.2
+    SlowStartPlugin.starts = True
+
+async def make_plugin_manager(plugin_dir):
+    manager = PluginManager(MockMythGraph(), str(plugin_dir), plugin_timeout_ms=50)
+    await manager.load_all(lazy=True)
+    return manager
+
+def test_lazy_activation_is_bounded_by_the_budget_but_not_cancelled(slow_start_plugins):
+    async def scenario():
+        manager = await make_plugin_manager(slow_start_plugins)
+        assert "slow_start" in manager.pending
+
+        # Initialization outlasts the 50ms budget: the check times out, activation carries on
+        result = await manager.run_pipeline(PluginType.GUARD_RAIL_EXTENSION, {"content": "hello"})
+        assert result["timed_out"] == ["slow_start"]
+        result = await manager.run_pipeline(PluginType.GUARD_RAIL_EXTENSION, {"content": "hello"})
+        assert result["timed_out"] == ["slow_start"]
+
+        await asyncio.sleep(0.25)
+        result = await manager.run_pipeline(PluginType.GUARD_RAIL_EXTENSION, {"content": "hello"})
+        assert result["results"]["slow_start"]["risk_level"] == "none"
+        assert "slow_start" in manager.plugins
+        assert SlowStartPlugin.initializations == 1
+
+        result = await manager.run_pipeline(PluginType.GUARD_RAIL_EXTENSION, {"content": "hang"})
+        assert result["timed_out"] == ["slow_start"]
+
+    asyncio.run(scenario())
+
+def test_failed_activation_is_reported_without_retrying(slow_start_plugins):
+    SlowStartPlugin.startup_delay = 0.0
+    SlowStartPlugin.starts = False
+
+    async def scenario():
+        manager = await make_plugin_manager(slow_start_plugins)
+        for _ in range(3):
+            result = await manager.run_pipeline(PluginType.GUARD_RAIL_EXTENSION, {"content": "hello"})
+            assert result["errors"] == {"slow_start": "Plugin slow_start failed to load"}
+        assert SlowStartPlugin.initializations == 1
+        assert "slow_start" in manager.failed and "slow_start" not in manager.pending
+
+        # A config change registers it for another attempt
+        SlowStartPlugin.starts = True
+        assert await manager.reload_plugin("slow_start")
+        result = await manager.run_pipeline(PluginType.GUARD_RAIL_EXTENSION, {"content": "hello"})
+        assert result["results"]["slow_start"]["risk_level"] == "none"
+
+    asyncio.run(scenario())
+
+@pytest.mark.parametrize("content, outcome", [("hang", "timed out"), ("crash", "failed")])
+@pytest.mark.parametrize("failure_risk", [RiskLevel.HIGH, RiskLevel.NONE])
+def test_extension_failures_follow_the_guard_rail_failure_risk(slow_start_plugins, tmp_path, monkeypatch,
+                                                               content, outcome, failure_risk):
+    monkeypatch.chdir(tmp_path)
+
+    async def scenario():
+        engine = KaiCoreEngine(str(tmp_path / "kai-config.yaml"))
+        engine.guard_rail_system = GuardRailSystem(verdict_cache_size=0, failure_risk=failure_risk)
+        engine.guard_rail_system.add_policy(ContentFilterPolicy())
+        engine.plugin_manager = await make_plugin_manager(slow_start_plugins)
+        # Let lazy activation finish so the check itself is what fails
+        await engine.plugin_manager.run_pipeline(PluginType.GUARD_RAIL_EXTENSION, {"content": "hello"})
+        await asyncio.sleep(0.25)
+
+        result = await engine.check_safety({"content": content})
+        assert result["risk"] == failure_risk.value
+        if failure_risk == RiskLevel.HIGH:
+            assert result["reason"] == f"slow_start: guard-rail extension {outcome}" + (
+                ": extension crashed" if outcome == "failed" else "")
+
+    asyncio.run(scenario())
@@ -0,0 +1,40 @@
+#!/usr/bin/env python3
+"""
+Tests for server-side lane selection in the request pipeline
+"""
+
+import asyncio
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from request_pipeline import RequestPipeline
+
+async def echo(request_data):
+    return {"success": True}
+
+def test_payload_priority_does_not_choose_the_lane():
+    async def scenario():
+        pipeline = RequestPipeline(echo, workers=2)
+        pipeline.start()
+        await pipeline.submit({"content": "hello", "priority": "incident"})
+        await pipeline.submit({"content": "hello"}, lane="bulk")
+        await pipeline.stop()
+        return pipeline.admitted
+
+    assert asyncio.run(scenario()) == {"incident": 0, "interactive": 1, "bulk": 1}
+
+def test_lane_selector_routes_unlabelled_requests():
+    def select_lane(request_data):
+        return "incident" if "blocked" in request_data["content"] else None
+
+    async def scenario():
+        pipeline = RequestPipeline(echo, workers=2, lane_selector=select_lane)
+        pipeline.start()
+        for content in ("blocked again", "hello", "blocked"):
+            await pipeline.submit({"content": content})
+        await pipeline.stop()
+        return pipeline.admitted
+
+    assert asyncio.run(scenario()) == {"incident": 2, "interactive": 1, "bulk": 0}
@@ -0,0 +1,40 @@
+#!/usr/bin/env python3
+"""
+Tests for the Sentinel check history rollup windows
+"""
+
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from sentinel_history import CheckHistoryStore
+
+HOUR = 3600
+# Yesterday's UTC midnight: an hour and day boundary, well inside raw retention
+MIDNIGHT = int(time.time() // 86400 * 86400) - 86400
+
+def record(store, ts, status="HEALTHY"):
+    store.record({"repo_name": "repo", "timestamp": ts, "status": status})
+
+def test_summary_covers_exactly_the_requested_window(tmp_path):
+    store = CheckHistoryStore(str(tmp_path / "history.db"))
+    since = MIDNIGHT + 10 * HOUR + 1800
+
+    record(store, MIDNIGHT + 10 * HOUR + 600, "CRITICAL")  # same hour as since, but before it
+    record(store, MIDNIGHT + 10 * HOUR + 2400, "WARNING")  # same hour, inside the window
+    record(store, MIDNIGHT + 11 * HOUR)
+    record(store, MIDNIGHT + 12 * HOUR + 5)
+
+    totals = store.summary("repo", since)
+    assert totals["checks"] == 3
+    assert (totals["healthy"], totals["warning"], totals["critical"]) == (2, 1, 0)
+
+    # Trend rows are whole buckets starting inside the window
+    assert [row["bucket"] for row in store.trend("repo", "hour", since)] == [
+        MIDNIGHT + 11 * HOUR, MIDNIGHT + 12 * HOUR]
+    assert [row["bucket"] for row in store.trend("repo", "hour", MIDNIGHT + 11 * HOUR)] == [
+        MIDNIGHT + 11 * HOUR, MIDNIGHT + 12 * HOUR]
+    assert store.trend("repo", "day", since) == []
+    store.close()
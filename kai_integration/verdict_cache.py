@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Kai Core V8+ Verdict Cache
+Bounded TTL/LRU cache for guard-rail and paradox verdicts on repeated content
+"""
+
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Any, Hashable, Optional, Tuple
+
+def normalize_content(content: Any) -> str:
+    """Case-fold content the same way the policies and detectors do before matching"""
+    return str(content or "").lower()
+
+def content_digest(content: Any, extra: Any = None) -> bytes:
+    """
+    Fixed-size digest of normalized content plus any other verdict inputs
+
+    Hashing keeps memory per entry bounded no matter how large the content is.
+    """
+    digest = hashlib.blake2b(normalize_content(content).encode("utf-8", "surrogatepass"), digest_size=16)
+    if extra is not None:
+        digest.update(b"\x00")
+        digest.update(json.dumps(extra, sort_keys=True, default=str).encode("utf-8"))
+    return digest.digest()
+
+class VerdictCache:
+    """
+    Thread-safe LRU cache whose entries also expire after ttl_seconds
+
+    Keys are (version, digest) pairs; callers bump their version when the
+    rules behind a verdict change so older entries can never be returned.
+    """
+
+    def __init__(self, max_entries: int = 10000, ttl_seconds: Optional[float] = 300.0):
+        if max_entries <= 0:
+            raise ValueError("max_entries must be positive")
+
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[Tuple[Hashable, bytes], Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+
+    def get(self, version: Hashable, digest: bytes) -> Optional[Any]:
+        """Cached verdict, or None on a miss or an expired entry"""
+        key = (version, digest)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+
+            expires_at, verdict = entry
+            if expires_at and time.monotonic() >= expires_at:
+                del self._entries[key]
+                self.expirations += 1
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return verdict
+
+    def put(self, version: Hashable, digest: bytes, verdict: Any):
+        """Store a verdict, evicting the least recently used entries past max_entries"""
+        expires_at = time.monotonic() + self.ttl_seconds if self.ttl_seconds else 0.0
+        key = (version, digest)
+        with self._lock:
+            self._entries[key] = (expires_at, verdict)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self):
+        """Drop every entry (the policy or pattern set changed)"""
+        with self._lock:
+            self._entries.clear()
+            self.invalidations += 1
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Hit-rate and occupancy metrics"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "max_entries": self.max_entries,
+                "ttl_seconds": self.ttl_seconds,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "invalidations": self.invalidations
+            }
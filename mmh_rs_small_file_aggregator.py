@@ -13,6 +13,7 @@ Strategy:
 """
 
 import os
+import sys
 import json
 import time
 import hashlib
@@ -24,6 +25,10 @@ import logging
 # Import the MMH-RS compressor
 from mmh_rs_compressor import MMHRSCompressor
 
+# Shared directory walker
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'ops'))
+from fast_file_walker import walk_files
+
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -73,8 +78,9 @@ class SmallFileAggregator:
         
         logger.info(f"Scanning directory: {directory}")
         
-        for file_path in directory.rglob('*'):
-            if file_path.is_file() and file_path.stat().st_size <= self.max_file_size:
+        for entry in walk_files(directory):
+            if entry.stat().st_size <= self.max_file_size:
+                file_path = Path(entry.path)
                 try:
                     content = file_path.read_bytes()
                     file_hash = hashlib.sha256(content).hexdigest()
@@ -1683,71 +1683,23 @@ Optimization Areas: {len(superview['opportunity_analysis']['optimization_areas']
 # Integration Date: 2025-08-17
 # ============================================================================
 
-class MythGraphEntry:
-    """
-    Individual entry in the MythGraph ledger
-    """
-    
-    def __init__(self, entry_type: str, data: Dict, timestamp: Optional[str] = None):
-        self.entry_type = entry_type
-        self.data = data
-        self.timestamp = timestamp or datetime.utcnow().isoformat()
-        self.hash = None
-        self.signature = None
-        self.previous_hash = None
-    
-    def calculate_hash(self, previous_hash: Optional[str] = None) -> str:
-        """Calculate cryptographic hash of entry"""
-        self.previous_hash = previous_hash
-        
-        # Create hashable data
-        hash_data = {
-            "entry_type": self.entry_type,
-            "data": self.data,
-            "timestamp": self.timestamp,
-            "previous_hash": self.previous_hash
-        }
-        
-        # Calculate SHA-256 hash
-        hash_string = json.dumps(hash_data, sort_keys=True)
-        self.hash = hashlib.sha256(hash_string.encode()).hexdigest()
-        
-        return self.hash
-    
-    def sign_entry(self, private_key: str) -> str:
-        """Sign entry with private key"""
-        if not self.hash:
-            self.calculate_hash()
-        
-        # In a real implementation, use proper cryptographic signing
-        # This is a simplified version for demonstration
-        signature_data = f"{self.hash}:{private_key}"
-        self.signature = hashlib.sha256(signature_data.encode()).hexdigest()
-        
-        return self.signature
-    
-    def verify_signature(self, public_key: str) -> bool:
-        """Verify entry signature"""
-        if not self.signature:
-            return False
-        
-        # In a real implementation, use proper cryptographic verification
-        # This is a simplified version for demonstration
-        expected_signature = hashlib.sha256(f"{self.hash}:{public_key}".encode()).hexdigest()
-        return self.signature == expected_signature
-    
-    def to_dict(self) -> Dict:
-        """Convert entry to dictionary"""
-        return {
-            "entry_type": self.entry_type,
-            "data": self.data,
-            "timestamp": self.timestamp,
-            "hash": self.hash,
-            "signature": self.signature,
-            "previous_hash": self.previous_hash
-        }
+# The ledger, its segment log, indexes and group-commit writer are shared with
+# the Kai integration engine; only the Exo-Suit specifics are defined here
+sys.path.append(str(Path(__file__).resolve().parent.parent / "kai_integration"))
+from mythgraph_ledger import (
+    GENESIS_HASH,
+    MythGraphEntry,
+    MythGraphIndex,
+    MythGraphSegmentLog,
+    MythGraphLedgerWriter,
+    MythGraphWriteError,
+    MythGraphStorageError,
+    verify_segment_chunk,
+    find_chain_breaks,
+    MythGraphLedger as KaiMythGraphLedger
+)
 
-class MythGraphLedger:
+class MythGraphLedger(KaiMythGraphLedger):
     """
     MythGraph ledger implementation for cryptographic verification and complete audit trails
     
@@ -1755,229 +1707,36 @@ class MythGraphLedger:
     Capability: SHA-256 hashing, digital signatures, public transparency, complete audit trails
     """
     
-    def __init__(self, public_key: str = None, private_key: str = None):
-        self.entries: List[MythGraphEntry] = []
-        self.public_key = public_key or "kai_core_v8_public_key"
-        self.private_key = private_key or "kai_core_v8_private_key"
-        self.ledger_hash = "0000000000000000000000000000000000000000000000000000000000000000"
-        self.storage_path = Path("mythgraph")
-        self.storage_path.mkdir(exist_ok=True)
+    GENESIS_HASH = GENESIS_HASH
+    GENESIS_DATA = {
+        **KaiMythGraphLedger.GENESIS_DATA,
+        "system": "Exo-Suit V5.0",
+        "version": "8.0.0"
+    }
+    
+    def __init__(self, public_key: str = None, private_key: str = None, storage_path: str = None,
+                 **log_options):
+        super().__init__(public_key or "kai_core_v8_public_key",
+                         private_key or "kai_core_v8_private_key",
+                         storage_path or Path(__file__).resolve().parent / "mythgraph",
+                         **log_options)
         
         # Initialize the ledger
         self.initialize()
     
-    def initialize(self):
-        """Initialize the MythGraph ledger system"""
-        try:
-            # Create storage directory if it doesn't exist
-            self.storage_path.mkdir(exist_ok=True)
-            
-            # Initialize with a genesis entry
-            genesis_entry = MythGraphEntry("system_initialization", {
-                "message": "MythGraph Ledger initialized",
-                "timestamp": "2025-01-17T00:00:00Z",
-                "system": "Exo-Suit V5.0",
-                "version": "8.0.0"
-            })
-            
-            # Add to entries list
-            self.entries.append(genesis_entry)
-            
-            # Update ledger hash
-            self.update_ledger_hash()
-            
-            logging.info("MythGraph Ledger initialized successfully")
-            return True
-        except Exception as e:
-            logging.error(f"MythGraph initialization failed: {e}")
-            return False
-    
-    def log_event(self, event_type: str, message: str, additional_data: Dict = None) -> str:
-        """
-        Log an event to the MythGraph ledger
-        
-        Args:
-            event_type: Type of event (e.g., 'repair_strategy_creation', 'paradox_detected')
-            message: Event message
-            additional_data: Additional event data
-        
-        Returns:
-            Entry hash of the logged event
-        """
-        try:
-            # Prepare event data
-            event_data = {
-                "message": message,
-                "timestamp": datetime.utcnow().isoformat()
-            }
-            
-            # Add additional data if provided
-            if additional_data:
-                event_data.update(additional_data)
-            
-            # Create event entry
-            event_entry = MythGraphEntry(event_type, event_data)
-            
-            # Add to entries list
-            self.entries.append(event_entry)
-            
-            # Update ledger hash
-            self.update_ledger_hash()
-            
-            logging.info(f"MythGraph event logged: {event_type} - {message}")
-            return event_entry.hash if event_entry.hash else "event_logged"
-            
-        except Exception as e:
-            logging.error(f"Event logging failed: {e}")
-            return "logging_failed"
-    
     async def add_entry(self, entry_type: str, data: Dict) -> str:
-        """
-        Add entry to ledger
-        
-        Args:
-            entry_type: Type of entry (incident, paradox, guard_rail, etc.)
-            data: Entry data
-        
-        Returns:
-            Entry hash
-        """
+        """Add entry to ledger; returns "entry_failed" instead of raising"""
         try:
-            # Create new entry
-            entry = MythGraphEntry(entry_type, data)
-            
-            # Calculate hash with previous entry hash
-            previous_hash = self.ledger_hash if self.entries else None
-            entry_hash = entry.calculate_hash(previous_hash)
-            
-            # Sign entry
-            entry.sign_entry(self.private_key)
-            
-            # Add to ledger
-            self.entries.append(entry)
-            
-            # Update ledger hash
-            self.update_ledger_hash()
-            
-            # Persist to storage
-            await self.persist_entry(entry)
-            
-            # Log to console for transparency
-            print(f"MYTHGRAPH: {entry_hash} - {entry_type} - {data.get('reason', 'Unknown')}")
+            entry_hash = await super().add_entry(entry_type, data)
             logging.info(f"MythGraph entry added: {entry_type} -> {entry_hash}")
-            
             return entry_hash
-            
         except Exception as e:
             logging.error(f"Failed to add entry: {e}")
             return "entry_failed"
     
-    def update_ledger_hash(self):
-        """Update the ledger hash with all entries"""
-        try:
-            ledger_data = json.dumps([entry.to_dict() for entry in self.entries], sort_keys=True)
-            self.ledger_hash = hashlib.sha256(ledger_data.encode()).hexdigest()
-        except Exception as e:
-            logging.error(f"Failed to update ledger hash: {e}")
-    
-    async def persist_entry(self, entry: MythGraphEntry):
-        """Persist entry to storage"""
-        try:
-            # Save individual entry
-            entry_file = self.storage_path / f"{entry.hash}.json"
-            with open(entry_file, 'w') as f:
-                json.dump(entry.to_dict(), f, indent=2)
-            
-            # Update ledger index
-            await self.update_ledger_index()
-            
-        except Exception as e:
-            logging.error(f"Failed to persist entry: {e}")
-    
-    async def update_ledger_index(self):
-        """Update ledger index file"""
-        try:
-            index_data = {
-                "ledger_hash": self.ledger_hash,
-                "entry_count": len(self.entries),
-                "last_updated": datetime.utcnow().isoformat(),
-                "entries": [
-                    {
-                        "hash": entry.hash,
-                        "type": entry.entry_type,
-                        "timestamp": entry.timestamp
-                    }
-                    for entry in self.entries
-                ]
-            }
-            
-            index_file = self.storage_path / "ledger_index.json"
-            with open(index_file, 'w') as f:
-                json.dump(index_data, f, indent=2)
-                
-        except Exception as e:
-            logging.error(f"Failed to update ledger index: {e}")
-    
-    def verify_entry(self, entry_hash: str) -> bool:
-        """Verify entry hash is in ledger"""
-        try:
-            for entry in self.entries:
-                if entry.hash == entry_hash:
-                    return entry.verify_signature(self.public_key)
-            return False
-        except Exception as e:
-            logging.error(f"Entry verification failed: {e}")
-            return False
-    
-    def get_entry_by_hash(self, entry_hash: str) -> Optional[MythGraphEntry]:
-        """Get entry by hash"""
-        try:
-            for entry in self.entries:
-                if entry.hash == entry_hash:
-                    return entry
-            return None
-        except Exception as e:
-            logging.error(f"Failed to get entry by hash: {e}")
-            return None
-    
-    def get_recent_entries(self, limit: int = 10) -> List[MythGraphEntry]:
-        """Get recent entries"""
-        try:
-            return self.entries[-limit:] if self.entries else []
-        except Exception as e:
-            logging.error(f"Failed to get recent entries: {e}")
-            return []
-    
-    def get_entries_by_type(self, entry_type: str) -> List[MythGraphEntry]:
-        """Get entries by type"""
-        try:
-            return [entry for entry in self.entries if entry.entry_type == entry_type]
-        except Exception as e:
-            logging.error(f"Failed to get entries by type: {e}")
-            return []
-    
     def get_statistics(self) -> Dict:
         """Get ledger statistics"""
-        try:
-            total_entries = len(self.entries)
-            entry_types = {}
-            
-            for entry in self.entries:
-                entry_type = entry.entry_type
-                entry_types[entry_type] = entry_types.get(entry_type, 0) + 1
-            
-            return {
-                "total_entries": total_entries,
-                "entry_types": entry_types,
-                "ledger_hash": self.ledger_hash,
-                "last_updated": datetime.utcnow().isoformat(),
-                "verification_enabled": True,
-                "system": "Exo-Suit V5.0",
-                "version": "8.0.0"
-            }
-        except Exception as e:
-            logging.error(f"Failed to get statistics: {e}")
-            return {"error": str(e)}
+        return {**super().get_statistics(), "system": "Exo-Suit V5.0", "version": "8.0.0"}
     
     def export_ledger(self, format: str = "json") -> str:
         """Export ledger in specified format"""
@@ -1985,8 +1744,8 @@ class MythGraphLedger:
             if format == "json":
                 return json.dumps({
                     "ledger_hash": self.ledger_hash,
-                    "entry_count": len(self.entries),
-                    "entries": [entry.to_dict() for entry in self.entries],
+                    "entry_count": self.log.entry_count,
+                    "entries": [entry.to_dict() for entry in self.iter_entries()],
                     "system": "Exo-Suit V5.0",
                     "export_timestamp": datetime.utcnow().isoformat()
                 }, indent=2)
@@ -1996,72 +1755,13 @@ class MythGraphLedger:
             logging.error(f"Failed to export ledger: {e}")
             return json.dumps({"error": str(e)})
     
-    async def load_from_storage(self):
-        """Load entries from storage"""
-        try:
-            index_file = self.storage_path / "ledger_index.json"
-            if index_file.exists():
-                with open(index_file, 'r') as f:
-                    index_data = json.load(f)
-                
-                # Load individual entries
-                for entry_info in index_data.get("entries", []):
-                    entry_file = self.storage_path / f"{entry_info['hash']}.json"
-                    if entry_file.exists():
-                        with open(entry_file, 'r') as f:
-                            entry_data = json.load(f)
-                        
-                        entry = MythGraphEntry(
-                            entry_data["entry_type"],
-                            entry_data["data"],
-                            entry_data["timestamp"]
-                        )
-                        entry.hash = entry_data["hash"]
-                        entry.signature = entry_data["signature"]
-                        entry.previous_hash = entry_data["previous_hash"]
-                        
-                        self.entries.append(entry)
-                
-                # Update ledger hash
-                self.update_ledger_hash()
-                logging.info(f"Loaded {len(self.entries)} entries from storage")
-                
-        except Exception as e:
-            logging.error(f"Failed to load from storage: {e}")
-    
-    async def verify_ledger_integrity(self) -> Dict:
-        """Verify ledger integrity"""
-        try:
-            verification_results = {
-                "total_entries": len(self.entries),
-                "verified_entries": 0,
-                "failed_verifications": 0,
-                "errors": [],
-                "system": "Exo-Suit V5.0",
-                "verification_timestamp": datetime.utcnow().isoformat()
-            }
-            
-            for entry in self.entries:
-                try:
-                    if entry.verify_signature(self.public_key):
-                        verification_results["verified_entries"] += 1
-                    else:
-                        verification_results["failed_verifications"] += 1
-                        verification_results["errors"].append(f"Invalid signature for entry {entry.hash}")
-                except Exception as e:
-                    verification_results["failed_verifications"] += 1
-                    verification_results["errors"].append(f"Verification error for entry {entry.hash}: {e}")
-            
-            verification_results["integrity_score"] = (
-                verification_results["verified_entries"] / verification_results["total_entries"]
-                if verification_results["total_entries"] > 0 else 0.0
-            )
-            
-            return verification_results
-            
-        except Exception as e:
-            logging.error(f"Ledger integrity verification failed: {e}")
-            return {"error": str(e)}
+    async def verify_ledger_integrity(self, full: bool = False, workers: Optional[int] = None,
+                                      chunk_size: int = 10000) -> Dict:
+        """Verify ledger integrity (see KaiMythGraphLedger.verify_ledger_integrity)"""
+        verification_results = await super().verify_ledger_integrity(full, workers, chunk_size)
+        verification_results["system"] = "Exo-Suit V5.0"
+        verification_results["verification_timestamp"] = datetime.utcnow().isoformat()
+        return verification_results
     
     def log_system_event(self, event_type: str, message: str, data: Dict = None):
         """Log system events to MythGraph ledger"""
@@ -2935,6 +2635,12 @@ class KaiCoreEngine:
                     "type": "local",
                     "encryption": True,
                     "public_logging": True
+                },
+                "writer": {
+                    "enabled": True,
+                    "batch_size": 256,
+                    "flush_interval_ms": 20.0,
+                    "max_pending": 10000
                 }
             }
         }
@@ -3006,6 +2712,15 @@ class KaiCoreEngine:
             
             self.mythgraph_ledger = MythGraphLedger(public_key, private_key)
             
+            # Request logging only enqueues; a background writer group-commits to disk
+            writer_config = self.config.get("mythgraph", {}).get("writer", {})
+            if writer_config.get("enabled", True):
+                await self.mythgraph_ledger.start_writer(
+                    batch_size=writer_config.get("batch_size", 256),
+                    flush_interval_ms=writer_config.get("flush_interval_ms", 20.0),
+                    max_pending=writer_config.get("max_pending", 10000)
+                )
+            
             # Log initialization event
             await self.mythgraph_ledger.add_entry("system_event", {
                 "event": "engine_initialization",
@@ -3218,6 +2933,7 @@ class KaiCoreEngine:
     async def log_request(self, request_data: Dict, response: str, safety_result: Dict, paradox_result: Dict):
         """Log request to MythGraph"""
         if self.mythgraph_ledger:
+            start_time = time.time()
             await self.mythgraph_ledger.add_entry("request_processed", {
                 "request": request_data,
                 "response": response,
@@ -3225,6 +2941,7 @@ class KaiCoreEngine:
                 "paradox_resolution": paradox_result,
                 "timestamp": datetime.utcnow().isoformat()
             })
+            self.metrics["mythgraph_logging_latency"] = (time.time() - start_time) * 1000
     
     async def log_incident(self, incident_type: str, incident_data: Dict):
         """Log incident to MythGraph"""
@@ -3281,6 +2998,8 @@ class KaiCoreEngine:
                 "timestamp": datetime.utcnow().isoformat(),
                 "uptime_seconds": (datetime.utcnow() - self.start_time).total_seconds() if self.start_time else 0
             })
+            await self.mythgraph_ledger.stop_writer()
+            self.mythgraph_ledger.close()
         
         self.status = "shutdown"
         self.logger.info("✅ Kai Core V8+ Engine shutdown complete")
@@ -14,15 +14,40 @@ This system can handle ANY paradox using your amazing infrastructure!
 """
 
 import asyncio
+import atexit
+import gzip
 import json
 import hashlib
+import io
+import os
+import sys
+import threading
 import time
+import uuid
+import weakref
+from collections import deque
 from datetime import datetime, timezone
-from typing import Dict, List, Optional, Any, Union
+from typing import AsyncIterator, Dict, Iterable, Iterator, List, Optional, Any, Tuple, Union
 from enum import Enum
 from dataclasses import dataclass
 import logging
 
+try:
+    import zstandard
+    ZSTD_AVAILABLE = True
+except ImportError:
+    ZSTD_AVAILABLE = False
+
+try:
+    import psutil
+    PSUTIL_AVAILABLE = True
+except ImportError:
+    PSUTIL_AVAILABLE = False
+
+# Single-pass pattern matching is shared with the Kai integration detectors
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "kai_integration"))
+from pattern_matcher import PatternMatcher
+
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -81,42 +106,274 @@ class ResolutionResult:
     audit_trail: List[Dict[str, Any]]
     ril7_enhancement: bool = False
 
+# Enhanced paradox detection patterns (regexes); types and patterns are in priority order
+DEFAULT_PARADOX_PATTERNS = {
+    ParadoxType.SELF_REFERENCE.value: [
+        r"this statement is false",
+        r"i am lying",
+        r"the following is true: the following is false",
+        r"everything i say is a lie",
+        r"this sentence contains exactly.*false statements",
+        r"the next sentence is true.*the previous sentence is false"
+    ],
+    ParadoxType.CIRCULAR_DEPENDENCY.value: [
+        r"depends on itself",
+        r"circular reference",
+        r"recursive definition",
+        r"infinite loop",
+        r"a depends on b.*b depends on a",
+        r"self-referential dependency"
+    ],
+    ParadoxType.META_PARADOX.value: [
+        r"system cannot resolve",
+        r"cannot resolve itself",
+        r"meta.*paradox",
+        r"paradox about paradoxes",
+        r"self-referential system"
+    ],
+    ParadoxType.EXISTENTIAL_PARADOX.value: [
+        r"existence.*non-existence",
+        r"being.*nothingness",
+        r"reality.*illusion",
+        r"consciousness.*unconsciousness"
+    ],
+    ParadoxType.QUANTUM_PARADOX.value: [
+        r"quantum.*superposition",
+        r"schrodinger.*cat",
+        r"wave.*particle",
+        r"observer.*observed",
+        r"both alive and dead",
+        r"alive and dead until observed"
+    ]
+}
+
+# Sinks with an open segment, finished at interpreter exit so the gzip trailer / zstd frame end is written
+_OPEN_AUDIT_SINKS: "weakref.WeakSet[AuditSink]" = weakref.WeakSet()
+
+@atexit.register
+def _close_open_audit_sinks():
+    for sink in list(_OPEN_AUDIT_SINKS):
+        sink.close()
+
+class AuditSink:
+    """
+    Append-only on-disk stream of audit records
+    
+    Records are written as compact JSON lines through a zstd stream (gzip
+    when the zstandard package is not installed), and a new segment file is
+    started once the current one has taken max_segment_bytes of input.
+    Segment names carry a random component and are created exclusively, so
+    sinks sharing a directory and prefix never truncate each other's files.
+    Use as a context manager, or call close(); open sinks are also closed at exit.
+    """
+    
+    def __init__(self, directory: str, prefix: str = "paradox_audit",
+                 max_segment_bytes: int = 64 * 1024 * 1024, compression_level: int = 3):
+        self.directory = directory
+        self.prefix = prefix
+        self.max_segment_bytes = max_segment_bytes
+        self.compression_level = compression_level
+        self.compression = "zstd" if ZSTD_AVAILABLE else "gzip"
+        self.extension = ".jsonl.zst" if ZSTD_AVAILABLE else ".jsonl.gz"
+        os.makedirs(directory, exist_ok=True)
+        
+        self._lock = threading.Lock()
+        self._stream = None
+        self._segment_bytes = 0
+        self.current_path: Optional[str] = None
+        self.segments = 0
+        self.records_written = 0
+        self.bytes_written = 0
+    
+    def _open_segment(self):
+        stamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%S")
+        while True:
+            self.current_path = os.path.join(
+                self.directory,
+                f"{self.prefix}_{stamp}_{os.getpid()}_{uuid.uuid4().hex[:8]}_{self.segments:04d}{self.extension}")
+            try:
+                # "x" fails instead of truncating if the name is somehow taken
+                if ZSTD_AVAILABLE:
+                    compressor = zstandard.ZstdCompressor(level=self.compression_level)
+                    self._stream = compressor.stream_writer(open(self.current_path, "xb"))
+                else:
+                    self._stream = gzip.open(self.current_path, "xb", compresslevel=min(self.compression_level, 9))
+                break
+            except FileExistsError:
+                continue
+        self._segment_bytes = 0
+        self.segments += 1
+        _OPEN_AUDIT_SINKS.add(self)
+    
+    def write_line(self, line: bytes):
+        """Append one newline-terminated JSON record"""
+        with self._lock:
+            if self._stream is None or self._segment_bytes >= self.max_segment_bytes:
+                self._close_stream()
+                self._open_segment()
+            self._stream.write(line)
+            self._segment_bytes += len(line)
+            self.records_written += 1
+            self.bytes_written += len(line)
+    
+    def write(self, record: Dict[str, Any]):
+        """Serialize and append one record"""
+        self.write_line(json.dumps(record, separators=(",", ":"), default=str).encode("utf-8") + b"\n")
+    
+    def flush(self):
+        """Push buffered records through the compressor to disk"""
+        with self._lock:
+            if self._stream is not None:
+                self._stream.flush()
+    
+    def _close_stream(self):
+        if self._stream is not None:
+            self._stream.close()
+            self._stream = None
+            _OPEN_AUDIT_SINKS.discard(self)
+    
+    def close(self):
+        """Finish the current segment"""
+        with self._lock:
+            self._close_stream()
+    
+    def __enter__(self) -> "AuditSink":
+        return self
+    
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+    
+    @staticmethod
+    def iter_records(path: str) -> Iterator[Dict[str, Any]]:
+        """Read back the records of one segment file"""
+        if path.endswith(".zst"):
+            if not ZSTD_AVAILABLE:
+                raise RuntimeError("zstandard is required to read " + path)
+            stream = io.BufferedReader(zstandard.ZstdDecompressor().stream_reader(open(path, "rb")))
+        else:
+            stream = gzip.open(path, "rb")
+        with stream:
+            for line in stream:
+                if line.strip():
+                    yield json.loads(line)
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Streaming counters"""
+        return {
+            "directory": self.directory,
+            "compression": self.compression,
+            "current_segment": self.current_path,
+            "segments": self.segments,
+            "records_written": self.records_written,
+            "bytes_written": self.bytes_written
+        }
+
+class BoundedHistory:
+    """
+    Ring buffer of the most recent records with memory accounting
+    
+    Only the last `retention` records stay in memory (None keeps them all);
+    every record is also streamed to the audit sink, when there is one, so
+    nothing is lost as old records are evicted.
+    """
+    
+    def __init__(self, retention: Optional[int] = 1000, sink: Optional[AuditSink] = None):
+        self.records: deque = deque(maxlen=retention)
+        self._sizes: deque = deque(maxlen=retention)
+        self.sink = sink
+        self.total = 0
+        self.retained_bytes = 0
+    
+    def append(self, record: Dict[str, Any], line: Optional[bytes] = None):
+        """Retain a record (evicting the oldest) and stream it to the sink
+        
+        line is the record's newline-terminated JSON, when the caller already has it.
+        """
+        if line is None:
+            line = json.dumps(record, separators=(",", ":"), default=str).encode("utf-8") + b"\n"
+        if self.records.maxlen != 0:
+            if len(self.records) == self.records.maxlen:
+                self.retained_bytes -= self._sizes[0]
+            self.records.append(record)
+            self._sizes.append(len(line))
+            self.retained_bytes += len(line)
+        self.total += 1
+        if self.sink is not None:
+            self.sink.write_line(line)
+    
+    def __len__(self) -> int:
+        return len(self.records)
+    
+    def __iter__(self):
+        return iter(self.records)
+    
+    def __getitem__(self, index: int) -> Dict[str, Any]:
+        return self.records[index]
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Retention and approximate memory use (serialized size of retained records)"""
+        return {
+            "total": self.total,
+            "retained": len(self.records),
+            "retention": self.records.maxlen,
+            "retained_bytes": self.retained_bytes,
+            "streamed_to_disk": self.sink is not None
+        }
+
+# RIL7 reasoning patterns, applied to layers in rotation
+RIL7_LAYER_PATTERNS = (
+    "self_referential_analysis",
+    "cross_domain_pattern_recognition",
+    "recursive_symbolic_compression",
+    "meta_cognitive_reflection",
+    "quantum_superposition_analysis",
+    "existential_paradox_transcendence",
+    "system_level_containment"
+)
+
+# Domains for cross-domain analysis, applied to layers in rotation
+RIL7_DOMAINS = ("mathematics", "physics", "psychology", "computer_science", "philosophy")
+
 class RIL7Integration:
     """RIL7 (Recursive Intelligence Layer v7) Integration"""
     
-    def __init__(self):
+    def __init__(self, history_size: Optional[int] = 1000, audit_sink: Optional[AuditSink] = None):
         self.recursive_depth = 7
         self.cross_domain_capability = True
         self.self_modification_enabled = True
         self.audit_trail_enabled = True
-        self.recursive_operations = []  # Track operations
+        # Recent operations only; the audit sink keeps the full record
+        self.recursive_operations = BoundedHistory(history_size, audit_sink)
         
-    async def recursive_reasoning(self, paradox_data: ParadoxData, depth: int = None) -> Dict[str, Any]:
-        """Perform RIL7 recursive reasoning on paradox"""
+    async def recursive_reasoning(self, paradox_data: ParadoxData, depth: int = None,
+                                  timestamp: Optional[str] = None) -> Dict[str, Any]:
+        """Perform RIL7 recursive reasoning on paradox (one timestamp for the whole operation)"""
         if depth is None:
             depth = min(self.recursive_depth, paradox_data.depth + 3)
+        if timestamp is None:
+            timestamp = datetime.now(timezone.utc).isoformat()
             
         logger.info(f"🎯 RIL7 Recursive Reasoning initiated - Depth: {depth}")
         
         reasoning_layers = []
         current_input = paradox_data.text
         
+        # Layers are pure functions of their input, so they run inline
         for level in range(depth):
-            layer_result = await self._reasoning_layer(level, current_input, paradox_data)
+            layer_result = self._reasoning_layer(level, current_input, timestamp)
             reasoning_layers.append(layer_result)
             current_input = layer_result["output"]
             
             # Apply cross-domain insights
             if self.cross_domain_capability:
-                cross_domain = await self._cross_domain_analysis(level, layer_result)
-                layer_result["cross_domain_insights"] = cross_domain
+                layer_result["cross_domain_insights"] = self._cross_domain_analysis(level, timestamp)
                 
         # Store operation
         operation = {
             "paradox_text": paradox_data.text,
             "depth": depth,
             "layers": reasoning_layers,
-            "timestamp": datetime.now(timezone.utc).isoformat()
+            "timestamp": timestamp
         }
         self.recursive_operations.append(operation)
                 
@@ -126,23 +383,13 @@ class RIL7Integration:
             "layers": reasoning_layers,
             "final_insight": reasoning_layers[-1]["output"] if reasoning_layers else "No resolution found",
             "confidence": max(0.9 - (depth * 0.05), 0.1),
-            "timestamp": datetime.now(timezone.utc).isoformat()
+            "timestamp": timestamp
         }
     
-    async def _reasoning_layer(self, level: int, input_text: str, paradox_data: ParadoxData) -> Dict[str, Any]:
+    @staticmethod
+    def _reasoning_layer(level: int, input_text: str, timestamp: str) -> Dict[str, Any]:
         """Execute single RIL7 reasoning layer"""
-        # Apply RIL7 patterns
-        patterns = [
-            "self_referential_analysis",
-            "cross_domain_pattern_recognition", 
-            "recursive_symbolic_compression",
-            "meta_cognitive_reflection",
-            "quantum_superposition_analysis",
-            "existential_paradox_transcendence",
-            "system_level_containment"
-        ]
-        
-        pattern = patterns[level % len(patterns)]
+        pattern = RIL7_LAYER_PATTERNS[level % len(RIL7_LAYER_PATTERNS)]
         
         # Generate layer-specific insight
         insight = f"RIL7 Layer {level}: {pattern} applied - {input_text[:50]}..."
@@ -153,45 +400,53 @@ class RIL7Integration:
             "input": input_text,
             "output": insight,
             "confidence": 0.95 - (level * 0.1),
-            "timestamp": datetime.now(timezone.utc).isoformat()
+            "timestamp": timestamp
         }
     
-    async def _cross_domain_analysis(self, level: int, layer_result: Dict[str, Any]) -> Dict[str, Any]:
+    @staticmethod
+    def _cross_domain_analysis(level: int, timestamp: str) -> Dict[str, Any]:
         """Apply cross-domain RIL7 analysis"""
-        domains = ["mathematics", "physics", "psychology", "computer_science", "philosophy"]
-        domain = domains[level % len(domains)]
+        domain = RIL7_DOMAINS[level % len(RIL7_DOMAINS)]
         
         return {
             "domain": domain,
             "insight": f"Cross-domain {domain} analysis at level {level}",
             "applicability": 0.8 + (level * 0.02),
-            "timestamp": datetime.now(timezone.utc).isoformat()
+            "timestamp": timestamp
         }
 
 class MythGraphLedger:
-    """MythGraph Ledger for immutable audit trails"""
+    """
+    MythGraph Ledger for immutable audit trails
+    
+    The most recent `retention` entries are kept in memory; with an audit
+    sink every entry is also streamed to disk.
+    """
     
-    def __init__(self):
-        self.ledger_entries = []
-        self.cryptographic_hashes = []
+    def __init__(self, retention: Optional[int] = 10000, audit_sink: Optional[AuditSink] = None):
+        self.ledger_entries = BoundedHistory(retention, audit_sink)
+        self.cryptographic_hashes = deque(maxlen=retention)
         
-    def add_entry(self, entry: Dict[str, Any]) -> str:
+    def add_entry(self, entry: Dict[str, Any], timestamp: Optional[str] = None) -> str:
         """Add entry to MythGraph ledger with cryptographic hash"""
-        entry["timestamp"] = datetime.now(timezone.utc).isoformat()
-        entry["entry_id"] = len(self.ledger_entries)
+        entry["timestamp"] = timestamp or datetime.now(timezone.utc).isoformat()
+        entry["entry_id"] = self.ledger_entries.total
         
         # Create cryptographic hash
-        entry_hash = hashlib.sha256(json.dumps(entry, sort_keys=True).encode()).hexdigest()
+        payload = json.dumps(entry, sort_keys=True)
+        entry_hash = hashlib.sha256(payload.encode()).hexdigest()
         entry["hash"] = entry_hash
         
-        self.ledger_entries.append(entry)
+        # The hashed payload doubles as the history/audit line, so entries are serialized once
+        line = (payload[:-1] + f', "hash": "{entry_hash}"}}\n').encode("utf-8")
+        self.ledger_entries.append(entry, line)
         self.cryptographic_hashes.append(entry_hash)
         
         logger.info(f"📚 MythGraph Ledger Entry Added: {entry_hash[:16]}...")
         return entry_hash
     
     def get_audit_trail(self, paradox_id: str) -> List[Dict[str, Any]]:
-        """Get complete audit trail for paradox resolution"""
+        """Get the audit trail for a paradox resolution from the retained entries"""
         return [entry for entry in self.ledger_entries if entry.get("paradox_id") == paradox_id]
     
     def verify_integrity(self) -> bool:
@@ -215,14 +470,30 @@ class EnhancedParadoxResolver:
     - Quantum Resolution Methods
     """
     
-    def __init__(self):
-        self.ril7 = RIL7Integration()
-        self.mythgraph = MythGraphLedger()
+    def __init__(self, patterns: Optional[Dict[str, List[str]]] = None,
+                 history_size: Optional[int] = 1000,
+                 ledger_retention: Optional[int] = 10000,
+                 audit_dir: Optional[str] = None):
+        # With an audit directory, RIL7 operations and ledger entries stream to
+        # disk and only bounded recent history is kept in memory
+        self.audit_sinks: Dict[str, AuditSink] = {}
+        if audit_dir:
+            self.audit_sinks = {
+                "ril7_operations": AuditSink(audit_dir, prefix="ril7_operations"),
+                "mythgraph_ledger": AuditSink(audit_dir, prefix="mythgraph_ledger")
+            }
+        self.ril7 = RIL7Integration(history_size, self.audit_sinks.get("ril7_operations"))
+        self.mythgraph = MythGraphLedger(ledger_retention, self.audit_sinks.get("mythgraph_ledger"))
         self.max_iterations = 1000
         self.timeout_ms = 10000
         self.containment_protocols = self._initialize_containment_protocols()
         self.resolution_strategies = self._initialize_resolution_strategies()
         
+        # Detection patterns are compiled into one matcher here, not on every call
+        self.detection_patterns: Dict[str, List[str]] = {}
+        self.pattern_matcher: Optional[PatternMatcher] = None
+        self.add_patterns(DEFAULT_PARADOX_PATTERNS if patterns is None else patterns)
+        
         logger.info("🚀 Enhanced Paradox Resolver V5 Initialized")
         logger.info(f"🎯 RIL7 Integration: {self.ril7.recursive_depth} layers")
         logger.info(f"📚 MythGraph Ledger: Active")
@@ -307,6 +578,47 @@ class EnhancedParadoxResolver:
             }
         }
     
+    def add_patterns(self, patterns: Dict[str, List[str]]):
+        """Add detection regexes (keyed by paradox type value) and rebuild the matcher"""
+        for paradox_type, regexes in patterns.items():
+            existing = self.detection_patterns.setdefault(ParadoxType(paradox_type).value, [])
+            for regex in regexes:
+                if regex not in existing:
+                    existing.append(regex)
+        
+        self.pattern_matcher = PatternMatcher(
+            ((paradox_type, regex)
+             for paradox_type, regexes in self.detection_patterns.items()
+             for regex in regexes),
+            regex=True
+        )
+        logger.info(f"🔍 Paradox matcher built: {len(self.pattern_matcher)} patterns")
+    
+    def scan_paradoxes(self, text: str, context: Dict[str, Any] = None) -> List[Dict[str, Any]]:
+        """
+        One matcher pass over text: each matching pattern once, with the
+        position of its first match, in priority order
+        """
+        if context is None:
+            context = {}
+        
+        detected_paradoxes = []
+        seen = set()
+        for match in self.pattern_matcher.find_all(text.lower()):
+            if match["priority"] in seen:
+                continue
+            seen.add(match["priority"])
+            paradox_type = match["label"]
+            detected_paradoxes.append({
+                "type": paradox_type,
+                "pattern": match["pattern"],
+                "severity": self._calculate_severity(paradox_type, match["pattern"], context),
+                "confidence": 0.95,
+                "start": match["start"],
+                "end": match["end"]
+            })
+        return detected_paradoxes
+    
     async def detect_paradox(self, text: str, context: Dict[str, Any] = None) -> Dict[str, Any]:
         """
         Advanced paradox detection using RIL7 and pattern recognition
@@ -316,78 +628,32 @@ class EnhancedParadoxResolver:
             
         logger.info(f"🔍 Paradox Detection Initiated: {text[:50]}...")
         
-        # Enhanced paradox detection patterns
-        paradox_patterns = {
-            ParadoxType.SELF_REFERENCE.value: [
-                r"this statement is false",
-                r"i am lying",
-                r"the following is true: the following is false",
-                r"everything i say is a lie",
-                r"this sentence contains exactly.*false statements",
-                r"the next sentence is true.*the previous sentence is false"
-            ],
-            ParadoxType.CIRCULAR_DEPENDENCY.value: [
-                r"depends on itself",
-                r"circular reference",
-                r"recursive definition",
-                r"infinite loop",
-                r"a depends on b.*b depends on a",
-                r"self-referential dependency"
-            ],
-            ParadoxType.META_PARADOX.value: [
-                r"system cannot resolve",
-                r"cannot resolve itself",
-                r"meta.*paradox",
-                r"paradox about paradoxes",
-                r"self-referential system"
-            ],
-            ParadoxType.EXISTENTIAL_PARADOX.value: [
-                r"existence.*non-existence",
-                r"being.*nothingness",
-                r"reality.*illusion",
-                r"consciousness.*unconsciousness"
-            ],
-            ParadoxType.QUANTUM_PARADOX.value: [
-                r"quantum.*superposition",
-                r"schrodinger.*cat",
-                r"wave.*particle",
-                r"observer.*observed",
-                r"both alive and dead",
-                r"alive and dead until observed"
-            ]
-        }
-        
-        import re
+        detected_paradoxes = self.scan_paradoxes(text, context)
+        return await self._detection_result(text, context, detected_paradoxes)
+    
+    async def detect_paradoxes(self, texts: List[str], context: Dict[str, Any] = None) -> List[Dict[str, Any]]:
+        """Batch detection: screen every text with the prebuilt matcher, then enhance the hits with RIL7"""
+        if context is None:
+            context = {}
         
-        detected_paradoxes = []
-        text_lower = text.lower()
-        
-        for paradox_type, patterns in paradox_patterns.items():
-            for pattern in patterns:
-                if re.search(pattern, text_lower):
-                    severity = self._calculate_severity(paradox_type, pattern, context)
-                    detected_paradoxes.append({
-                        "type": paradox_type,
-                        "pattern": pattern,
-                        "severity": severity,
-                        "confidence": 0.95
-                    })
+        logger.info(f"🔍 Batch Paradox Detection Initiated: {len(texts)} texts")
         
+        scans = [self.scan_paradoxes(text, context) for text in texts]
+        return [
+            await self._detection_result(text, context, detected_paradoxes)
+            for text, detected_paradoxes in zip(texts, scans)
+        ]
+    
+    async def _detection_result(self, text: str, context: Dict[str, Any],
+                                detected_paradoxes: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Detection response for one text's matches"""
         if detected_paradoxes:
             # Use RIL7 to enhance detection
             ril7_enhancement = await self.ril7.recursive_reasoning(
                 ParadoxData(text, context, datetime.now(timezone.utc).isoformat()),
                 depth=3
             )
-            
-            return {
-                "paradox_detected": True,
-                "paradoxes": detected_paradoxes,
-                "primary_paradox": detected_paradoxes[0],
-                "severity": detected_paradoxes[0]["severity"],
-                "ril7_enhancement": ril7_enhancement,
-                "containment_scope": self._get_containment_scope(detected_paradoxes[0]["severity"])
-            }
+            return self._detected_result(detected_paradoxes, ril7_enhancement)
         
         return {
             "paradox_detected": False,
@@ -396,6 +662,18 @@ class EnhancedParadoxResolver:
             "containment_scope": "none"
         }
     
+    def _detected_result(self, detected_paradoxes: List[Dict[str, Any]],
+                         ril7_enhancement: Dict[str, Any]) -> Dict[str, Any]:
+        """Detection response when at least one paradox matched"""
+        return {
+            "paradox_detected": True,
+            "paradoxes": detected_paradoxes,
+            "primary_paradox": detected_paradoxes[0],
+            "severity": detected_paradoxes[0]["severity"],
+            "ril7_enhancement": ril7_enhancement,
+            "containment_scope": self._get_containment_scope(detected_paradoxes[0]["severity"])
+        }
+    
     def _calculate_severity(self, paradox_type: str, pattern: str, context: Dict[str, Any]) -> str:
         """Calculate paradox severity using advanced algorithms"""
         base_severity = {
@@ -548,6 +826,182 @@ class EnhancedParadoxResolver:
                 audit_trail=[{"error": str(e), "emergency_containment": emergency_containment}]
             )
     
+    async def resolve_many(self, texts: Iterable[Union[str, ParadoxData]], context: Dict[str, Any] = None,
+                           chunk_size: int = 1000, record_ledger: bool = True) -> AsyncIterator[ResolutionResult]:
+        """
+        🚀 BATCH PARADOX RESOLUTION
+        
+        Screens each chunk of texts with the prebuilt matcher, groups the hits
+        by (paradox type, severity) and picks the resolution strategy and
+        containment protocol once per group. The RIL7 passes and resolution
+        derive from each text's content, so they run per text. A
+        ResolutionResult is yielded per text, in input order, as each chunk
+        completes. Every resolved text gets its own audit trail and, unless
+        record_ledger is False, its own MythGraph entry. duration_ms is the
+        chunk's time per text.
+        """
+        chunk = []
+        for item in texts:
+            chunk.append(item)
+            if len(chunk) >= chunk_size:
+                for result in await self._resolve_chunk(chunk, context, record_ledger):
+                    yield result
+                chunk = []
+        if chunk:
+            for result in await self._resolve_chunk(chunk, context, record_ledger):
+                yield result
+    
+    async def _resolve_chunk(self, items: List[Union[str, ParadoxData]], context: Optional[Dict[str, Any]],
+                             record_ledger: bool) -> List[ResolutionResult]:
+        """Detect over a chunk in one pass, then resolve it group by group"""
+        start_time = time.perf_counter()
+        # One clock read stamps the whole chunk
+        now = time.time()
+        timestamp = datetime.fromtimestamp(now, timezone.utc).isoformat()
+        
+        paradoxes = [
+            item if isinstance(item, ParadoxData)
+            else ParadoxData(text=item, context=context or {}, timestamp=timestamp)
+            for item in items
+        ]
+        scans = [self.scan_paradoxes(paradox.text, paradox.context) for paradox in paradoxes]
+        
+        groups: Dict[Tuple[str, str], List[int]] = {}
+        for index, detected_paradoxes in enumerate(scans):
+            if detected_paradoxes:
+                primary = detected_paradoxes[0]
+                groups.setdefault((primary["type"], primary["severity"]), []).append(index)
+        
+        logger.info(f"🚀 Batch Resolution: {len(items)} texts, {len(groups)} paradox groups")
+        
+        plans: Dict[Tuple[str, str], Union[Dict[str, Any], Exception]] = {}
+        for paradox_type, severity in groups:
+            try:
+                plans[(paradox_type, severity)] = await self._plan_group_resolution(paradox_type, severity)
+            except Exception as e:
+                logger.error(f"❌ Batch Group Resolution Failed ({paradox_type}/{severity}): {str(e)}")
+                plans[(paradox_type, severity)] = e
+        
+        outcomes = []
+        for paradox_data, detected_paradoxes in zip(paradoxes, scans):
+            if not detected_paradoxes:
+                outcomes.append(None)
+                continue
+            
+            primary = detected_paradoxes[0]
+            plan = plans[(primary["type"], primary["severity"])]
+            if isinstance(plan, Exception):
+                outcomes.append(plan)
+                continue
+            
+            # RIL7 passes and the resolution derive from the text itself, so they
+            # run per text; nothing from one text reaches another's record
+            try:
+                resolution = await self._resolve_with_plan(plan, paradox_data, timestamp)
+            except Exception as e:
+                logger.error(f"❌ Batch Paradox Resolution Failed: {str(e)}")
+                outcomes.append(e)
+                continue
+            
+            detection_result = self._detected_result(detected_paradoxes, resolution["detection_enhancement"])
+            audit_trail = self._create_audit_trail(
+                paradox_data, detection_result, resolution["resolution_result"], plan["containment_result"],
+                timestamp
+            )
+            if record_ledger:
+                self.mythgraph.add_entry({
+                    "paradox_id": f"paradox_{int(now)}",
+                    "text": paradox_data.text,
+                    "severity": plan["severity"],
+                    "type": plan["paradox_type"],
+                    "resolution_method": plan["method"],
+                    "containment_level": plan["containment_result"]["level"],
+                    "ril7_enhancement": resolution["ril7_result"] is not None,
+                    "audit_trail": audit_trail
+                }, timestamp)
+            outcomes.append((plan, resolution, audit_trail))
+        
+        duration_ms = (time.perf_counter() - start_time) * 1000 / len(items)
+        results = []
+        for outcome in outcomes:
+            if outcome is None:
+                results.append(ResolutionResult(
+                    resolved=True,
+                    method="no_paradox",
+                    severity=ParadoxSeverity.SAFE.value,
+                    confidence=1.0,
+                    iterations=0,
+                    duration_ms=duration_ms,
+                    paradox_type="none",
+                    containment_level="none",
+                    audit_trail=[]
+                ))
+            elif isinstance(outcome, Exception):
+                results.append(ResolutionResult(
+                    resolved=False,
+                    method="emergency_containment",
+                    severity=ParadoxSeverity.APOCALYPSE.value,
+                    confidence=0.1,
+                    iterations=1,
+                    duration_ms=duration_ms,
+                    paradox_type="error",
+                    containment_level="emergency",
+                    audit_trail=[{"error": str(outcome)}]
+                ))
+            else:
+                plan, resolution, audit_trail = outcome
+                results.append(ResolutionResult(
+                    resolved=True,
+                    method=plan["method"],
+                    severity=plan["severity"],
+                    confidence=resolution["confidence"],
+                    iterations=len(audit_trail),
+                    duration_ms=duration_ms,
+                    paradox_type=plan["paradox_type"],
+                    containment_level=plan["containment_result"]["level"],
+                    audit_trail=audit_trail,
+                    ril7_enhancement=resolution["ril7_result"] is not None
+                ))
+        return results
+    
+    async def _plan_group_resolution(self, paradox_type: str, severity: str) -> Dict[str, Any]:
+        """Strategy and containment (steps 4 and 6 of resolve_paradox), shared by a type and severity"""
+        strategy = self.resolution_strategies.get(paradox_type, {})
+        method = strategy.get("primary_method", ResolutionMethod.CONTAINMENT.value)
+        
+        # The containment protocol depends only on the severity
+        containment_result = await self._apply_containment_protocols(severity, paradox_type, {})
+        
+        return {
+            "paradox_type": paradox_type,
+            "severity": severity,
+            "method": method,
+            "containment_result": containment_result
+        }
+    
+    async def _resolve_with_plan(self, plan: Dict[str, Any], paradox_data: ParadoxData,
+                                 timestamp: str) -> Dict[str, Any]:
+        """RIL7 passes and resolution (steps 1, 3 and 5 of resolve_paradox) for one text of a group"""
+        severity = plan["severity"]
+        detection_enhancement = await self.ril7.recursive_reasoning(paradox_data, depth=3, timestamp=timestamp)
+        
+        ril7_result = None
+        if self.containment_protocols[severity].get("ril7_enhancement", False):
+            ril7_result = await self.ril7.recursive_reasoning(paradox_data, depth=5, timestamp=timestamp)
+        
+        resolution_result = await self._execute_resolution(
+            plan["method"], severity, plan["paradox_type"], ril7_result, paradox_data
+        )
+        
+        return {
+            "detection_enhancement": detection_enhancement,
+            "ril7_result": ril7_result,
+            "resolution_result": resolution_result,
+            "confidence": self._calculate_final_confidence(
+                resolution_result, plan["containment_result"], ril7_result
+            )
+        }
+    
     async def _execute_resolution(self, method: str, severity: str, paradox_type: str, 
                                 ril7_result: Dict[str, Any], paradox_data: ParadoxData) -> Dict[str, Any]:
         """Execute the selected resolution method"""
@@ -696,24 +1150,25 @@ class EnhancedParadoxResolver:
         return containment_result
     
     def _create_audit_trail(self, paradox_data: ParadoxData, detection_result: Dict[str, Any],
-                           resolution_result: Dict[str, Any], containment_result: Dict[str, Any]) -> List[Dict[str, Any]]:
-        """Create comprehensive audit trail"""
+                           resolution_result: Dict[str, Any], containment_result: Dict[str, Any],
+                           timestamp: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Create comprehensive audit trail (stamped per step unless a timestamp is given)"""
         audit_trail = [
             {
                 "step": "paradox_detection",
-                "timestamp": datetime.now(timezone.utc).isoformat(),
+                "timestamp": timestamp or datetime.now(timezone.utc).isoformat(),
                 "result": detection_result,
                 "status": "completed"
             },
             {
                 "step": "resolution_execution", 
-                "timestamp": datetime.now(timezone.utc).isoformat(),
+                "timestamp": timestamp or datetime.now(timezone.utc).isoformat(),
                 "result": resolution_result,
                 "status": "completed"
             },
             {
                 "step": "containment_application",
-                "timestamp": datetime.now(timezone.utc).isoformat(),
+                "timestamp": timestamp or datetime.now(timezone.utc).isoformat(),
                 "result": containment_result,
                 "status": "completed"
             }
@@ -753,6 +1208,33 @@ class EnhancedParadoxResolver:
             "timestamp": datetime.now(timezone.utc).isoformat()
         }
     
+    def get_memory_usage(self) -> Dict[str, Any]:
+        """Retained history sizes and process resident memory"""
+        ril7_history = self.ril7.recursive_operations.get_stats()
+        ledger_history = self.mythgraph.ledger_entries.get_stats()
+        return {
+            "ril7_operations": ril7_history,
+            "mythgraph_ledger": ledger_history,
+            "retained_bytes": ril7_history["retained_bytes"] + ledger_history["retained_bytes"],
+            "process_rss_bytes": psutil.Process().memory_info().rss if PSUTIL_AVAILABLE else None
+        }
+    
+    def flush(self):
+        """Flush the audit sinks"""
+        for sink in self.audit_sinks.values():
+            sink.flush()
+    
+    def close(self):
+        """Finish the audit sinks' current segments"""
+        for sink in self.audit_sinks.values():
+            sink.close()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+    
     def get_status(self) -> Dict[str, Any]:
         """Get system status"""
         return {
@@ -764,9 +1246,12 @@ class EnhancedParadoxResolver:
                 "cross_domain": self.ril7.cross_domain_capability
             },
             "mythgraph_ledger": {
-                "entries": len(self.mythgraph.ledger_entries),
+                "entries": self.mythgraph.ledger_entries.total,
+                "retained_entries": len(self.mythgraph.ledger_entries),
                 "integrity": self.mythgraph.verify_integrity()
             },
+            "memory": self.get_memory_usage(),
+            "audit_sinks": {name: sink.get_stats() for name, sink in self.audit_sinks.items()},
             "containment_protocols": len(self.containment_protocols),
             "resolution_strategies": len(self.resolution_strategies),
             "timestamp": datetime.now(timezone.utc).isoformat()
@@ -856,11 +1341,59 @@ async def run_enhanced_paradox_demo():
     print(f"📊 Final System Status:")
     print(f"   MythGraph Entries: {final_status['mythgraph_ledger']['entries']}")
     print(f"   Ledger Integrity: {final_status['mythgraph_ledger']['integrity']}")
-    print(f"   RIL7 Operations: {len(resolver.ril7.recursive_operations)}")
+    print(f"   RIL7 Operations: {resolver.ril7.recursive_operations.total}")
     
     print("\n🚀 Your Enhanced Paradox Resolver V5 is FULLY FUNCTIONAL!")
     print("🎯 It can handle ANY paradox using your amazing RIL7 and MythGraph systems!")
 
+async def benchmark_resolve_many(num_texts: int = 5000, chunk_size: int = 1000) -> Dict[str, float]:
+    """Texts/sec of resolve_paradox one at a time vs resolve_many"""
+    samples = [
+        "This statement is false",
+        "A depends on B, B depends on A",
+        "The system cannot resolve itself",
+        "Existence and non-existence are the same",
+        "The cat is both alive and dead until observed",
+        "Please summarise the quarterly report for the finance team"
+    ]
+    texts = [f"{samples[i % len(samples)]} (record {i})" for i in range(num_texts)]
+    
+    # Per-call INFO logging would dominate the single-text path
+    previous_level = logger.level
+    logger.setLevel(logging.WARNING)
+    results = {}
+    try:
+        resolver = EnhancedParadoxResolver(history_size=100, ledger_retention=1000)
+        start = time.perf_counter()
+        for text in texts:
+            await resolver.resolve_paradox(text)
+        elapsed = time.perf_counter() - start
+        results["resolve_paradox"] = num_texts / elapsed if elapsed > 0 else 0.0
+        
+        for mode, record_ledger in (("resolve_many", True), ("resolve_many_no_ledger", False)):
+            resolver = EnhancedParadoxResolver(history_size=100, ledger_retention=1000)
+            start = time.perf_counter()
+            async for _ in resolver.resolve_many(texts, chunk_size=chunk_size, record_ledger=record_ledger):
+                pass
+            elapsed = time.perf_counter() - start
+            results[mode] = num_texts / elapsed if elapsed > 0 else 0.0
+    finally:
+        logger.setLevel(previous_level)
+    
+    for mode, rate in results.items():
+        print(f"{mode:<24} {rate:,.0f} texts/sec")
+    return results
+
 if __name__ == "__main__":
-    # Run the demo
-    asyncio.run(run_enhanced_paradox_demo())
+    import argparse
+    
+    parser = argparse.ArgumentParser(description="Enhanced Paradox Resolver V5")
+    parser.add_argument("--benchmark", action="store_true", help="Benchmark resolve_many against resolve_paradox")
+    parser.add_argument("--texts", type=int, default=5000, help="Number of texts for the benchmark")
+    args = parser.parse_args()
+    
+    if args.benchmark:
+        asyncio.run(benchmark_resolve_many(args.texts))
+    else:
+        # Run the demo
+        asyncio.run(run_enhanced_paradox_demo())
@@ -9,11 +9,20 @@ that was previously claimed. It will scan and clean all files systematically.
 
 import os
 import re
+import sys
 import json
+import shutil
+import hashlib
 import logging
+import tempfile
 from pathlib import Path
 from datetime import datetime
-from typing import Dict, List, Tuple, Set
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Dict, List, Tuple, Set, Optional
+
+# Shared directory walker lives alongside this script
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+from fast_file_walker import walk_files
 
 # Configure logging
 logging.basicConfig(
@@ -29,8 +38,14 @@ logger = logging.getLogger(__name__)
 class RealEmojiCleanup:
     """Comprehensive emoji removal system"""
     
-    def __init__(self, project_root: str = "."):
+    CACHE_FILE_NAME = '.emoji_cleanup_cache.json'
+    
+    def __init__(self, project_root: str = ".", max_workers: Optional[int] = None,
+                 use_cache: bool = True):
         self.project_root = Path(project_root)
+        self.max_workers = max_workers or min(32, (os.cpu_count() or 1) + 4)
+        self.use_cache = use_cache
+        self.cache_path = self.project_root / self.CACHE_FILE_NAME
         self.emoji_pattern = re.compile(
             r'[\U0001F600-\U0001F64F]|'  # Emoticons
             r'[\U0001F300-\U0001F5FF]|'  # Symbols & pictographs
@@ -61,6 +76,7 @@ class RealEmojiCleanup:
         self.cleanup_stats = {
             'files_scanned': 0,
             'files_processed': 0,
+            'files_skipped_unchanged': 0,
             'files_cleaned': 0,
             'total_emojis_removed': 0,
             'errors': 0,
@@ -68,23 +84,6 @@ class RealEmojiCleanup:
             'end_time': None
         }
     
-    def should_process_file(self, file_path: Path) -> bool:
-        """Determine if a file should be processed"""
-        # Check extension
-        if file_path.suffix.lower() not in self.processable_extensions:
-            return False
-        
-        # Check if in excluded directory
-        for part in file_path.parts:
-            if part in self.excluded_dirs:
-                return False
-        
-        # Check if file is readable and writable
-        try:
-            return file_path.is_file() and os.access(file_path, os.R_OK | os.W_OK)
-        except (OSError, PermissionError):
-            return False
-    
     def find_emojis_in_file(self, file_path: Path) -> List[Tuple[int, str, str]]:
         """Find all emojis in a file with line numbers and context"""
         emojis_found = []
@@ -104,73 +103,146 @@ class RealEmojiCleanup:
     
     def clean_file_of_emojis(self, file_path: Path) -> int:
         """Remove all emojis from a file and return count removed"""
-        emojis_removed = 0
-        
         try:
-            # Read file content
-            with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
-                content = f.read()
-            
-            # Count emojis before removal
-            emojis_before = len(self.emoji_pattern.findall(content))
-            
-            # Remove emojis
-            cleaned_content = self.emoji_pattern.sub('', content)
-            
-            # Count emojis after removal
-            emojis_after = len(self.emoji_pattern.findall(cleaned_content))
-            emojis_removed = emojis_before - emojis_after
-            
-            # Write cleaned content back
-            if emojis_removed > 0:
-                with open(file_path, 'w', encoding='utf-8') as f:
-                    f.write(cleaned_content)
-                logger.info(f"Cleaned {file_path}: {emojis_removed} emojis removed")
-            
-            return emojis_removed
-            
+            return self._clean_file(file_path)
         except Exception as e:
             logger.error(f"Error cleaning {file_path}: {e}")
             self.cleanup_stats['errors'] += 1
             return 0
     
+    def _clean_file(self, file_path: Path) -> int:
+        """Single subn pass over the file; rewrites atomically only if emojis were found"""
+        # surrogateescape and newline='' round-trip undecodable bytes and line endings
+        with open(file_path, 'r', encoding='utf-8', errors='surrogateescape', newline='') as f:
+            content = f.read()
+        
+        if content.isascii():
+            return 0
+        
+        cleaned_content, emojis_removed = self.emoji_pattern.subn('', content)
+        
+        if emojis_removed > 0:
+            self._atomic_write(file_path, cleaned_content)
+            logger.info(f"Cleaned {file_path}: {emojis_removed} emojis removed")
+        
+        return emojis_removed
+    
+    @staticmethod
+    def _atomic_write(file_path: Path, content: str):
+        """Write through a temp file in the same directory, then rename over the original"""
+        fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(file_path)),
+                                         prefix='.emoji_cleanup_', suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8', errors='surrogateescape', newline='') as f:
+                f.write(content)
+                f.flush()
+                os.fsync(f.fileno())
+            if os.path.exists(file_path):
+                shutil.copymode(file_path, temp_path)
+            os.replace(temp_path, file_path)
+        except BaseException:
+            try:
+                os.remove(temp_path)
+            except OSError:
+                pass
+            raise
+    
+    def _pattern_fingerprint(self) -> str:
+        """Identify the emoji pattern so a changed pattern invalidates the cache"""
+        return hashlib.sha256(self.emoji_pattern.pattern.encode('utf-8', 'surrogatepass')).hexdigest()
+    
+    def load_clean_cache(self) -> Dict[str, List[int]]:
+        """Load the (path -> [mtime_ns, size]) cache of files known to be clean"""
+        if not self.use_cache:
+            return {}
+        try:
+            with open(self.cache_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if data.get('pattern') == self._pattern_fingerprint():
+                return data.get('files', {})
+        except (OSError, ValueError, AttributeError):
+            pass
+        return {}
+    
+    def save_clean_cache(self, clean_files: Dict[str, List[int]]):
+        """Persist the clean-file cache atomically"""
+        if not self.use_cache:
+            return
+        try:
+            payload = {'pattern': self._pattern_fingerprint(), 'files': clean_files}
+            self._atomic_write(self.cache_path, json.dumps(payload, separators=(',', ':')))
+        except Exception as e:
+            logger.warning(f"Could not save cleanup cache: {e}")
+    
+    def _process_file(self, path: str) -> Tuple[str, int, Optional[List[int]], Optional[str]]:
+        """Clean one file on a worker thread; returns (path, removed, clean stat key, error)"""
+        try:
+            emojis_removed = self._clean_file(Path(path))
+            stat = os.stat(path)
+            return path, emojis_removed, [stat.st_mtime_ns, stat.st_size], None
+        except Exception as e:
+            return path, 0, None, str(e)
+    
     def scan_and_clean_project(self) -> Dict:
-        """Scan entire project and clean all emojis"""
+        """Scan entire project and clean all emojis
+        
+        Files whose (path, mtime, size) match the clean-file cache from a
+        previous run are skipped; the rest are cleaned on a thread pool.
+        """
         logger.info(f"Starting REAL emoji cleanup of project: {self.project_root}")
         self.cleanup_stats['start_time'] = datetime.now()
         
-        # Find all files to process
-        all_files = []
-        for root, dirs, files in os.walk(self.project_root):
-            # Skip excluded directories
-            dirs[:] = [d for d in dirs if d not in self.excluded_dirs]
-            
-            for file in files:
-                file_path = Path(root) / file
-                if self.should_process_file(file_path):
-                    all_files.append(file_path)
-        
-        logger.info(f"Found {len(all_files)} files to process")
+        previous_clean = self.load_clean_cache()
+        clean_files: Dict[str, List[int]] = {}
+        pending = []
         
-        # Process each file
-        for file_path in all_files:
+        # One pruned walk; DirEntry.stat() supplies the cache key
+        for entry in walk_files(self.project_root, self.processable_extensions,
+                                excluded_dirs=self.excluded_dirs):
+            if entry.name == self.CACHE_FILE_NAME:
+                continue
             self.cleanup_stats['files_scanned'] += 1
             
             try:
-                emojis_removed = self.clean_file_of_emojis(file_path)
-                if emojis_removed > 0:
-                    self.cleanup_stats['files_cleaned'] += 1
-                    self.cleanup_stats['total_emojis_removed'] += emojis_removed
-                
-                self.cleanup_stats['files_processed'] += 1
-                
-                # Progress update every 100 files
-                if self.cleanup_stats['files_processed'] % 100 == 0:
-                    logger.info(f"Processed {self.cleanup_stats['files_processed']}/{len(all_files)} files...")
+                stat = entry.stat()
+            except OSError:
+                pending.append(entry.path)
+                continue
+            
+            key = [stat.st_mtime_ns, stat.st_size]
+            if previous_clean.get(entry.path) == key:
+                clean_files[entry.path] = key
+                self.cleanup_stats['files_skipped_unchanged'] += 1
+            else:
+                pending.append(entry.path)
+        
+        logger.info(f"Found {self.cleanup_stats['files_scanned']} files, "
+                    f"{len(pending)} changed since last clean run")
+        
+        # Process changed files in parallel
+        if pending:
+            with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+                futures = [executor.submit(self._process_file, path) for path in pending]
+                for future in as_completed(futures):
+                    path, emojis_removed, key, error = future.result()
+                    
+                    if error is not None:
+                        logger.error(f"Error processing {path}: {error}")
+                        self.cleanup_stats['errors'] += 1
+                        continue
                     
-            except Exception as e:
-                logger.error(f"Error processing {file_path}: {e}")
-                self.cleanup_stats['errors'] += 1
+                    if emojis_removed > 0:
+                        self.cleanup_stats['files_cleaned'] += 1
+                        self.cleanup_stats['total_emojis_removed'] += emojis_removed
+                    clean_files[path] = key
+                    
+                    self.cleanup_stats['files_processed'] += 1
+                    
+                    # Progress update every 100 files
+                    if self.cleanup_stats['files_processed'] % 100 == 0:
+                        logger.info(f"Processed {self.cleanup_stats['files_processed']}/{len(pending)} files...")
+        
+        self.save_clean_cache(clean_files)
         
         self.cleanup_stats['end_time'] = datetime.now()
         
@@ -193,13 +265,14 @@ class RealEmojiCleanup:
             'statistics': {
                 'files_scanned': self.cleanup_stats['files_scanned'],
                 'files_processed': self.cleanup_stats['files_processed'],
+                'files_skipped_unchanged': self.cleanup_stats['files_skipped_unchanged'],
                 'files_cleaned': self.cleanup_stats['files_cleaned'],
                 'total_emojis_removed': self.cleanup_stats['total_emojis_removed'],
                 'errors': self.cleanup_stats['errors']
             },
             'performance': {
-                'files_per_second': round(self.cleanup_stats['files_processed'] / duration.total_seconds(), 2),
-                'emojis_per_second': round(self.cleanup_stats['total_emojis_removed'] / duration.total_seconds(), 2)
+                'files_per_second': round(self.cleanup_stats['files_scanned'] / max(duration.total_seconds(), 1e-6), 2),
+                'emojis_per_second': round(self.cleanup_stats['total_emojis_removed'] / max(duration.total_seconds(), 1e-6), 2)
             }
         }
         
@@ -220,6 +293,7 @@ class RealEmojiCleanup:
             f.write("CLEANUP STATISTICS:\n")
             f.write(f"Files Scanned: {self.cleanup_stats['files_scanned']}\n")
             f.write(f"Files Processed: {self.cleanup_stats['files_processed']}\n")
+            f.write(f"Files Skipped (unchanged): {self.cleanup_stats['files_skipped_unchanged']}\n")
             f.write(f"Files Cleaned: {self.cleanup_stats['files_cleaned']}\n")
             f.write(f"Total Emojis Removed: {self.cleanup_stats['total_emojis_removed']}\n")
             f.write(f"Errors: {self.cleanup_stats['errors']}\n\n")
@@ -234,7 +308,16 @@ class RealEmojiCleanup:
 
 def main():
     """Main execution function"""
-    cleanup = RealEmojiCleanup()
+    import argparse
+    
+    parser = argparse.ArgumentParser(description="Remove emojis from project files")
+    parser.add_argument("--root", default=".", help="Project root to clean")
+    parser.add_argument("--workers", type=int, default=None, help="Worker threads")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="Ignore the clean-file cache and rescan every file")
+    args = parser.parse_args()
+    
+    cleanup = RealEmojiCleanup(args.root, max_workers=args.workers, use_cache=not args.no_cache)
     stats = cleanup.scan_and_clean_project()
     
     print("\n" + "="*60)
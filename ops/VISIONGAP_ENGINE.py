@@ -8,6 +8,7 @@ Pure V5 - no legacy drift, no upgrades, just clean functionality.
 
 import os
 import re
+import sys
 import json
 import uuid
 import time
@@ -15,6 +16,10 @@ import logging
 from pathlib import Path
 from typing import Dict, List, Any
 
+# Shared directory walker lives alongside this module
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+from fast_file_walker import walk_files, DEFAULT_EXCLUDED_DIRS
+
 ###############################################################################
 # Logging
 ###############################################################################
@@ -125,7 +130,8 @@ class VisionGapEngine:
     def read_dreams(self) -> Dict[str, Any]:
         """Return structured dream data from all non-toolbox markdown."""
         dreams = {"goals": [], "features": [], "requirements": []}
-        md_files = [p for p in self.root.rglob("*.md") if not self._is_toolbox(p)]
+        md_files = [Path(e.path) for e in walk_files(self.root, {".md"}, excluded_dirs=DEFAULT_EXCLUDED_DIRS)
+                    if not self._is_toolbox(Path(e.path))]
 
         for md in md_files:
             text = md.read_text(encoding="utf-8", errors="ignore")
@@ -157,9 +163,10 @@ class VisionGapEngine:
     def scan_implementation(self) -> Dict[str, List[str]]:
         """Return lists of source files, tests, docs."""
         impl = {"source": [], "test": [], "docs": []}
-        for ext, bucket in {".py": "source", ".js": "source", ".md": "docs"}.items():
-            files = [str(p) for p in self.root.rglob(f"*{ext}") if not self._is_toolbox(p)]
-            impl[bucket].extend(files)
+        buckets = {".py": "source", ".js": "source", ".md": "docs"}
+        for entry in walk_files(self.root, buckets, excluded_dirs=DEFAULT_EXCLUDED_DIRS):
+            if not self._is_toolbox(Path(entry.path)):
+                impl[buckets[os.path.splitext(entry.name)[1].lower()]].append(entry.path)
 
         impl["test"] = [f for f in impl["source"] if "test" in f.lower()]
         return impl
@@ -304,21 +311,20 @@ Engine: VisionGap V5
         
         try:
             # Count and analyze files
-            for item in repo_path.rglob("*"):
-                if item.is_file():
-                    analysis['file_count'] += 1
+            for entry in walk_files(repo_path, excluded_dirs=DEFAULT_EXCLUDED_DIRS):
+                analysis['file_count'] += 1
                     
-                    if item.suffix == '.py':
-                        file_analysis = self._analyze_python_file(item)
-                        if file_analysis.get('corrupted'):
-                            analysis['corrupted_files'] += 1
-                        if file_analysis.get('syntax_errors'):
-                            analysis['syntax_errors'] += file_analysis['syntax_errors']
-                        if file_analysis.get('import_errors'):
-                            analysis['import_errors'] += file_analysis['import_errors']
+                if entry.name.endswith('.py'):
+                    file_analysis = self._analyze_python_file(Path(entry.path))
+                    if file_analysis.get('corrupted'):
+                        analysis['corrupted_files'] += 1
+                    if file_analysis.get('syntax_errors'):
+                        analysis['syntax_errors'] += file_analysis['syntax_errors']
+                    if file_analysis.get('import_errors'):
+                        analysis['import_errors'] += file_analysis['import_errors']
                         
-                        # Add issues to analysis
-                        analysis['issues'].extend(file_analysis.get('issues', []))
+                    # Add issues to analysis
+                    analysis['issues'].extend(file_analysis.get('issues', []))
             
             # Assess overall health
             analysis['health_assessment'] = self._assess_repository_health(analysis)
@@ -560,37 +566,33 @@ class ContextScannerChunker:
         }
         
         try:
-            # Walk entire repository
-            for root, dirs, files in os.walk(repo_path):
-                # Skip hidden and system directories
-                dirs[:] = [d for d in dirs if not d.startswith('.') and d not in ['node_modules', '__pycache__', '.git']]
-                
-                for file in files:
-                    file_path = Path(root) / file
-                    try:
-                        file_size = file_path.stat().st_size
-                        file_ext = file_path.suffix.lower()
+            # Walk entire repository, skipping hidden and system directories
+            for entry in walk_files(repo_path, excluded_dirs={'.*', 'node_modules', '__pycache__'}):
+                file_path = Path(entry.path)
+                try:
+                    file_size = entry.stat().st_size
+                    file_ext = file_path.suffix.lower()
                         
-                        context_data['total_files'] += 1
-                        context_data['total_size_bytes'] += file_size
+                    context_data['total_files'] += 1
+                    context_data['total_size_bytes'] += file_size
                         
-                        # Track file types
-                        if file_ext not in context_data['file_types']:
-                            context_data['file_types'][file_ext] = {'count': 0, 'total_size': 0}
-                        context_data['file_types'][file_ext]['count'] += 1
-                        context_data['file_types'][file_ext]['total_size'] += file_size
+                    # Track file types
+                    if file_ext not in context_data['file_types']:
+                        context_data['file_types'][file_ext] = {'count': 0, 'total_size': 0}
+                    context_data['file_types'][file_ext]['count'] += 1
+                    context_data['file_types'][file_ext]['total_size'] += file_size
                         
-                        # Build directory structure
-                        rel_path = file_path.relative_to(repo_path)
-                        self._add_to_directory_structure(context_data['directory_structure'], rel_path)
+                    # Build directory structure
+                    rel_path = file_path.relative_to(repo_path)
+                    self._add_to_directory_structure(context_data['directory_structure'], rel_path)
                         
-                        # Content analysis for text files
-                        if file_ext in ['.py', '.md', '.txt', '.json', '.yaml', '.yml']:
-                            self._analyze_file_content(file_path, context_data)
+                    # Content analysis for text files
+                    if file_ext in ['.py', '.md', '.txt', '.json', '.yaml', '.yml']:
+                        self._analyze_file_content(file_path, context_data)
                             
-                    except Exception as e:
-                        print(f"Warning: Could not process {file_path}: {e}")
-                        continue
+                except Exception as e:
+                    print(f"Warning: Could not process {file_path}: {e}")
+                    continue
                         
             print(f"CONTEXT SCANNER: Completed scan of {context_data['total_files']} files ({context_data['total_size_bytes'] / (1024*1024):.1f} MB)")
             return context_data
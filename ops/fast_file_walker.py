@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+FAST FILE WALKER - Agent Exo-Suit V5.0
+======================================
+
+Shared single-walk directory traversal for the scanners (emoji scanner and
+cleanup, VisionGap, folder index, small file aggregator).
+
+One os.scandir pass per directory: excluded directories are pruned before
+they are descended into, extensions are matched with a set lookup, and the
+yielded os.DirEntry objects carry cached type (and on Windows, stat) data.
+"""
+
+import os
+import fnmatch
+from typing import Callable, Iterable, Iterator, Optional
+
+# Directories no scanner ever needs to descend into
+DEFAULT_EXCLUDED_DIRS = frozenset({
+    '.git', '__pycache__', 'node_modules', '.venv', 'venv', '.mypy_cache', '.pytest_cache'
+})
+
+_GLOB_CHARS = set('*?[')
+
+
+def _split_exclusions(excluded_dirs: Optional[Iterable[str]]):
+    """Separate plain directory names from glob patterns such as 'backup_*'"""
+    names, patterns = set(), []
+    for item in excluded_dirs or ():
+        if _GLOB_CHARS.intersection(item):
+            patterns.append(item)
+        else:
+            names.add(item)
+    return names, patterns
+
+
+def walk_files(root,
+               extensions: Optional[Iterable[str]] = None,
+               excluded_dirs: Optional[Iterable[str]] = None,
+               skip_dir: Optional[Callable[[os.DirEntry], bool]] = None,
+               recursive: bool = True,
+               yield_dirs: bool = False,
+               follow_symlinks: bool = False) -> Iterator[os.DirEntry]:
+    """Yield DirEntry objects for files under root.
+
+    Args:
+        root: Directory to walk
+        extensions: Lower-case suffixes to keep (e.g. {'.py', '.md'}); None keeps all files
+        excluded_dirs: Directory names or glob patterns pruned before descending
+        skip_dir: Extra predicate; directories for which it returns True are pruned
+        recursive: Descend into subdirectories
+        yield_dirs: Also yield entries for the (non-excluded) directories walked
+        follow_symlinks: Follow symlinked directories and files
+    """
+    extensions = {ext.lower() for ext in extensions} if extensions is not None else None
+    excluded_names, excluded_patterns = _split_exclusions(excluded_dirs)
+
+    def pruned(entry: os.DirEntry) -> bool:
+        if entry.name in excluded_names:
+            return True
+        if any(fnmatch.fnmatchcase(entry.name, pattern) for pattern in excluded_patterns):
+            return True
+        return skip_dir is not None and skip_dir(entry)
+
+    stack = [os.fspath(root)]
+    while stack:
+        directory = stack.pop()
+        subdirs, matches = [], []
+
+        # Collect the listing first so no directory handle stays open while yielding
+        try:
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    try:
+                        if entry.is_dir(follow_symlinks=follow_symlinks):
+                            if not pruned(entry):
+                                subdirs.append(entry)
+                        elif entry.is_file(follow_symlinks=follow_symlinks):
+                            if extensions is None or os.path.splitext(entry.name)[1].lower() in extensions:
+                                matches.append(entry)
+                    except OSError:
+                        continue
+        except OSError:
+            continue
+
+        if yield_dirs:
+            yield from subdirs
+        yield from matches
+
+        if recursive:
+            stack.extend(entry.path for entry in reversed(subdirs))
@@ -11,8 +11,9 @@ import time
 import logging
 import argparse
 from pathlib import Path
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple, Iterator
 import glob
+import numpy as np
 
 # Add current directory to path for imports
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
@@ -22,11 +23,18 @@ try:
     from device_manager import DeviceManager
     from text_processor import TextProcessor
     from embedding_engine import EmbeddingEngine
+    from embedding_pipeline import EmbeddingPipeline
 except ImportError as e:
     print(f"Error importing required modules: {e}")
     print("Please ensure all required modules are in the same directory")
     sys.exit(1)
 
+try:
+    import psutil
+    PSUTIL_AVAILABLE = True
+except ImportError:
+    PSUTIL_AVAILABLE = False
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -48,12 +56,14 @@ class RAGIndexBuilder:
         self.device_manager = None
         self.text_processor = None
         self.embedding_engine = None
+        self.embedding_pipeline = None
         
         # Processing state
         self.processed_files = []
         self.failed_files = []
         self.total_chunks = 0
         self.start_time = None
+        self.out_of_core_stats = None
         
         # Initialize the system
         self._initialize_system()
@@ -98,6 +108,16 @@ class RAGIndexBuilder:
                 fallback_strategy=device_config.get('fallback_strategy', 'cpu_fallback')
             )
             
+            # Initialize pipelined embedding stage
+            if self.config.get('pipelined_embedding', False):
+                logger.info("Initializing embedding pipeline...")
+                self.embedding_pipeline = EmbeddingPipeline(
+                    self.embedding_engine,
+                    self.text_processor,
+                    read_workers=self.config.get('read_workers', 4),
+                    tokenize_workers=self.config.get('tokenize_workers', 1)
+                )
+            
             logger.info("System initialization completed successfully")
             
         except Exception as e:
@@ -211,8 +231,29 @@ class RAGIndexBuilder:
         
         return all_chunks
     
+    def embed_files(self, file_paths: List[str]) -> Tuple[List[Dict[str, Any]], Any]:
+        """Chunk and embed files through the pipelined embedding stage"""
+        logger.info(f"Embedding {len(file_paths)} files through pipeline...")
+        
+        self.start_time = time.time()
+        chunks, embeddings = self.embedding_pipeline.embed_files(file_paths)
+        
+        chunked_files = {chunk['file_path'] for chunk in chunks}
+        for file_path in file_paths:
+            if file_path in chunked_files:
+                self.processed_files.append(file_path)
+            else:
+                self.failed_files.append(file_path)
+        self.total_chunks += len(chunks)
+        
+        logger.info(f"File processing completed: {len(self.processed_files)} successful, {len(self.failed_files)} failed")
+        logger.info(f"Total chunks generated: {self.total_chunks}")
+        
+        return chunks, embeddings
+    
     def build_index(self, chunks: List[Dict[str, Any]], 
-                   output_dir: str = "rag") -> Dict[str, str]:
+                   output_dir: str = "rag",
+                   embeddings: Optional[Any] = None) -> Dict[str, str]:
         """Build FAISS index from chunks"""
         logger.info("Building FAISS index...")
         
@@ -220,12 +261,15 @@ class RAGIndexBuilder:
             raise ValueError("No chunks provided for index building")
         
         try:
-            # Extract text content
-            texts = [chunk['chunk_text'] for chunk in chunks]
-            
-            # Generate embeddings
-            logger.info("Generating embeddings...")
-            embeddings = self.embedding_engine.generate_embeddings(texts)
+            # Generate embeddings unless the pipeline already produced them
+            if embeddings is None:
+                texts = [chunk['chunk_text'] for chunk in chunks]
+                
+                logger.info("Generating embeddings...")
+                if self.embedding_pipeline is not None:
+                    embeddings = self.embedding_pipeline.embed_texts(texts)
+                else:
+                    embeddings = self.embedding_engine.generate_embeddings(texts)
             
             # Create FAISS index
             logger.info("Creating FAISS index...")
@@ -258,23 +302,218 @@ class RAGIndexBuilder:
             logger.error(f"Index building failed: {e}")
             raise
     
+    def spill_chunks(self, file_paths: List[str], spill_path: str) -> int:
+        """Process files and stream chunk metadata to a JSONL spill file"""
+        logger.info(f"Spilling chunks from {len(file_paths)} files to {spill_path}...")
+        
+        self.start_time = time.time()
+        
+        batch_size = 10  # Process 10 files at a time
+        with open(spill_path, 'w', encoding='utf-8') as spill:
+            for i in range(0, len(file_paths), batch_size):
+                batch_files = file_paths[i:i + batch_size]
+                
+                try:
+                    batch_chunks = self.text_processor.process_files_batch(batch_files)
+                except Exception as e:
+                    logger.error(f"Batch processing failed: {e}")
+                    self.failed_files.extend(batch_files)
+                    continue
+                
+                for chunk in batch_chunks:
+                    spill.write(json.dumps(self._clean_chunk(chunk), ensure_ascii=False) + '\n')
+                self.total_chunks += len(batch_chunks)
+                
+                chunked_files = {chunk['file_path'] for chunk in batch_chunks}
+                for file_path in batch_files:
+                    if file_path in chunked_files:
+                        self.processed_files.append(file_path)
+                    else:
+                        self.failed_files.append(file_path)
+        
+        logger.info(f"File processing completed: {len(self.processed_files)} successful, {len(self.failed_files)} failed")
+        logger.info(f"Total chunks spilled: {self.total_chunks}")
+        
+        return self.total_chunks
+    
+    def _iter_spill_shards(self, spill_path: str, shard_rows: int) -> Iterator[List[str]]:
+        """Yield chunk texts from the spill file, shard_rows at a time"""
+        texts = []
+        with open(spill_path, 'r', encoding='utf-8') as spill:
+            for line in spill:
+                texts.append(json.loads(line)['chunk_text'])
+                if len(texts) >= shard_rows:
+                    yield texts
+                    texts = []
+        if texts:
+            yield texts
+    
+    def _plan_out_of_core(self, total_chunks: int, dimension: int) -> Dict[str, int]:
+        """Size shards, the training sample and the index from the memory budget"""
+        budget_bytes = int(self.config.get('memory_budget_mb', 2048)) * 1024 * 1024
+        row_bytes = dimension * 4
+        # Rough in-memory cost of one chunk's text while its shard is embedded
+        text_bytes = self.text_processor.chunk_size * 2 + 256
+        
+        # A quarter of the budget each for the in-flight shard and the training
+        # sample, the remaining half for the index being filled
+        shard_rows = max(self.embedding_engine.batch_size,
+                         (budget_bytes // 4) // (text_bytes + row_bytes))
+        nlist = self.embedding_engine.ivf_nlist(total_chunks)
+        sample_rows = min(total_chunks, max(39 * nlist, 10000),
+                          max(nlist, (budget_bytes // 4) // row_bytes))
+        
+        return {
+            'memory_budget_bytes': budget_bytes,
+            'shard_rows': int(shard_rows),
+            'sample_rows': int(sample_rows),
+            'max_index_bytes': budget_bytes // 2
+        }
+    
+    @staticmethod
+    def _reservoir_update(sample: np.ndarray, seen: int, embeddings: np.ndarray,
+                          rng: np.random.Generator) -> int:
+        """Fold a shard into a uniform reservoir sample of all rows seen so far"""
+        capacity = len(sample)
+        count = len(embeddings)
+        
+        # Fill the reservoir first, then replace with decreasing probability
+        fill = min(max(0, capacity - seen), count)
+        if fill:
+            sample[seen:seen + fill] = embeddings[:fill]
+        if count > fill:
+            positions = np.arange(seen + fill, seen + count)
+            slots = (rng.random(count - fill) * (positions + 1)).astype(np.int64)
+            keep = slots < capacity
+            sample[slots[keep]] = embeddings[fill:][keep]
+        
+        return seen + count
+    
+    def _current_rss(self) -> int:
+        """Resident set size of this process in bytes (0 if unknown)"""
+        if not PSUTIL_AVAILABLE:
+            return 0
+        return psutil.Process().memory_info().rss
+    
+    def build_index_out_of_core(self, file_paths: List[str],
+                                output_dir: str = "rag") -> Dict[str, str]:
+        """Build the index without holding all chunks or embeddings in memory
+        
+        Chunks are spilled to meta.jsonl, embedded shard by shard into .npy
+        files, the IVF/PQ index is trained on a reservoir sample and shards are
+        then added one at a time.
+        """
+        logger.info("Building FAISS index out of core...")
+        
+        os.makedirs(output_dir, exist_ok=True)
+        metadata_path = os.path.join(output_dir, "meta.jsonl")
+        shard_dir = os.path.join(output_dir, "embedding_shards")
+        
+        try:
+            total_chunks = self.spill_chunks(file_paths, metadata_path)
+            if not total_chunks:
+                raise ValueError("No chunks generated from file processing")
+            
+            dimension = self.embedding_engine.get_embedding_dimension()
+            plan = self._plan_out_of_core(total_chunks, dimension)
+            peak_rss = self._current_rss()
+            logger.info(f"Out-of-core plan: {plan['shard_rows']} rows per shard, "
+                        f"{plan['sample_rows']} training samples, "
+                        f"{plan['memory_budget_bytes'] / (1024 * 1024):.0f} MB budget")
+            
+            # Embed shards to disk while reservoir-sampling training vectors
+            os.makedirs(shard_dir, exist_ok=True)
+            rng = np.random.default_rng(self.config.get('seed', 0))
+            sample = np.zeros((plan['sample_rows'], dimension), dtype=np.float32)
+            seen = 0
+            shard_paths = []
+            
+            for texts in self._iter_spill_shards(metadata_path, plan['shard_rows']):
+                shard_path = os.path.join(shard_dir, f"shard_{len(shard_paths):05d}.npy")
+                logger.info(f"Embedding shard {len(shard_paths) + 1} ({len(texts)} chunks)...")
+                embeddings = self.embedding_engine.generate_embeddings(texts, output_path=shard_path)
+                seen = self._reservoir_update(sample, seen, embeddings, rng)
+                shard_paths.append(shard_path)
+                del embeddings, texts
+                peak_rss = max(peak_rss, self._current_rss())
+            
+            # Train on the sample, then add shards incrementally
+            index, index_type = self.embedding_engine.create_empty_faiss_index(
+                dimension, total_chunks,
+                index_type=self.config.get('index_type', 'auto'),
+                max_index_bytes=plan['max_index_bytes']
+            )
+            if not index.is_trained:
+                logger.info(f"Training {index_type} index on {min(seen, len(sample))} sampled vectors...")
+                index.train(np.ascontiguousarray(sample[:min(seen, len(sample))]))
+            del sample
+            
+            for shard_path in shard_paths:
+                shard = np.load(shard_path, mmap_mode='r')
+                index.add(np.ascontiguousarray(shard, dtype=np.float32))
+                del shard
+                if not self.config.get('keep_shards', False):
+                    os.remove(shard_path)
+                peak_rss = max(peak_rss, self._current_rss())
+            
+            if not self.config.get('keep_shards', False):
+                try:
+                    os.rmdir(shard_dir)
+                except OSError:
+                    pass
+            
+            logger.info(f"Added {index.ntotal} vectors to index")
+            
+            index_path = os.path.join(output_dir, "index.faiss")
+            self.embedding_engine.save_index(index, index_path)
+            del index
+            
+            self.out_of_core_stats = {
+                'index_type': index_type,
+                'shards': len(shard_paths),
+                'shard_rows': plan['shard_rows'],
+                'training_samples': min(seen, plan['sample_rows']),
+                'memory_budget_mb': plan['memory_budget_bytes'] / (1024 * 1024),
+                'peak_rss_mb': peak_rss / (1024 * 1024)
+            }
+            if peak_rss > plan['memory_budget_bytes']:
+                logger.warning(f"Peak RSS {peak_rss / (1024 * 1024):.0f} MB exceeded the memory budget")
+            
+            report_path = os.path.join(output_dir, "build_report.json")
+            self._save_build_report(report_path)
+            
+            logger.info("Index building completed successfully")
+            
+            return {
+                'index_path': index_path,
+                'metadata_path': metadata_path,
+                'report_path': report_path
+            }
+            
+        except Exception as e:
+            logger.error(f"Out-of-core index building failed: {e}")
+            raise
+    
+    @staticmethod
+    def _clean_chunk(chunk: Dict[str, Any]) -> Dict[str, Any]:
+        """Clean chunk data for JSON serialization"""
+        return {
+            'file_path': chunk['file_path'],
+            'file_type': chunk['file_type'],
+            'file_extension': chunk['file_extension'],
+            'chunk_index': chunk['chunk_index'],
+            'chunk_text': chunk['chunk_text'],
+            'chunk_size': chunk['chunk_size'],
+            'file_size': chunk['file_size'],
+            'total_chunks': chunk['total_chunks']
+        }
+    
     def _save_metadata(self, chunks: List[Dict[str, Any]], output_path: str):
         """Save chunk metadata to JSONL file"""
         try:
             with open(output_path, 'w', encoding='utf-8') as f:
                 for chunk in chunks:
-                    # Clean chunk data for JSON serialization
-                    clean_chunk = {
-                        'file_path': chunk['file_path'],
-                        'file_type': chunk['file_type'],
-                        'file_extension': chunk['file_extension'],
-                        'chunk_index': chunk['chunk_index'],
-                        'chunk_text': chunk['chunk_text'],
-                        'chunk_size': chunk['chunk_size'],
-                        'file_size': chunk['file_size'],
-                        'total_chunks': chunk['total_chunks']
-                    }
-                    f.write(json.dumps(clean_chunk, ensure_ascii=False) + '\n')
+                    f.write(json.dumps(self._clean_chunk(chunk), ensure_ascii=False) + '\n')
             
             logger.info(f"Metadata saved to: {output_path}")
             
@@ -316,8 +555,12 @@ class RAGIndexBuilder:
                     'total_embeddings': embedding_stats['total_embeddings'],
                     'total_time': embedding_stats['total_time'],
                     'avg_time_per_embedding': embedding_stats['avg_time_per_embedding'],
-                    'fallbacks_used': embedding_stats['fallbacks_used']
+                    'fallbacks_used': embedding_stats['fallbacks_used'],
+                    'poisoned_inputs': embedding_stats.get('poisoned_inputs', 0),
+                    'pipeline': (self.embedding_pipeline.get_pipeline_stats()
+                                 if self.embedding_pipeline is not None else None)
                 },
+                'out_of_core': self.out_of_core_stats,
                 'system_capabilities': device_summary,
                 'configuration': {
                     'chunk_size': self.text_processor.chunk_size,
@@ -349,14 +592,23 @@ class RAGIndexBuilder:
             if not file_paths:
                 raise ValueError("No files discovered to process")
             
-            # Process files
-            chunks = self.process_files(file_paths)
+            if self.config.get('out_of_core', False):
+                output_paths = self.build_index_out_of_core(file_paths, output_dir)
+                self._print_summary()
+                return output_paths
+            
+            # Process files, overlapping reads with encoding when pipelined
+            embeddings = None
+            if self.embedding_pipeline is not None:
+                chunks, embeddings = self.embed_files(file_paths)
+            else:
+                chunks = self.process_files(file_paths)
             
             if not chunks:
                 raise ValueError("No chunks generated from file processing")
             
             # Build index
-            output_paths = self.build_index(chunks, output_dir)
+            output_paths = self.build_index(chunks, output_dir, embeddings=embeddings)
             
             # Print summary
             self._print_summary()
@@ -408,6 +660,16 @@ def main():
                        help='Device mode for processing')
     parser.add_argument('--batch-size', type=int, default=32,
                        help='Batch size for embedding generation')
+    parser.add_argument('--pipelined', action='store_true',
+                       help='Overlap file reading, tokenization and encoding')
+    parser.add_argument('--read-workers', type=int, default=4,
+                       help='Reader threads for the pipelined embedding stage')
+    parser.add_argument('--out-of-core', action='store_true',
+                       help='Spill chunks to disk and embed/index in shards')
+    parser.add_argument('--memory-budget-mb', type=int, default=2048,
+                       help='Memory budget for out-of-core builds')
+    parser.add_argument('--index-type', choices=['auto', 'flat', 'ivf', 'ivfpq'], default='auto',
+                       help='FAISS index type for out-of-core builds')
     
     args = parser.parse_args()
     
@@ -419,6 +681,11 @@ def main():
             'model_name': args.model,
             'device_mode': args.device,
             'batch_size': args.batch_size,
+            'pipelined_embedding': args.pipelined,
+            'read_workers': args.read_workers,
+            'out_of_core': args.out_of_core,
+            'memory_budget_mb': args.memory_budget_mb,
+            'index_type': args.index_type,
             'remove_emojis': True,
             'normalize_unicode': True
         }
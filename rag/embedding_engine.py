@@ -63,6 +63,8 @@ class EmbeddingEngine:
         self.device = None
         self.device_type = None
         self.model = None
+        self.fallback_model = None
+        self.embedding_dimension = None
         
         # Performance tracking
         self.embedding_stats = {
@@ -70,7 +72,9 @@ class EmbeddingEngine:
             'total_time': 0.0,
             'avg_time_per_embedding': 0.0,
             'device_used': None,
-            'fallbacks_used': 0
+            'fallbacks_used': 0,
+            'fallback_model_loads': 0,
+            'poisoned_inputs': 0
         }
         
         # Initialize the engine
@@ -193,8 +197,55 @@ class EmbeddingEngine:
         except Exception as e:
             logger.warning(f"Model warmup failed: {e}")
     
+    def get_embedding_dimension(self) -> int:
+        """Get the output dimension of the loaded model"""
+        if self.embedding_dimension is None:
+            dimension = None
+            if self.model is not None and hasattr(self.model, 'get_sentence_embedding_dimension'):
+                dimension = self.model.get_sentence_embedding_dimension()
+            if not dimension and self.model is not None:
+                # Some models do not report a dimension, so probe one encode
+                probe = self.model.encode(["dimension probe"], show_progress_bar=False,
+                                          convert_to_numpy=True)
+                dimension = probe.shape[-1]
+            if not dimension:
+                raise RuntimeError("Could not determine embedding dimension")
+            self.embedding_dimension = int(dimension)
+        return self.embedding_dimension
+    
+    def supports_pretokenized(self) -> bool:
+        """Check whether batches can be tokenized ahead of encoding"""
+        return TORCH_AVAILABLE and self.model is not None and hasattr(self.model, 'tokenize')
+    
+    def tokenize_batch(self, texts: List[str]) -> Dict[str, Any]:
+        """Tokenize a batch of texts on the host, ready for encode_features"""
+        return self.model.tokenize(texts)
+    
+    def encode_features(self, features: Dict[str, Any]) -> np.ndarray:
+        """Encode a pre-tokenized batch produced by tokenize_batch"""
+        features = {
+            key: value.to(self.device) if hasattr(value, 'to') else value
+            for key, value in features.items()
+        }
+        with torch.no_grad():
+            embeddings = self.model(features)['sentence_embedding']
+            embeddings = torch.nn.functional.normalize(embeddings, p=2, dim=1)
+        return embeddings.float().cpu().numpy()
+    
+    def allocate_output(self, num_rows: int, 
+                        output_path: Optional[str] = None) -> np.ndarray:
+        """Allocate the output matrix, memory-mapped to a .npy file if a path is given"""
+        shape = (num_rows, self.get_embedding_dimension())
+        if output_path:
+            output_dir = os.path.dirname(output_path)
+            if output_dir:
+                os.makedirs(output_dir, exist_ok=True)
+            return np.lib.format.open_memmap(output_path, mode='w+', dtype=np.float32, shape=shape)
+        return np.zeros(shape, dtype=np.float32)
+    
     def generate_embeddings(self, texts: List[str], 
-                           show_progress: bool = True) -> np.ndarray:
+                           show_progress: bool = True,
+                           output_path: Optional[str] = None) -> np.ndarray:
         """Generate embeddings for a list of texts"""
         if not texts:
             return np.array([])
@@ -205,17 +256,20 @@ class EmbeddingEngine:
         logger.info(f"Generating embeddings for {total_texts} texts using {self.device_type}")
         
         try:
-            # Process in batches for memory efficiency
-            all_embeddings = []
+            # Results are written straight into a preallocated matrix
+            final_embeddings = self.allocate_output(total_texts, output_path)
+            
+            # Batch texts of similar length together to cut padding waste
+            order = np.argsort([len(text) for text in texts], kind='stable')
             
             for i in range(0, total_texts, self.batch_size):
-                batch_texts = texts[i:i + self.batch_size]
+                rows = order[i:i + self.batch_size]
+                batch_texts = [texts[row] for row in rows]
                 batch_start = time.time()
                 
                 try:
                     # Generate embeddings for batch
-                    batch_embeddings = self._encode_batch(batch_texts)
-                    all_embeddings.append(batch_embeddings)
+                    final_embeddings[rows] = self._encode_batch(batch_texts)
                     
                     batch_time = time.time() - batch_start
                     logger.debug(f"Batch {i//self.batch_size + 1}: {len(batch_texts)} texts in {batch_time:.3f}s")
@@ -226,28 +280,18 @@ class EmbeddingEngine:
                     # Try fallback for this batch
                     fallback_embeddings = self._fallback_encode_batch(batch_texts)
                     if fallback_embeddings is not None:
-                        all_embeddings.append(fallback_embeddings)
+                        final_embeddings[rows] = fallback_embeddings
                         self.embedding_stats['fallbacks_used'] += 1
                     else:
-                        # Create zero embeddings for failed batch
-                        logger.warning(f"Creating zero embeddings for failed batch")
-                        zero_embeddings = np.zeros((len(batch_texts), 384))  # Default dimension
-                        all_embeddings.append(zero_embeddings)
+                        # Rows of a failed batch are left as zero embeddings
+                        logger.warning(f"Leaving zero embeddings for failed batch")
             
-            # Combine all embeddings
-            if all_embeddings:
-                final_embeddings = np.vstack(all_embeddings)
-            else:
-                final_embeddings = np.array([])
+            if isinstance(final_embeddings, np.memmap):
+                final_embeddings.flush()
             
             # Update statistics
             total_time = time.time() - start_time
-            self.embedding_stats['total_embeddings'] += total_texts
-            self.embedding_stats['total_time'] += total_time
-            self.embedding_stats['avg_time_per_embedding'] = (
-                self.embedding_stats['total_time'] / self.embedding_stats['total_embeddings']
-            )
-            self.embedding_stats['device_used'] = self.device_type
+            self.record_embedding_stats(total_texts, total_time)
             
             logger.info(f"Embeddings generated: {final_embeddings.shape} in {total_time:.3f}s")
             logger.info(f"Average time per embedding: {self.embedding_stats['avg_time_per_embedding']:.6f}s")
@@ -258,6 +302,16 @@ class EmbeddingEngine:
             logger.error(f"Embedding generation failed: {e}")
             raise
     
+    def record_embedding_stats(self, num_embeddings: int, elapsed: float):
+        """Fold a completed embedding run into the performance statistics"""
+        self.embedding_stats['total_embeddings'] += num_embeddings
+        self.embedding_stats['total_time'] += elapsed
+        if self.embedding_stats['total_embeddings']:
+            self.embedding_stats['avg_time_per_embedding'] = (
+                self.embedding_stats['total_time'] / self.embedding_stats['total_embeddings']
+            )
+        self.embedding_stats['device_used'] = self.device_type
+    
     def _encode_batch(self, texts: List[str]) -> np.ndarray:
         """Encode a batch of texts"""
         try:
@@ -274,33 +328,64 @@ class EmbeddingEngine:
             logger.error(f"Batch encoding failed: {e}")
             raise
     
+    def _get_fallback_model(self) -> Any:
+        """Get the CPU fallback model, loading it once on first use"""
+        if self.device == "cpu" or self.fallback_strategy != "cpu_fallback":
+            return self.model
+        
+        if self.fallback_model is None:
+            logger.info("Loading CPU fallback model...")
+            self.fallback_model = SentenceTransformer(self.model_name, device="cpu")
+            self.embedding_stats['fallback_model_loads'] += 1
+        return self.fallback_model
+    
+    def release_fallback_model(self):
+        """Drop the cached CPU fallback model"""
+        self.fallback_model = None
+    
     def _fallback_encode_batch(self, texts: List[str]) -> Optional[np.ndarray]:
-        """Fallback encoding when primary method fails"""
+        """Fallback encoding when primary method fails
+        
+        The batch is re-encoded on the reused fallback model; if that fails too
+        it is bisected until the offending inputs are isolated, and only those
+        rows are left as zero embeddings.
+        """
         try:
-            if self.device != "cpu" and self.fallback_strategy == "cpu_fallback":
-                logger.info("Attempting CPU fallback for batch...")
-                
-                # Create temporary CPU model
-                cpu_model = SentenceTransformer(self.model_name, device="cpu")
-                
-                # Encode with CPU
-                embeddings = cpu_model.encode(
-                    texts,
+            fallback_model = self._get_fallback_model()
+        except Exception as e:
+            logger.error(f"CPU fallback model unavailable: {e}")
+            return None
+        
+        if fallback_model is None:
+            return None
+        
+        logger.info(f"Attempting fallback encoding for batch of {len(texts)}...")
+        embeddings = np.zeros((len(texts), self.get_embedding_dimension()), dtype=np.float32)
+        self._bisect_encode(fallback_model, texts, 0, len(texts), embeddings)
+        return embeddings
+    
+    def _bisect_encode(self, model: Any, texts: List[str], start: int, stop: int,
+                       out: np.ndarray):
+        """Encode texts[start:stop] into out, splitting the range on failure"""
+        try:
+            with torch.no_grad() if TORCH_AVAILABLE else nullcontext():
+                out[start:stop] = model.encode(
+                    texts[start:stop],
                     show_progress_bar=False,
                     convert_to_numpy=True,
                     normalize_embeddings=True
                 )
-                
-                # Clean up
-                del cpu_model
-                
-                logger.info("CPU fallback successful for batch")
-                return embeddings
-                
+            return
         except Exception as e:
-            logger.error(f"CPU fallback failed: {e}")
+            if stop - start == 1:
+                self.embedding_stats['poisoned_inputs'] += 1
+                preview = texts[start][:80].replace('\n', ' ')
+                logger.warning(f"Leaving zero embedding for input that fails to encode ({e}): {preview!r}")
+                return
         
-        return None
+        middle = (start + stop) // 2
+        self._bisect_encode(model, texts, start, middle, out)
+        self._bisect_encode(model, texts, middle, stop, out)
     
     def create_faiss_index(self, embeddings: np.ndarray, 
                           index_type: str = "auto") -> Any:
@@ -351,6 +436,48 @@ class EmbeddingEngine:
             logger.error(f"FAISS index creation failed: {e}")
             raise
     
+    def create_empty_faiss_index(self, dimension: int, total_vectors: int,
+                                 index_type: str = "auto",
+                                 max_index_bytes: Optional[int] = None) -> Tuple[Any, str]:
+        """Create an untrained FAISS index sized for vectors that are added in shards
+        
+        With index_type "auto" the index is flat for small corpora, IVF while
+        raw vectors fit in max_index_bytes, and IVF-PQ beyond that.
+        """
+        if not FAISS_AVAILABLE:
+            raise RuntimeError("FAISS not available. Please install required packages.")
+        
+        if index_type == "auto":
+            flat_bytes = total_vectors * dimension * 4
+            if total_vectors < 1000:
+                index_type = "flat"
+            elif max_index_bytes is not None and flat_bytes > max_index_bytes:
+                index_type = "ivfpq"
+            else:
+                index_type = "ivf"
+        
+        if index_type == "flat":
+            logger.info("Using FlatIP index for small dataset")
+            return faiss.IndexFlatIP(dimension), index_type
+        
+        nlist = self.ivf_nlist(total_vectors)
+        quantizer = faiss.IndexFlatIP(dimension)
+        if index_type == "ivfpq":
+            # Largest sub-quantizer count up to 64 that divides the dimension
+            m = max(d for d in range(1, min(64, dimension) + 1) if dimension % d == 0)
+            index = faiss.IndexIVFPQ(quantizer, dimension, nlist, m, 8, faiss.METRIC_INNER_PRODUCT)
+            logger.info(f"Using IVF-PQ index with {nlist} clusters and {m} sub-quantizers")
+        else:
+            index_type = "ivf"
+            index = faiss.IndexIVFFlat(quantizer, dimension, nlist, faiss.METRIC_INNER_PRODUCT)
+            logger.info(f"Using IVF index with {nlist} clusters")
+        return index, index_type
+    
+    @staticmethod
+    def ivf_nlist(total_vectors: int) -> int:
+        """Number of IVF clusters for a corpus of the given size"""
+        return int(max(1, min(65536, 4 * np.sqrt(total_vectors))))
+    
     def save_index(self, index: Any, output_path: str) -> str:
         """Save FAISS index to file"""
         try:
@@ -381,7 +508,9 @@ class EmbeddingEngine:
             'total_time': 0.0,
             'avg_time_per_embedding': 0.0,
             'device_used': None,
-            'fallbacks_used': 0
+            'fallbacks_used': 0,
+            'fallback_model_loads': 0,
+            'poisoned_inputs': 0
         }
 
 
@@ -0,0 +1,303 @@
+#!/usr/bin/env python3
+"""
+Agent Exo-Suit V3.0 - Embedding Pipeline
+Producer/consumer embedding pipeline overlapping file I/O, tokenization and encoding
+"""
+
+import os
+import sys
+import time
+import queue
+import logging
+import threading
+import numpy as np
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import List, Dict, Any, Optional, Tuple
+
+# Add current directory to path for imports
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+# Configure logging
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+# Queue marker signalling that a producer stage has finished
+_STOP = object()
+
+
+class StageStats:
+    """Thread-safe throughput counters for one pipeline stage"""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.items = 0
+        self.busy_time = 0.0
+        self._lock = threading.Lock()
+
+    def record(self, items: int, elapsed: float):
+        with self._lock:
+            self.items += items
+            self.busy_time += elapsed
+
+    def to_dict(self, wall_time: float) -> Dict[str, Any]:
+        return {
+            'chunks': self.items,
+            'busy_time': self.busy_time,
+            'chunks_per_sec': self.items / self.busy_time if self.busy_time > 0 else 0.0,
+            'utilization': self.busy_time / wall_time if wall_time > 0 else 0.0
+        }
+
+
+class EmbeddingSink:
+    """Output matrix that embedding batches are written into by row index"""
+
+    def __init__(self, dimension: int, num_rows: Optional[int] = None,
+                 output_path: Optional[str] = None, block_rows: int = 4096,
+                 allocate=None):
+        self.dimension = dimension
+        self.output_path = output_path
+        self.block_rows = block_rows
+        self._lock = threading.Lock()
+
+        # With a known row count the final matrix is preallocated up front,
+        # otherwise rows land in fixed-size blocks until finalize()
+        self.matrix = allocate(num_rows, output_path) if num_rows is not None else None
+        self.blocks: List[np.ndarray] = []
+
+    def write(self, rows: np.ndarray, embeddings: np.ndarray):
+        if self.matrix is not None:
+            self.matrix[rows] = embeddings
+            return
+
+        with self._lock:
+            needed = int(rows.max()) // self.block_rows + 1
+            while len(self.blocks) < needed:
+                self.blocks.append(np.zeros((self.block_rows, self.dimension), dtype=np.float32))
+
+        block_ids, offsets = np.divmod(rows, self.block_rows)
+        for block_id in np.unique(block_ids):
+            mask = block_ids == block_id
+            self.blocks[block_id][offsets[mask]] = embeddings[mask]
+
+    def finalize(self, num_rows: int, allocate) -> np.ndarray:
+        """Return the finished matrix, copying blocks out one at a time"""
+        if self.matrix is None:
+            self.matrix = allocate(num_rows, self.output_path)
+            for block_id in range(len(self.blocks)):
+                start = block_id * self.block_rows
+                stop = min(start + self.block_rows, num_rows)
+                if stop > start:
+                    self.matrix[start:stop] = self.blocks[block_id][:stop - start]
+                # Free each block once copied so peak memory stays near one matrix
+                self.blocks[block_id] = None
+            self.blocks = []
+
+        if isinstance(self.matrix, np.memmap):
+            self.matrix.flush()
+        return self.matrix
+
+
+class EmbeddingPipeline:
+    """Pipelined embedding stage: threaded read/clean, tokenization ahead of
+    encoding, length-bucketed batches and in-place output writes"""
+
+    def __init__(self, embedding_engine, text_processor=None,
+                 read_workers: int = 4,
+                 tokenize_workers: int = 1,
+                 queue_depth: int = 8,
+                 bucket_width: int = 64):
+
+        self.embedding_engine = embedding_engine
+        self.text_processor = text_processor
+        self.read_workers = max(1, read_workers)
+        self.tokenize_workers = max(1, tokenize_workers)
+        self.queue_depth = max(1, queue_depth)
+        self.bucket_width = max(1, bucket_width)
+
+        self.stage_stats: Dict[str, StageStats] = {}
+        self.last_run: Dict[str, Any] = {}
+        self._reset_stats()
+
+    def _reset_stats(self):
+        self.stage_stats = {
+            name: StageStats(name) for name in ('read', 'tokenize', 'encode', 'write')
+        }
+
+    def embed_texts(self, texts: List[str],
+                    output_path: Optional[str] = None) -> np.ndarray:
+        """Embed already-cleaned texts into a preallocated (or memory-mapped) matrix"""
+        if not texts:
+            return np.array([])
+
+        def produce(emit):
+            start = time.time()
+            for row, text in enumerate(texts):
+                emit(row, text)
+            self.stage_stats['read'].record(len(texts), time.time() - start)
+            return len(texts)
+
+        embeddings, _ = self._run(produce, num_rows=len(texts), output_path=output_path)
+        return embeddings
+
+    def embed_files(self, file_paths: List[str],
+                    output_path: Optional[str] = None) -> Tuple[List[Dict[str, Any]], np.ndarray]:
+        """Read, clean and chunk files on worker threads while encoding runs,
+        returning chunk metadata and embeddings in matching row order"""
+        if self.text_processor is None:
+            raise ValueError("A text processor is required to embed files")
+
+        chunks: List[Dict[str, Any]] = []
+
+        def read_file(file_path):
+            start = time.time()
+            file_chunks = self.text_processor.process_file(file_path)
+            self.stage_stats['read'].record(len(file_chunks), time.time() - start)
+            return file_chunks
+
+        def produce(emit):
+            with ThreadPoolExecutor(max_workers=self.read_workers) as executor:
+                futures = [executor.submit(read_file, path) for path in file_paths]
+                for future in as_completed(futures):
+                    try:
+                        file_chunks = future.result()
+                    except Exception as e:
+                        logger.error(f"Read stage failed: {e}")
+                        continue
+                    for chunk in file_chunks:
+                        emit(len(chunks), chunk['chunk_text'])
+                        chunks.append(chunk)
+            return len(chunks)
+
+        embeddings, _ = self._run(produce, num_rows=None, output_path=output_path)
+        return chunks, embeddings
+
+    def _run(self, produce, num_rows: Optional[int],
+             output_path: Optional[str]) -> Tuple[np.ndarray, int]:
+        """Wire the stages together and drive the encoder on the calling thread"""
+        engine = self.embedding_engine
+        batch_size = engine.batch_size
+        pretokenize = engine.supports_pretokenized()
+
+        self._reset_stats()
+        wall_start = time.time()
+
+        sink = EmbeddingSink(engine.get_embedding_dimension(), num_rows=num_rows,
+                             output_path=output_path, allocate=engine.allocate_output)
+        batch_queue: queue.Queue = queue.Queue(maxsize=self.queue_depth)
+        encode_queue: queue.Queue = queue.Queue(maxsize=self.queue_depth)
+        errors: List[BaseException] = []
+        produced = [0]
+
+        def batcher():
+            """Group incoming chunks into length buckets and emit full batches"""
+            buckets: Dict[int, List[Tuple[int, str]]] = {}
+
+            def emit(row, text):
+                key = len(text) // self.bucket_width
+                bucket = buckets.setdefault(key, [])
+                bucket.append((row, text))
+                if len(bucket) >= batch_size:
+                    batch_queue.put(buckets.pop(key))
+
+            try:
+                produced[0] = produce(emit)
+                for key in sorted(buckets):
+                    batch_queue.put(buckets[key])
+            except BaseException as e:
+                errors.append(e)
+            finally:
+                for _ in range(self.tokenize_workers):
+                    batch_queue.put(_STOP)
+
+        def tokenizer():
+            try:
+                while True:
+                    batch = batch_queue.get()
+                    if batch is _STOP:
+                        break
+                    rows = np.fromiter((row for row, _ in batch), dtype=np.int64, count=len(batch))
+                    texts = [text for _, text in batch]
+                    features = None
+                    if pretokenize:
+                        start = time.time()
+                        try:
+                            features = engine.tokenize_batch(texts)
+                        except Exception as e:
+                            logger.warning(f"Tokenization failed, deferring to encoder: {e}")
+                        self.stage_stats['tokenize'].record(len(texts), time.time() - start)
+                    encode_queue.put((rows, texts, features))
+            except BaseException as e:
+                errors.append(e)
+            finally:
+                encode_queue.put(_STOP)
+
+        threads = [threading.Thread(target=batcher, name='embed-batcher', daemon=True)]
+        threads += [
+            threading.Thread(target=tokenizer, name=f'embed-tokenizer-{i}', daemon=True)
+            for i in range(self.tokenize_workers)
+        ]
+        for thread in threads:
+            thread.start()
+
+        finished_tokenizers = 0
+        while finished_tokenizers < self.tokenize_workers:
+            item = encode_queue.get()
+            if item is _STOP:
+                finished_tokenizers += 1
+                continue
+
+            rows, texts, features = item
+            start = time.time()
+            embeddings = self._encode(texts, features)
+            self.stage_stats['encode'].record(len(texts), time.time() - start)
+
+            if embeddings is not None:
+                start = time.time()
+                sink.write(rows, embeddings)
+                self.stage_stats['write'].record(len(texts), time.time() - start)
+
+        for thread in threads:
+            thread.join()
+
+        if errors:
+            raise errors[0]
+
+        total_rows = produced[0]
+        embeddings = sink.finalize(total_rows, engine.allocate_output)
+
+        wall_time = time.time() - wall_start
+        engine.record_embedding_stats(total_rows, wall_time)
+        self.last_run = {
+            'total_chunks': total_rows,
+            'wall_time': wall_time,
+            'chunks_per_sec': total_rows / wall_time if wall_time > 0 else 0.0,
+            'stages': {name: stats.to_dict(wall_time) for name, stats in self.stage_stats.items()}
+        }
+
+        logger.info(f"Pipeline embedded {total_rows} chunks in {wall_time:.3f}s "
+                    f"({self.last_run['chunks_per_sec']:.1f} chunks/sec)")
+        for name, stats in self.last_run['stages'].items():
+            logger.info(f"  {name:<8} {stats['chunks_per_sec']:.1f} chunks/sec "
+                        f"({stats['utilization']:.0%} busy)")
+
+        return embeddings, total_rows
+
+    def _encode(self, texts: List[str], features: Optional[Dict[str, Any]]) -> Optional[np.ndarray]:
+        """Encode one batch, falling back to the engine's own batch paths on failure"""
+        engine = self.embedding_engine
+        try:
+            if features is not None:
+                return engine.encode_features(features)
+            return engine._encode_batch(texts)
+        except Exception as e:
+            logger.error(f"Pipeline batch of {len(texts)} failed: {e}")
+            embeddings = engine._fallback_encode_batch(texts)
+            if embeddings is not None:
+                engine.embedding_stats['fallbacks_used'] += 1
+            else:
+                logger.warning("Leaving zero embeddings for failed batch")
+            return embeddings
+
+    def get_pipeline_stats(self) -> Dict[str, Any]:
+        """Get per-stage throughput from the last run"""
+        return dict(self.last_run)
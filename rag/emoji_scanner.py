@@ -10,35 +10,80 @@ import json
 import time
 import logging
 import re
+import bisect
 import unicodedata
+from functools import lru_cache
 from pathlib import Path
 from typing import List, Dict, Any, Optional, Tuple, Union
 from dataclasses import dataclass, asdict
 from datetime import datetime
 import multiprocessing as mp
-import torch
+import numpy as np
 
-# Add the rag directory to the path
+# Add the rag and ops directories to the path
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'ops'))
 
 from device_manager import DeviceManager, DeviceType
 from embedding_engine import EmbeddingEngine
+from fast_file_walker import walk_files, DEFAULT_EXCLUDED_DIRS
 
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
-# Check PyTorch availability after import
+# PyTorch is only used for GPU status reporting; detection never needs it
 try:
+    import torch
     TORCH_AVAILABLE = torch.cuda.is_available()
     if TORCH_AVAILABLE:
         logger.info(f"PyTorch GPU available: {torch.cuda.get_device_name(0)}")
-    else:
-        logger.info("PyTorch GPU not available, will use CPU fallback")
 except Exception as e:
-    logger.warning(f"PyTorch import error: {e}")
+    torch = None
     TORCH_AVAILABLE = False
 
+# Symbol categories (So/Sk) only occur below this code point
+_SYMBOL_SCAN_LIMIT = 0x20000
+
+
+@lru_cache(maxsize=None)
+def build_emoji_interval_table(ranges: Tuple[Tuple[int, int], ...]) -> Tuple[np.ndarray, np.ndarray]:
+    """Merge emoji ranges and non-ASCII So/Sk symbols into sorted, disjoint intervals"""
+    intervals = list(ranges)
+    
+    run_start = None
+    for code_point in range(0x80, _SYMBOL_SCAN_LIMIT):
+        if unicodedata.category(chr(code_point)) in ('So', 'Sk'):
+            if run_start is None:
+                run_start = code_point
+        elif run_start is not None:
+            intervals.append((run_start, code_point - 1))
+            run_start = None
+    if run_start is not None:
+        intervals.append((run_start, _SYMBOL_SCAN_LIMIT - 1))
+    
+    merged: List[List[int]] = []
+    for start, end in sorted(intervals):
+        if merged and start <= merged[-1][1] + 1:
+            merged[-1][1] = max(merged[-1][1], end)
+        else:
+            merged.append([start, end])
+    
+    starts = np.array([start for start, _ in merged], dtype=np.uint32)
+    ends = np.array([end for _, end in merged], dtype=np.uint32)
+    return starts, ends
+
+
+def compile_emoji_regex(starts: np.ndarray, ends: np.ndarray) -> re.Pattern:
+    """Compile the interval table into a single character-class regex"""
+    parts = []
+    for start, end in zip(starts.tolist(), ends.tolist()):
+        if start == end:
+            parts.append(re.escape(chr(start)))
+        else:
+            parts.append(f"{re.escape(chr(start))}-{re.escape(chr(end))}")
+    return re.compile('[' + ''.join(parts) + ']')
+
 @dataclass
 class EmojiDetectionResult:
     """Result of emoji detection in a file"""
@@ -81,6 +126,11 @@ class PythonEmojiScanner:
         # Emoji detection patterns (Unicode ranges)
         self.emoji_patterns = self._initialize_emoji_patterns()
         
+        # Sorted interval table and equivalent regex used for detection
+        self.emoji_starts, self.emoji_ends = build_emoji_interval_table(tuple(self.emoji_patterns))
+        self._emoji_starts_list = self.emoji_starts.tolist()
+        self.emoji_regex = compile_emoji_regex(self.emoji_starts, self.emoji_ends)
+        
         # Supported file extensions
         self.supported_extensions = {
             '.ps1', '.py', '.js', '.ts', '.jsx', '.tsx', '.html', '.css', '.scss',
@@ -131,8 +181,9 @@ class PythonEmojiScanner:
             logger.warning(f"Failed to initialize embedding engine: {e}")
             self.embedding_engine = None
 
-        # Create GPU-accelerated emoji detection tensor
-        self.emoji_tensor = self._create_emoji_tensor()
+        # Detection runs on the interval table; no tensor is needed
+        self.emoji_tensor = None
+        logger.info(f"Emoji interval table ready with {len(self.emoji_starts)} intervals")
 
         # Log device configuration
         if self.verbose:
@@ -171,145 +222,56 @@ class PythonEmojiScanner:
         ]
         return patterns
 
-    def _create_emoji_tensor(self) -> torch.Tensor:
-        """Create a GPU tensor for fast emoji detection"""
-        if not TORCH_AVAILABLE:
-            logger.info("PyTorch not available, skipping GPU tensor creation")
-            return None
-            
-        try:
-            # Create a tensor of all possible emoji code points
-            emoji_ranges = []
-            for start, end in self.emoji_patterns:
-                emoji_ranges.extend(range(start, end + 1))
-            
-            # Convert to tensor and move to GPU if available
-            if torch.cuda.is_available() and self.device_mode in ["gpu", "hybrid", "auto"]:
-                try:
-                    device = torch.device("cuda")
-                    emoji_tensor = torch.tensor(emoji_ranges, dtype=torch.int32, device=device)
-                    logger.info(f"Created GPU emoji tensor with {len(emoji_ranges)} code points on {device}")
-                    return emoji_tensor
-                except Exception as gpu_error:
-                    logger.warning(f"GPU tensor creation failed: {gpu_error}, falling back to CPU")
-                    device = torch.device("cpu")
-                    emoji_tensor = torch.tensor(emoji_ranges, dtype=torch.int32, device=device)
-                    logger.info(f"Created CPU emoji tensor with {len(emoji_ranges)} code points on {device}")
-                    return emoji_tensor
-            else:
-                device = torch.device("cpu")
-                emoji_tensor = torch.tensor(emoji_ranges, dtype=torch.int32, device=device)
-                logger.info(f"Created CPU emoji tensor with {len(emoji_ranges)} code points on {device}")
-                return emoji_tensor
-                
-        except Exception as e:
-            logger.error(f"Failed to create emoji tensor: {e}")
-            return None
+    def emoji_mask(self, text: str) -> np.ndarray:
+        """Flag every character of text that falls in the emoji interval table"""
+        if not text or text.isascii():
+            return np.zeros(len(text), dtype=bool)
+        
+        code_points = np.frombuffer(text.encode('utf-32-le', 'surrogatepass'), dtype=np.uint32)
+        slots = np.searchsorted(self.emoji_starts, code_points, side='right') - 1
+        return (slots >= 0) & (code_points <= self.emoji_ends[np.maximum(slots, 0)])
 
-    def is_emoji_gpu(self, text: str, emoji_tensor: torch.Tensor) -> List[bool]:
-        """Check if characters are emojis using GPU acceleration"""
-        if not TORCH_AVAILABLE or emoji_tensor is None:
-            return [self.is_emoji(char) for char in text]
-        
-        try:
-            # Convert text to code points
-            code_points = [ord(char) for char in text]
-            if not code_points:
-                return []
-            
-            # Convert to tensor
-            text_tensor = torch.tensor(code_points, dtype=torch.int32, device=emoji_tensor.device)
-            
-            # Use GPU-accelerated search
-            # Expand dimensions for broadcasting
-            text_expanded = text_tensor.unsqueeze(1)  # [text_len, 1]
-            emoji_expanded = emoji_tensor.unsqueeze(0)  # [1, emoji_count]
-            
-            # Find matches using GPU-accelerated comparison
-            matches = (text_expanded == emoji_expanded).any(dim=1)
-            
-            # Convert back to CPU for Python processing
-            if matches.device.type == "cuda":
-                matches = matches.cpu()
-            
-            return matches.tolist()
-            
-        except Exception as e:
-            if self.verbose:
-                logger.warning(f"GPU emoji detection failed: {e}, falling back to CPU")
-            return [self.is_emoji(char) for char in text]
+    def is_emoji_gpu(self, text: str, emoji_tensor: Any = None) -> List[bool]:
+        """Check if characters are emojis (vectorized; emoji_tensor is ignored)"""
+        return self.emoji_mask(text).tolist()
 
     def is_emoji(self, char: str) -> bool:
-        """Check if a character is an emoji using Unicode ranges (CPU fallback)"""
+        """Check if a character is an emoji using the interval table"""
         if not char:
             return False
 
         code_point = ord(char)
+        slot = bisect.bisect_right(self._emoji_starts_list, code_point) - 1
+        return slot >= 0 and code_point <= int(self.emoji_ends[slot])
 
-        # Check against emoji patterns
-        for start, end in self.emoji_patterns:
-            if start <= code_point <= end:
-                return True
-
-        # Additional checks for common emoji characters
-        if unicodedata.category(char) in ['So', 'Sk']:  # Symbol, Other or Symbol, Modifier
-            return True
-
-        return False
-
-    def find_emojis_in_text_gpu(self, text: str, emoji_tensor: torch.Tensor) -> List[Dict[str, Any]]:
-        """Find all emojis in a text string with GPU acceleration"""
-        if not TORCH_AVAILABLE or emoji_tensor is None:
-            return self.find_emojis_in_text(text)
-        
-        try:
-            # Use GPU-accelerated detection
-            emoji_flags = self.is_emoji_gpu(text, emoji_tensor)
-            
-            emojis = []
-            for i, is_emoji_char in enumerate(emoji_flags):
-                if is_emoji_char:
-                    emojis.append({
-                        'emoji': text[i],
-                        'index': i,
-                        'length': len(text[i].encode('utf-8'))
-                    })
-            
-            return emojis
-            
-        except Exception as e:
-            if self.verbose:
-                logger.warning(f"GPU emoji detection failed: {e}, falling back to CPU")
-            return self.find_emojis_in_text(text)
+    def find_emojis_in_text_gpu(self, text: str, emoji_tensor: Any = None) -> List[Dict[str, Any]]:
+        """Find all emojis in a text string with vectorized interval lookup"""
+        return [
+            {
+                'emoji': text[i],
+                'index': int(i),
+                'length': len(text[i].encode('utf-8'))
+            }
+            for i in np.flatnonzero(self.emoji_mask(text))
+        ]
 
     def find_emojis_in_text(self, text: str) -> List[Dict[str, Any]]:
-        """Find all emojis in a text string with positions (CPU fallback)"""
-        emojis = []
-
-        for i, char in enumerate(text):
-            if self.is_emoji(char):
-                emojis.append({
-                    'emoji': char,
-                    'index': i,
-                    'length': len(char.encode('utf-8'))
-                })
-
-        return emojis
+        """Find all emojis in a text string with positions (streaming regex path)"""
+        if text.isascii():
+            return []
+
+        return [
+            {
+                'emoji': match.group(),
+                'index': match.start(),
+                'length': len(match.group().encode('utf-8'))
+            }
+            for match in self.emoji_regex.finditer(text)
+        ]
     
     def _get_current_device_info(self) -> str:
         """Get information about the current device being used"""
-        if not TORCH_AVAILABLE or self.emoji_tensor is None:
-            return "CPU (PyTorch not available)"
-        
-        try:
-            if self.emoji_tensor.device.type == "cuda":
-                gpu_name = torch.cuda.get_device_name(self.emoji_tensor.device.index)
-                memory_allocated = torch.cuda.memory_allocated(self.emoji_tensor.device.index) / 1024**3
-                return f"GPU ({gpu_name}, {memory_allocated:.2f} GB allocated)"
-            else:
-                return "CPU (PyTorch tensor)"
-        except Exception as e:
-            return f"CPU (Error: {e})"
+        return f"CPU (interval table, {len(self.emoji_starts)} intervals)"
 
     def scan_file(self, file_path: str) -> List[EmojiDetectionResult]:
         """Scan a single file for emojis"""
@@ -329,15 +291,15 @@ class PythonEmojiScanner:
             
             # Read file content
             with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
-                lines = f.readlines()
+                content = f.read()
+            
+            # Most files are pure ASCII or emoji-free; skip them in one pass
+            if content.isascii() or not self.emoji_regex.search(content):
+                return results
             
             # Process each line for emojis
-            for line_num, line in enumerate(lines, 1):
-                # Use GPU acceleration if available, fallback to CPU
-                if self.emoji_tensor is not None and TORCH_AVAILABLE:
-                    emojis = self.find_emojis_in_text_gpu(line, self.emoji_tensor)
-                else:
-                    emojis = self.find_emojis_in_text(line)
+            for line_num, line in enumerate(content.split('\n'), 1):
+                emojis = self.find_emojis_in_text(line)
                 
                 for emoji_info in emojis:
                     # Get context around the emoji
@@ -425,37 +387,33 @@ class PythonEmojiScanner:
         """Scan a directory for emojis with performance tracking and batch processing"""
         start_time = time.time()
         
-        # Find all files to scan
-        files_to_scan = []
-        directory = Path(directory_path)
-        
-        if recursive:
-            for ext in self.supported_extensions:
-                files_to_scan.extend(directory.rglob(f"*{ext}"))
-        else:
-            for ext in self.supported_extensions:
-                files_to_scan.extend(directory.glob(f"*{ext}"))
-        
         # Get current script path to exclude it
         current_script = Path(__file__).resolve()
         
-        # Simplified and optimized filtering to prevent infinite loops
-        files_to_scan = [f for f in files_to_scan if not (
-            # Skip the scanner script itself
-            f.resolve() == current_script or
-            # Skip scanner output files
-            f.name.startswith(('EMOJI_REPORT', 'PYTHON_EMOJI_REPORT', 'emoji_report')) or
-            f.name.endswith(('.log', '.out', '.tmp', '.bak')) or
-            # Skip restore directory files (scanner output)
-            'restore' in f.parts or
-            # Skip user-specified exclusions
-            any(exclude in f.parts or exclude in f.name for exclude in self.exclude_list)
-        )]
+        # Restore (scanner output) and user-excluded directories are pruned
+        # before the walk descends into them
+        excluded_dirs = set(DEFAULT_EXCLUDED_DIRS) | {'restore'} | set(self.exclude_list)
+        
+        files_to_scan = []
+        for entry in walk_files(directory_path, self.supported_extensions,
+                                excluded_dirs=excluded_dirs, recursive=recursive):
+            name = entry.name
+            if (
+                # Skip scanner output files
+                name.startswith(('EMOJI_REPORT', 'PYTHON_EMOJI_REPORT', 'emoji_report')) or
+                name.endswith(('.log', '.out', '.tmp', '.bak')) or
+                # Skip user-specified file exclusions
+                any(exclude in name for exclude in self.exclude_list) or
+                # Skip the scanner script itself
+                (name == current_script.name and Path(entry.path).resolve() == current_script)
+            ):
+                continue
+            files_to_scan.append(entry.path)
         
         if self.verbose:
             logger.info(f"Found {len(files_to_scan)} files to scan after filtering")
             if len(files_to_scan) > 0:
-                logger.info(f"Sample files to scan: {[f.name for f in files_to_scan[:5]]}")
+                logger.info(f"Sample files to scan: {[os.path.basename(f) for f in files_to_scan[:5]]}")
             else:
                 logger.warning("No files found to scan after filtering - check your directory and file extensions")
         
@@ -472,7 +430,7 @@ class PythonEmojiScanner:
                 logger.info(f"GPU memory allocated: {torch.cuda.memory_allocated() / 1024**3:.2f} GB")
             
             # Process files in batches for better GPU utilization
-            all_results = self.scan_file_batch([str(f) for f in files_to_scan])
+            all_results = self.scan_file_batch(files_to_scan)
             files_with_emojis = len(set(result.file_path for result in all_results))
             
             # Count lines for performance stats (simplified)
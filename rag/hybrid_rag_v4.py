@@ -14,6 +14,7 @@ import threading
 import queue
 import psutil
 import gc
+from collections import deque
 from pathlib import Path
 from typing import Dict, List, Tuple, Optional, Any, Union
 from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
@@ -60,6 +61,17 @@ class ProcessingTask:
     content: str
     priority: int = 1
     device_preference: str = 'auto'
+    chunks: Optional[List[str]] = None
+
+@dataclass
+class FileProgress:
+    """Per-file embedding progress while its chunks are spread across micro-batches"""
+    task: ProcessingTask
+    start_time: float
+    memory_before_gb: float
+    embeddings: Optional[np.ndarray] = None
+    remaining: int = 0
+    device_used: str = 'cpu'
 
 @dataclass
 class ProcessingResult:
@@ -118,10 +130,23 @@ class RAMDiskManager:
 class MemoryManager:
     """Manages memory usage and optimization"""
     
-    def __init__(self):
+    def __init__(self, sample_interval: float = 1.0):
         self.memory_threshold = 0.8  # 80% memory usage threshold
         self.gpu_memory_threshold = 0.85  # 85% GPU memory threshold
-        
+        self.sample_interval = sample_interval  # Seconds between memory samples
+        self._last_sample_time = 0.0
+        self._last_sample = None
+        self._sample_lock = threading.Lock()
+        
+    def get_memory_snapshot(self) -> Tuple[Dict[str, float], Dict[str, float]]:
+        """Get system and GPU memory usage, re-sampled at most once per interval"""
+        with self._sample_lock:
+            now = time.time()
+            if self._last_sample is None or now - self._last_sample_time >= self.sample_interval:
+                self._last_sample = (self.get_system_memory(), self.get_gpu_memory())
+                self._last_sample_time = now
+            return self._last_sample
+    
     def get_system_memory(self) -> Dict[str, float]:
         """Get current system memory usage"""
         memory = psutil.virtual_memory()
@@ -156,8 +181,7 @@ class MemoryManager:
     
     def should_cleanup_memory(self) -> bool:
         """Check if memory cleanup is needed"""
-        system_memory = self.get_system_memory()
-        gpu_memory = self.get_gpu_memory()
+        system_memory, gpu_memory = self.get_memory_snapshot()
         
         return (system_memory['percent'] > (self.memory_threshold * 100) or
                 gpu_memory['percent'] > (self.gpu_memory_threshold * 100))
@@ -183,6 +207,10 @@ class MemoryManager:
                 except (psutil.NoSuchProcess, psutil.AccessDenied):
                     pass
         
+        # Force a fresh sample after cleanup
+        with self._sample_lock:
+            self._last_sample = None
+        
         logger.info("Memory cleanup completed")
 
 class HybridRAGProcessor:
@@ -191,14 +219,21 @@ class HybridRAGProcessor:
     def __init__(self, config: Optional[Dict[str, Any]] = None):
         self.config = config or {}
         self.ram_disk = RAMDiskManager(size_gb=4)
-        self.memory_manager = MemoryManager()
-        self.processing_queue = queue.Queue()
+        self.memory_manager = MemoryManager(
+            sample_interval=self.config.get('memory_sample_interval', 1.0)
+        )
+        self.chunk_size = self.config.get('chunk_size', 1000)
+        self.chunk_overlap = self.config.get('chunk_overlap', 100)
+        self.max_batch_wait = self.config.get('max_batch_wait_ms', 20) / 1000.0
+        self.processing_queue = queue.Queue(maxsize=self.config.get('queue_size', 256))
         self.results_queue = queue.Queue()
         self.device_manager = None
         self.models = {}
         self.index = None
+        self.chunk_map: List[Tuple[str, int]] = []
         self.processing_threads = []
         self.stop_processing = False
+        self.batch_stats = {'encode_calls': 0, 'chunks_encoded': 0, 'encode_time': 0.0}
         
         # Initialize device manager
         self._init_device_manager()
@@ -243,8 +278,7 @@ class HybridRAGProcessor:
             return primary_device if torch.cuda.is_available() else 'cpu'
         
         # Check memory constraints
-        system_memory = self.memory_manager.get_system_memory()
-        gpu_memory = self.memory_manager.get_gpu_memory()
+        system_memory, gpu_memory = self.memory_manager.get_memory_snapshot()
         
         # If system memory is low, prefer GPU
         if system_memory['percent'] > 80:
@@ -267,96 +301,195 @@ class HybridRAGProcessor:
         else:
             return 'cpu'
     
-    def _process_file(self, task: ProcessingTask) -> ProcessingResult:
-        """Process a single file with optimal device selection"""
-        start_time = time.time()
-        device_used = 'cpu'
-        memory_before = self.memory_manager.get_system_memory()
+    def _chunk_content(self, content: str) -> List[str]:
+        """Split file content into overlapping character windows"""
+        if not content.strip():
+            return []
         
+        step = max(1, self.chunk_size - self.chunk_overlap)
+        chunks = []
+        for start in range(0, len(content), step):
+            chunk = content[start:start + self.chunk_size]
+            if chunk.strip():
+                chunks.append(chunk)
+            if start + self.chunk_size >= len(content):
+                break
+        return chunks
+    
+    def _read_task(self, file_path: str) -> Optional[ProcessingTask]:
+        """Read and chunk a single file on a reader thread"""
         try:
-            # Select optimal device
-            device = self._select_optimal_device(task, len(task.content))
-            device_used = device
-            
-            # Get model for selected device
-            if device == 'cuda' and 'cuda' in self.models:
-                model = self.models['cuda']
-            else:
-                model = self.models['cpu']
-                device_used = 'cpu'
-            
-            # Process content
-            embeddings = model.encode([task.content], show_progress_bar=False)
-            
-            # Calculate memory usage
-            memory_after = self.memory_manager.get_system_memory()
-            memory_used = memory_after['used_gb'] - memory_before['used_gb']
-            
-            processing_time = time.time() - start_time
-            
-            return ProcessingResult(
-                file_path=task.file_path,
-                embeddings=embeddings,
-                device_used=device_used,
-                processing_time=processing_time,
-                memory_used=memory_used,
-                success=True
-            )
-            
+            with open(file_path, 'r', encoding='utf-8') as f:
+                content = f.read()
         except Exception as e:
-            processing_time = time.time() - start_time
-            logger.error(f"Processing failed for {task.file_path}: {e}")
-            
-            return ProcessingResult(
-                file_path=task.file_path,
-                embeddings=np.array([]),
-                device_used=device_used,
-                processing_time=processing_time,
-                memory_used=0,
-                success=False,
-                error=str(e)
-            )
-    
-    def _processing_worker(self, worker_id: int):
-        """Worker thread for processing tasks"""
-        logger.info(f"Processing worker {worker_id} started")
-        
-        while not self.stop_processing:
+            logger.error(f"Failed to read file {file_path}: {e}")
+            return None
+        
+        return ProcessingTask(
+            file_path=file_path,
+            content=content,
+            priority=1,
+            chunks=self._chunk_content(content)
+        )
+    
+    def _model_for_batch(self, task: ProcessingTask, batch_chars: int) -> Tuple[Any, str]:
+        """Pick the model for a micro-batch using the latest memory sample"""
+        device = self._select_optimal_device(task, batch_chars)
+        if device == 'cuda' and 'cuda' in self.models:
+            return self.models['cuda'], 'cuda'
+        return self.models['cpu'], 'cpu'
+    
+    def _finish_file(self, progress: FileProgress, success: bool, error: Optional[str] = None):
+        """Emit the result for a file whose chunks are all encoded (or failed)"""
+        memory_after, _ = self.memory_manager.get_memory_snapshot()
+        embeddings = progress.embeddings if success and progress.embeddings is not None else np.array([])
+        
+        self.results_queue.put(ProcessingResult(
+            file_path=progress.task.file_path,
+            embeddings=embeddings,
+            device_used=progress.device_used,
+            processing_time=time.time() - progress.start_time,
+            memory_used=memory_after['used_gb'] - progress.memory_before_gb,
+            success=success,
+            error=error
+        ))
+    
+    def _encode_micro_batch(self, pending: List[Tuple[FileProgress, int, str]],
+                            batch_size: int):
+        """Encode one micro-batch of chunks drawn from many files"""
+        texts = [text for _, _, text in pending]
+        model, device = self._model_for_batch(pending[0][0].task, sum(len(t) for t in texts))
+        batch_start = time.time()
+        
+        try:
+            embeddings = model.encode(texts, batch_size=batch_size,
+                                      show_progress_bar=False, convert_to_numpy=True)
+            failed = None
+        except Exception as e:
+            logger.error(f"Micro-batch of {len(texts)} chunks failed: {e}")
+            embeddings = None
+            failed = e
+        
+        self.batch_stats['encode_calls'] += 1
+        self.batch_stats['chunks_encoded'] += len(texts)
+        self.batch_stats['encode_time'] += time.time() - batch_start
+        
+        if failed is not None:
+            # Retry file by file so one bad file does not fail its batch-mates
+            by_file: Dict[int, List[Tuple[FileProgress, int, str]]] = {}
+            for item in pending:
+                by_file.setdefault(id(item[0]), []).append(item)
+            for items in by_file.values():
+                progress = items[0][0]
+                if progress.remaining <= 0:
+                    continue
+                try:
+                    file_embeddings = model.encode([text for _, _, text in items], batch_size=batch_size,
+                                                   show_progress_bar=False, convert_to_numpy=True)
+                except Exception as e:
+                    logger.error(f"Processing failed for {progress.task.file_path}: {e}")
+                    progress.remaining = 0
+                    self._finish_file(progress, success=False, error=str(e))
+                    continue
+                self._store_embeddings(items, file_embeddings, device)
+            return
+        
+        self._store_embeddings(pending, embeddings, device)
+    
+    def _store_embeddings(self, items: List[Tuple[FileProgress, int, str]],
+                          embeddings: np.ndarray, device: str):
+        """Scatter encoded rows back to their files and emit completed files"""
+        for (progress, chunk_index, _), row in zip(items, embeddings):
+            if progress.remaining <= 0:
+                continue
+            if progress.embeddings is None:
+                progress.embeddings = np.zeros(
+                    (len(progress.task.chunks), embeddings.shape[1]), dtype=embeddings.dtype
+                )
+            progress.embeddings[chunk_index] = row
+            progress.device_used = device
+            progress.remaining -= 1
+            if progress.remaining == 0:
+                self._finish_file(progress, success=True)
+    
+    def _fail_files(self, items: List[Tuple[FileProgress, int, str]], error: str):
+        """Emit a failed result for every unfinished file with chunks in items"""
+        for progress, _, _ in items:
+            if progress.remaining > 0:
+                progress.remaining = 0
+                self._finish_file(progress, success=False, error=error)
+    
+    def _encoder_worker(self, batch_size: int):
+        """Single encoder consumer forming dynamic micro-batches across files"""
+        logger.info(f"Encoder worker started (micro-batch size {batch_size})")
+        
+        pending: List[Tuple[FileProgress, int, str]] = []
+        deadline = None
+        finished = False
+        
+        while not finished and not self.stop_processing:
+            batch: List[Tuple[FileProgress, int, str]] = []
             try:
-                # Get task from queue with timeout
-                task = self.processing_queue.get(timeout=1.0)
-                
-                # Process task
-                result = self._process_file(task)
+                timeout = 1.0 if deadline is None else max(0.0, deadline - time.time())
+                try:
+                    task = self.processing_queue.get(timeout=timeout)
+                except queue.Empty:
+                    task = False
                 
-                # Put result in results queue
-                self.results_queue.put(result)
+                if task is None:
+                    finished = True
+                elif task:
+                    memory_before, _ = self.memory_manager.get_memory_snapshot()
+                    progress = FileProgress(task=task, start_time=time.time(),
+                                            memory_before_gb=memory_before['used_gb'],
+                                            remaining=len(task.chunks or []))
+                    if not task.chunks:
+                        self._finish_file(progress, success=False, error="No content to embed")
+                    for chunk_index, chunk in enumerate(task.chunks or []):
+                        pending.append((progress, chunk_index, chunk))
+                    if pending and deadline is None:
+                        deadline = time.time() + self.max_batch_wait
                 
-                # Mark task as done
-                self.processing_queue.task_done()
+                # Flush when the batch is full, the wait budget is spent, or input ended
+                while pending and (len(pending) >= batch_size or finished or
+                                   (deadline is not None and time.time() >= deadline)):
+                    batch, pending = pending[:batch_size], pending[batch_size:]
+                    self._encode_micro_batch(batch, batch_size)
+                    batch = []
+                    deadline = time.time() + self.max_batch_wait if pending else None
                 
-                # Check if memory cleanup is needed
                 if self.memory_manager.should_cleanup_memory():
                     self.memory_manager.cleanup_memory()
-                
-            except queue.Empty:
-                continue
+            
             except Exception as e:
-                logger.error(f"Worker {worker_id} error: {e}")
+                # Fail the files in flight and keep draining, so the producer never blocks on a dead consumer
+                logger.error(f"Encoder worker error: {e}")
+                self._fail_files(batch + pending, f"Encoder worker error: {e}")
+                pending, deadline = [], None
         
-        logger.info(f"Processing worker {worker_id} stopped")
+        logger.info("Encoder worker stopped")
+    
+    def _enqueue(self, task: ProcessingTask):
+        """Put a task on the bounded queue, giving up if the encoder worker has died"""
+        while True:
+            try:
+                self.processing_queue.put(task, timeout=1.0)
+                return
+            except queue.Full:
+                if not any(worker.is_alive() for worker in self.processing_threads):
+                    raise RuntimeError("Encoder worker is not running; cannot queue more files")
     
-    def start_processing_workers(self, num_workers: int = 4):
-        """Start processing worker threads"""
-        logger.info(f"Starting {num_workers} processing workers...")
+    def start_processing_workers(self, batch_size: int = 32):
+        """Start the encoder consumer thread"""
+        logger.info("Starting encoder worker...")
+        self.stop_processing = False
         
-        for i in range(num_workers):
-            worker = threading.Thread(target=self._processing_worker, args=(i,))
-            worker.daemon = True
-            worker.start()
-            self.processing_threads.append(worker)
+        worker = threading.Thread(target=self._encoder_worker, args=(batch_size,))
+        worker.daemon = True
+        worker.start()
+        self.processing_threads.append(worker)
         
-        logger.info("Processing workers started")
+        logger.info("Encoder worker started")
     
     def stop_processing_workers(self):
         """Stop processing workers"""
@@ -367,61 +500,70 @@ class HybridRAGProcessor:
             worker.join(timeout=5.0)
         
         self.processing_threads.clear()
+        
+        # Drop anything left behind by an aborted run so the next one starts clean
+        while True:
+            try:
+                self.processing_queue.get_nowait()
+            except queue.Empty:
+                break
         logger.info("Processing workers stopped")
     
+    def _enqueue_read(self, future):
+        """Hand a finished read to the encoder, skipping unreadable files"""
+        task = future.result()
+        if task is not None:
+            self._enqueue(task)
+    
     def process_files(self, file_paths: List[str], batch_size: int = 32) -> List[ProcessingResult]:
-        """Process multiple files with hybrid CPU+GPU processing"""
-        logger.info(f"Processing {len(file_paths)} files with hybrid processing...")
+        """Process multiple files with hybrid CPU+GPU processing
         
-        # Start processing workers
-        self.start_processing_workers()
+        Files are read and chunked on reader threads, then a single encoder
+        consumer packs chunks from many files into micro-batches of up to
+        batch_size chunks per encode call.
+        """
+        logger.info(f"Processing {len(file_paths)} files with hybrid processing...")
         
+        num_readers = self.config.get('num_workers', 4)
+        self.batch_stats = {'encode_calls': 0, 'chunks_encoded': 0, 'encode_time': 0.0}
+        start_time = time.time()
         results = []
-        batch_count = 0
+        
+        self.start_processing_workers(batch_size)
         
         try:
-            # Process files in batches
-            for i in range(0, len(file_paths), batch_size):
-                batch = file_paths[i:i + batch_size]
-                batch_count += 1
-                
-                logger.info(f"Processing batch {batch_count}/{len(file_paths)//batch_size + 1} ({len(batch)} files)")
-                
-                # Add tasks to queue
-                for file_path in batch:
-                    try:
-                        with open(file_path, 'r', encoding='utf-8') as f:
-                            content = f.read()
-                        
-                        task = ProcessingTask(
-                            file_path=file_path,
-                            content=content,
-                            priority=1
-                        )
-                        
-                        self.processing_queue.put(task)
-                        
-                    except Exception as e:
-                        logger.error(f"Failed to read file {file_path}: {e}")
-                        continue
-                
-                # Wait for batch completion
-                self.processing_queue.join()
-                
-                # Collect results
-                while not self.results_queue.empty():
-                    result = self.results_queue.get()
-                    results.append(result)
-                
-                # Memory cleanup between batches
-                if self.memory_manager.should_cleanup_memory():
-                    self.memory_manager.cleanup_memory()
+            # Keep a bounded window of reads in flight; Executor.map would
+            # submit every file up front and hold all finished reads in memory
+            max_inflight = 2 * num_readers
+            with ThreadPoolExecutor(max_workers=num_readers) as readers:
+                inflight = deque()
+                for file_path in file_paths:
+                    if len(inflight) >= max_inflight:
+                        self._enqueue_read(inflight.popleft())
+                    inflight.append(readers.submit(self._read_task, file_path))
+                while inflight:
+                    self._enqueue_read(inflight.popleft())
+            
+            # Signal end of input and wait for the encoder to drain
+            self._enqueue(None)
+            for worker in self.processing_threads:
+                worker.join()
         
         finally:
             # Stop processing workers
             self.stop_processing_workers()
         
-        logger.info(f"Processing completed. {len(results)} results generated.")
+        while not self.results_queue.empty():
+            results.append(self.results_queue.get())
+        
+        self._performance_stats = {
+            'results': results,
+            'total_time': time.time() - start_time,
+            **self.batch_stats
+        }
+        
+        logger.info(f"Processing completed. {len(results)} results generated "
+                    f"from {self.batch_stats['encode_calls']} encode calls.")
         return results
     
     def build_index(self, results: List[ProcessingResult]) -> bool:
@@ -440,9 +582,12 @@ class HybridRAGProcessor:
             # Create FAISS index
             self.index = faiss.IndexFlatIP(embedding_dim)
             
-            # Add vectors to index
+            # Add vectors to index; vector i is chunk chunk_map[i] of its file
+            self.chunk_map = []
             for result in successful_results:
                 self.index.add(result.embeddings.astype('float32'))
+                self.chunk_map.extend((result.file_path, chunk_index)
+                                      for chunk_index in range(len(result.embeddings)))
             
             logger.info(f"FAISS index built with {self.index.ntotal} vectors")
             return True
@@ -451,8 +596,8 @@ class HybridRAGProcessor:
             logger.error(f"Index building failed: {e}")
             return False
     
-    def search(self, query: str, top_k: int = 5) -> List[Tuple[int, float]]:
-        """Search index with query"""
+    def search(self, query: str, top_k: int = 5) -> List[Tuple[str, int, float]]:
+        """Search index with query, returning (file_path, chunk_index, score) per hit"""
         if not self.index:
             logger.error("No index available for search")
             return []
@@ -467,8 +612,9 @@ class HybridRAGProcessor:
             # Search index
             scores, indices = self.index.search(query_embedding.astype('float32'), top_k)
             
-            # Return results as (index, score) pairs
-            return list(zip(indices[0], scores[0]))
+            # Map vector ids back to their file and chunk (-1 pads a short result)
+            return [(*self.chunk_map[vector_id], float(score))
+                    for vector_id, score in zip(indices[0], scores[0]) if vector_id >= 0]
             
         except Exception as e:
             logger.error(f"Search failed: {e}")
@@ -488,7 +634,13 @@ class HybridRAGProcessor:
             'device_usage': {
                 'cpu': len([r for r in self._performance_stats.get('results', []) if r.device_used == 'cpu']),
                 'cuda': len([r for r in self._performance_stats.get('results', []) if r.device_used == 'cuda'])
-            }
+            },
+            'encode_calls': self._performance_stats.get('encode_calls', 0),
+            'chunks_encoded': self._performance_stats.get('chunks_encoded', 0),
+            'avg_micro_batch_size': (self._performance_stats.get('chunks_encoded', 0) /
+                                     max(1, self._performance_stats.get('encode_calls', 0))),
+            'chunks_per_second': (self._performance_stats.get('chunks_encoded', 0) /
+                                  max(1e-9, self._performance_stats.get('encode_time', 0.0)))
         }
     
     def cleanup(self):
@@ -506,6 +658,7 @@ class HybridRAGProcessor:
         
         # Clear index
         self.index = None
+        self.chunk_map = []
         
         # Memory cleanup
         self.memory_manager.cleanup_memory()
@@ -565,8 +718,8 @@ def main():
             search_results = processor.search(query, top_k=3)
             
             print(f"\nSearch results for '{query}':")
-            for idx, score in search_results:
-                print(f"  Index: {idx}, Score: {score:.4f}")
+            for file_path, chunk_index, score in search_results:
+                print(f"  {file_path} (chunk {chunk_index}), Score: {score:.4f}")
         
         # Performance stats
         stats = processor.get_performance_stats()
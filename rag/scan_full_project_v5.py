@@ -21,8 +21,8 @@ def scan_full_project():
     # Configuration for maximum performance
     config = {
         'model_name': 'all-MiniLM-L6-v2',
-        'batch_size': 1000,  # Large batch size for efficiency
-        'num_workers': 8,    # More workers for parallel processing
+        'batch_size': 256,   # Chunks per encoder micro-batch
+        'num_workers': 8,    # Reader threads feeding the encoder
         'ram_disk_size_gb': 4,
         'gpu_memory_threshold': 0.9  # Use more GPU memory
     }